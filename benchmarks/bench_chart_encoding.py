@@ -0,0 +1,60 @@
+import sys
+import os
+import json
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+from sim_services.chart_encoding import encode_json, to_columnar, to_rows
+
+"""
+Compares the row-per-bar chart payload with the columnar one.
+
+run this with python benchmarks/bench_chart_encoding.py [n_bars ...]
+"""
+
+def make_columns(n: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    return {
+        "tick": np.arange(n),
+        "timestamp": pd.date_range("2024-03-04 09:30", periods=n, freq="30s", tz="America/New_York").array,
+        "open": open_,
+        "high": np.maximum(open_, close) + 0.01,
+        "low": np.minimum(open_, close) - 0.01,
+        "close": close,
+        "volume": rng.integers(100, 5000, n),
+    }
+
+def encode_rows(columns) -> bytes:
+    # what FastAPI does with the dict the row endpoints return
+    payload = {"symbol": "AAPL", "interval": "30s", "data": to_rows("AAPL", columns)}
+    return json.dumps(jsonable_encoder(payload)).encode("utf-8")
+
+def encode_columns(columns) -> bytes:
+    return encode_json(to_columnar("AAPL", "30s", columns))
+
+def best_of(fn, columns, repeat: int = 5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn(columns)
+        times.append(time.perf_counter() - start)
+    return min(times), len(body)
+
+def main(sizes):
+    print(f"{'bars':>10} {'format':>8} {'encode ms':>10} {'bytes':>12}")
+    for n in sizes:
+        columns = make_columns(n)
+        results = {"rows": best_of(encode_rows, columns), "columns": best_of(encode_columns, columns)}
+        for name, (seconds, size) in results.items():
+            print(f"{n:>10} {name:>8} {seconds * 1000:>10.1f} {size:>12,}")
+        rows, cols = results["rows"], results["columns"]
+        print(f"{'':>10} {'ratio':>8} {rows[0] / cols[0]:>9.1f}x {rows[1] / cols[1]:>11.1f}x")
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
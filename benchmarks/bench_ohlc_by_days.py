@@ -0,0 +1,82 @@
+import sys
+import os
+import json
+import time
+from datetime import timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+
+from sim_services.chart_encoding import encode_json, frame_columns, to_columnar, to_rows
+from sim_services.date_index import TickDateIndex
+
+"""
+Day-window selection: the old boolean mask + iterrows() against a binary search
+on the timestamp index plus a slice, in both the row and columnar formats.
+
+run this with python benchmarks/bench_ohlc_by_days.py [total_days]
+"""
+
+TICKS_PER_DAY = 780
+
+def make_frame(n_days: int, seed: int = 11) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range("2020-01-02", periods=n_days, tz="America/New_York")
+    timestamps = (days.repeat(TICKS_PER_DAY) + pd.Timedelta(hours=9, minutes=30)
+                  + pd.to_timedelta(np.tile(np.arange(TICKS_PER_DAY) * 30, n_days), unit="s"))
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, len(timestamps))))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    return pd.DataFrame({
+        "timestamp": timestamps,
+        "open": open_,
+        "high": np.maximum(open_, close) + 0.01,
+        "low": np.minimum(open_, close) - 0.01,
+        "close": close,
+        "volume": rng.integers(100, 5000, len(close)),
+    })
+
+def legacy_ohlc_by_days(df: pd.DataFrame, days: int):
+    # S3DataAdapter.get_ohlc_by_days before the date index
+    end_date = df['timestamp'].max()
+    start_date = end_date - timedelta(days=days)
+    mask = (df['timestamp'] >= start_date) & (df['timestamp'] <= end_date)
+    data = []
+    for idx, row in df[mask].iterrows():
+        data.append({
+            "tick": idx,
+            "timestamp": row["timestamp"].isoformat(),
+            "open": float(row["open"]),
+            "high": float(row["high"]),
+            "low": float(row["low"]),
+            "close": float(row["close"]),
+            "volume": int(row["volume"])
+        })
+    return data
+
+def indexed_columns(df: pd.DataFrame, index: TickDateIndex, days: int):
+    return frame_columns(df, index.calendar_window_start_tick(days), len(df) - 1)
+
+def best_of(fn, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main(total_days: int):
+    df = make_frame(total_days)
+    index = TickDateIndex(df["timestamp"])
+    print(f"series: {len(df):,} bars over {total_days} trading days")
+    print(f"{'days':>6} {'bars':>8} {'legacy rows+json':>17} {'indexed rows+json':>18} {'indexed columnar':>17}")
+    for days in (1, 7, 30, 90):
+        bars = len(legacy_ohlc_by_days(df, days))
+        assert bars == len(indexed_columns(df, index, days)["tick"])
+        legacy = best_of(lambda: json.dumps(legacy_ohlc_by_days(df, days)))
+        rows = best_of(lambda: json.dumps(to_rows("AAPL", indexed_columns(df, index, days))))
+        columnar = best_of(lambda: encode_json(to_columnar("AAPL", "30s", indexed_columns(df, index, days))))
+        print(f"{days:>6} {bars:>8,} {legacy * 1000:>14.1f} ms {rows * 1000:>15.1f} ms {columnar * 1000:>14.2f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 250)
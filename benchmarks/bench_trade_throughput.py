@@ -0,0 +1,184 @@
+import sys
+import os
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from datetime import datetime, timezone
+# First on the path: the repo's db.py must win over the unrelated "db" package on PyPI
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+
+"""
+Trade path throughput: concurrent clients call POST /sim/validate-trade then
+POST /sim/trade against the app in-process (httpx ASGI transport), with the
+in-memory Firestore store standing in for Firestore and an optional injected
+per-call latency.
+
+Reports trades/sec, p50/p99 latency per endpoint, and a per-stage breakdown
+(session read, portfolio query, writes, trade log, journal) from the store's
+per-operation timings. "other" is whatever the stages don't account for:
+routing, validation, the threadpool hop, the SQL session dependency, logging
+and, under concurrency, time queued for a worker thread. --concurrency 1 gives
+the uncontended service-time breakdown.
+
+run this with python benchmarks/bench_trade_throughput.py --concurrency 32 --trades 5000 --latency-ms 2
+"""
+
+# Store operations -> the stage of the trade path they belong to
+STAGES = {
+    "simulation_sessions.get": "session read",
+    "portfolio_entries.query": "portfolio query",
+    "portfolio_entries.update": "portfolio write",
+    "portfolio_entries.set": "portfolio write",
+    "simulation_sessions.update": "session write",
+    "trades.set": "trade log",
+}
+
+def configure_environment(latency_ms: float, work_dir: str) -> None:
+    # Must run before the app is imported: the store and journal read these at import
+    os.environ["FIRESTORE_BACKEND"] = "memory"
+    os.environ["FIRESTORE_LATENCY_MS"] = str(latency_ms)
+    os.environ.pop("FIRESTORE_SEED_PATH", None)
+    os.environ["MARKET_DATA_BACKEND"] = "local"
+    os.environ["MARKET_DATA_DIR"] = os.path.join(work_dir, "market_data")
+    os.environ["SESSION_JOURNAL_DIR"] = os.path.join(work_dir, "journal")
+    # The AI router builds its client at import time; it is never called here
+    os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+def seed_store(db, sessions: int, symbols: list) -> None:
+    start = datetime.now(timezone.utc).isoformat()
+    db.load({"simulation_sessions": {
+        f"bench-{i:04d}": {
+            "user_id": f"user-{i:04d}", "is_active": True, "start_time": start,
+            "duration_seconds": 86400, "cash": 1e12, "pnl": 0.0, "current_tick": 0,
+        }
+        for i in range(sessions)
+    }})
+
+def percentiles(values) -> dict:
+    ms = np.array(values) * 1000
+    if not len(ms):
+        return {"p50": None, "p99": None, "max": None}
+    return {name: round(float(np.percentile(ms, q)), 3) for name, q in (("p50", 50), ("p99", 99), ("max", 100))}
+
+async def run_load(app, args, symbols: list) -> dict:
+    import httpx
+
+    latencies = {"validate-trade": [], "trade": []}
+    failures = {"validate-trade": 0, "trade": 0}
+    remaining = iter(range(args.trades))
+
+    async def worker(worker_id: int, client) -> None:
+        for n in remaining:
+            session = worker_id % args.sessions
+            params = {
+                "session_id": f"bench-{session:04d}", "user_id": f"user-{session:04d}",
+                "symbol": symbols[n % len(symbols)], "action": "buy", "quantity": 1 + n % 10,
+                "price": 100.0,
+            }
+            for endpoint in ("validate-trade", "trade"):
+                start = time.perf_counter()
+                response = await client.post(f"/sim/{endpoint}", params=params)
+                latencies[endpoint].append(time.perf_counter() - start)
+                ok = response.status_code == 200 and response.json().get("valid", True)
+                if not ok:
+                    failures[endpoint] += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(i, client) for i in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {"latencies": latencies, "failures": failures, "elapsed": elapsed}
+
+def stage_breakdown(store_stats: dict, journal_seconds: list, request_seconds: float, trades: int) -> dict:
+    stages = {}
+    for operation, entry in store_stats["operations"].items():
+        stage = stages.setdefault(STAGES.get(operation, operation), {"calls": 0, "total_seconds": 0.0})
+        stage["calls"] += entry["calls"]
+        stage["total_seconds"] += entry["total_seconds"]
+    stages["journal"] = {"calls": len(journal_seconds), "total_seconds": float(sum(journal_seconds))}
+    accounted = sum(stage["total_seconds"] for stage in stages.values())
+    stages["other"] = {"calls": 0, "total_seconds": max(0.0, request_seconds - accounted)}
+
+    report = {}
+    for name, stage in sorted(stages.items(), key=lambda item: -item[1]["total_seconds"]):
+        report[name] = {
+            "calls_per_trade": round(stage["calls"] / trades, 2) if trades else None,
+            "ms_per_trade": round(1000 * stage["total_seconds"] / trades, 3) if trades else None,
+            "share": round(stage["total_seconds"] / request_seconds, 3) if request_seconds else None,
+        }
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of /sim/validate-trade + /sim/trade.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--trades", type=int, default=2000)
+    parser.add_argument("--sessions", type=int, default=16, help="fewer sessions than workers means contention")
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="injected latency per store call")
+    parser.add_argument("--report", help="write the JSON report here")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="trade_bench_") as work_dir:
+        configure_environment(args.latency_ms, work_dir)
+        # Imported late so the environment above is in place first
+        from main import app
+        from sim_services.session_journal import session_journal
+        from unified_app.firebase_setup.firebaseSet import db
+
+        symbols = [f"SYN{i:03d}" for i in range(args.symbols)]
+        seed_store(db, args.sessions, symbols)
+        db.reset_stats()
+
+        journal_seconds = []
+        record = session_journal.record
+
+        def timed_record(*record_args, **record_kwargs):
+            start = time.perf_counter()
+            try:
+                return record(*record_args, **record_kwargs)
+            finally:
+                journal_seconds.append(time.perf_counter() - start)
+
+        session_journal.record = timed_record
+
+        # The handlers log every trade; keep that cost but not the console noise
+        from sim_services.logging_setup import configure_logging
+        with open(os.devnull, "w") as devnull:
+            configure_logging(stream=devnull, force=True)
+            result = asyncio.run(run_load(app, args, symbols))
+            configure_logging(force=True)
+
+        store_stats = db.stats()
+
+    latencies = result["latencies"]
+    trades = len(latencies["trade"]) - result["failures"]["trade"]
+    request_seconds = sum(sum(values) for values in latencies.values())
+    report = {
+        "config": {
+            "concurrency": args.concurrency, "trades": args.trades, "sessions": args.sessions,
+            "symbols": args.symbols, "store_latency_ms": args.latency_ms,
+        },
+        "elapsed_seconds": round(result["elapsed"], 3),
+        "trades_per_second": round(trades / result["elapsed"], 1),
+        "requests_per_second": round(sum(len(v) for v in latencies.values()) / result["elapsed"], 1),
+        # Wall time per trade at this throughput; latency above it is time spent queued
+        "wall_ms_per_trade": round(1000 * result["elapsed"] / trades, 3) if trades else None,
+        "failures": result["failures"],
+        "latency_ms": {endpoint: percentiles(values) for endpoint, values in latencies.items()},
+        "store_calls": {"reads": store_stats["reads"], "writes": store_stats["writes"]},
+        "stages": stage_breakdown(store_stats, journal_seconds, request_seconds, trades),
+    }
+
+    print(json.dumps(report, indent=2))
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
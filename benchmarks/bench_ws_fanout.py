@@ -0,0 +1,265 @@
+import sys
+import os
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import httpx
+import numpy as np
+import websockets
+
+from sim_services.synthetic_data import symbol_names, write_dataset
+
+"""
+Websocket fan-out on /sim/stream/{session_id}: opens many clients spread over
+many sessions against one uvicorn worker running main:app. The worker uses no
+outside services: the in-memory Firestore store, seeded with active sessions
+and portfolios, and synthetic market data served by the local storage backend.
+
+Reports frame latency percentiles (server send stamp to client receipt), how
+far frames drift behind the stream interval, the worker's CPU and resident
+memory per connection, and failures, as JSON. Pass --compare with an earlier
+report to see the change between builds.
+
+run this with python benchmarks/bench_ws_fanout.py --clients 2000 --sessions 200 --duration 30 --report ws.json
+"""
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def process_cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as f:
+        # utime and stime are fields 14 and 15; split after the parenthesised command name
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+def process_rss_bytes(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+def write_fixtures(root: str, sessions: int, symbols: list, holdings_per_session: int) -> str:
+    """Synthetic market data under root, plus a Firestore seed file of active sessions; returns the seed path."""
+    write_dataset(root, symbols, days=2, intervals=["30s"], fundamentals=False)
+    start = (datetime.now(timezone.utc) - timedelta(minutes=5)).isoformat()
+    seed = {"simulation_sessions": {}, "portfolio_entries": {}}
+    rng = np.random.default_rng(0)
+    for i in range(sessions):
+        session_id = f"load-{i:05d}"
+        seed["simulation_sessions"][session_id] = {
+            "user_id": f"user-{i:05d}", "is_active": True, "start_time": start,
+            "duration_seconds": 86400, "cash": 100000.0, "pnl": 0.0, "current_tick": 0,
+        }
+        for symbol in rng.choice(symbols, size=min(holdings_per_session, len(symbols)), replace=False):
+            seed["portfolio_entries"][f"{session_id}-{symbol}"] = {
+                "session_id": session_id, "symbol": str(symbol), "holdings": int(rng.integers(1, 100)),
+                "avg_price": 100.0, "last_price": 100.0, "pnl": 0.0,
+            }
+    seed_path = os.path.join(root, "firestore_seed.json")
+    with open(seed_path, "w") as f:
+        json.dump(seed, f)
+    return seed_path
+
+def start_server(port: int, data_dir: str, seed_path: str, interval: float, latency_ms: float) -> subprocess.Popen:
+    # The journal lives in the temp dir too: sessions journaled under ./session_journal
+    # would be restored by every later app start
+    env = dict(os.environ,
+               FIRESTORE_BACKEND="memory", FIRESTORE_SEED_PATH=seed_path, FIRESTORE_LATENCY_MS=str(latency_ms),
+               MARKET_DATA_BACKEND="local", MARKET_DATA_DIR=data_dir,
+               SESSION_JOURNAL_DIR=os.path.join(data_dir, "session_journal"),
+               SIM_STREAM_INTERVAL_SECONDS=str(interval))
+    # The AI router builds its client at import time; it is never called here
+    env.setdefault("OPENAI_API_KEY", "offline")
+    # stderr goes to a file: nothing reads a pipe during the run, and a full one would block the server
+    log_path = os.path.join(data_dir, "server.log")
+    with open(log_path, "wb") as log:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+             "--log-level", "warning", "--ws", "websockets"],
+            cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=log,
+        )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if server.poll() is not None:
+            with open(log_path, errors="replace") as log:
+                raise RuntimeError(f"Server exited during startup:\n{log.read()}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/openapi.json", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Server did not start within 60s")
+
+class LoadStats:
+    def __init__(self):
+        self.latencies = []
+        self.lags = []
+        self.frames = 0
+        self.errors = 0
+        self.connect_failures = 0
+        self.connected = 0
+        self.connect_seconds = []
+
+async def run_client(uri: str, stats: LoadStats, stop: asyncio.Event, measuring: asyncio.Event,
+                     interval: float) -> None:
+    start = time.perf_counter()
+    previous = None
+    try:
+        async with websockets.connect(uri, max_size=None, open_timeout=60, ping_interval=None) as ws:
+            stats.connected += 1
+            stats.connect_seconds.append(time.perf_counter() - start)
+            while not stop.is_set():
+                try:
+                    message = await asyncio.wait_for(ws.recv(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
+                received = datetime.now(timezone.utc)
+                arrived = time.perf_counter()
+                frame = json.loads(message)
+                if "error" in frame:
+                    stats.errors += 1
+                    continue
+                if measuring.is_set():
+                    stats.frames += 1
+                    sent = datetime.fromisoformat(frame["timestamp"])
+                    stats.latencies.append((received - sent).total_seconds())
+                    if previous is not None:
+                        stats.lags.append(arrived - previous - interval)
+                previous = arrived
+    except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException):
+        if stats.connected == 0 or not stop.is_set():
+            stats.connect_failures += 1
+
+async def drive(port: int, args, server_pid: int) -> dict:
+    stats = LoadStats()
+    stop, measuring = asyncio.Event(), asyncio.Event()
+    idle_rss = process_rss_bytes(server_pid)
+
+    tasks = []
+    ramp_start = time.perf_counter()
+    for i in range(args.clients):
+        session_id = f"load-{i % args.sessions:05d}"
+        uri = f"ws://127.0.0.1:{port}/sim/stream/{session_id}"
+        tasks.append(asyncio.create_task(run_client(uri, stats, stop, measuring, args.interval)))
+        if (i + 1) % args.ramp_batch == 0:
+            await asyncio.sleep(args.ramp_pause)
+    while stats.connected + stats.connect_failures < args.clients and time.perf_counter() - ramp_start < 120:
+        await asyncio.sleep(0.1)
+    ramp_seconds = time.perf_counter() - ramp_start
+
+    # Let every socket settle into its send loop before measuring
+    await asyncio.sleep(min(args.interval, 5.0))
+    loaded_rss = process_rss_bytes(server_pid)
+    cpu_before = process_cpu_seconds(server_pid)
+    measuring.set()
+    measure_start = time.perf_counter()
+    await asyncio.sleep(args.duration)
+    measured_seconds = time.perf_counter() - measure_start
+    cpu_seconds = process_cpu_seconds(server_pid) - cpu_before
+    measuring.clear()
+    stop.set()
+    await asyncio.gather(*tasks)
+
+    latencies_ms = np.array(stats.latencies) * 1000
+    lags_ms = np.array(stats.lags) * 1000
+    connected = max(stats.connected, 1)
+    return {
+        "config": {
+            "clients": args.clients, "sessions": args.sessions, "symbols": args.symbols,
+            "holdings_per_session": args.holdings, "interval_seconds": args.interval,
+            "duration_seconds": args.duration, "firestore_latency_ms": args.firestore_latency_ms,
+        },
+        "connected": stats.connected,
+        "connect_failures": stats.connect_failures,
+        "error_frames": stats.errors,
+        "ramp_seconds": round(ramp_seconds, 3),
+        "connect_p99_ms": round(float(np.percentile(stats.connect_seconds, 99)) * 1000, 2) if stats.connect_seconds else None,
+        "frames": stats.frames,
+        "frames_per_second": round(stats.frames / measured_seconds, 2),
+        "expected_frames_per_second": round(stats.connected / args.interval, 2),
+        "latency_ms": {
+            name: round(float(np.percentile(latencies_ms, q)), 2) if len(latencies_ms) else None
+            for name, q in (("p50", 50), ("p90", 90), ("p99", 99), ("max", 100))
+        },
+        # How late each frame arrived relative to the previous one plus the interval;
+        # grows when the event loop is too busy to wake each socket on time
+        "interval_lag_ms": {
+            name: round(float(np.percentile(lags_ms, q)), 2) if len(lags_ms) else None
+            for name, q in (("p50", 50), ("p90", 90), ("p99", 99), ("max", 100))
+        },
+        "server_cpu_percent": round(100 * cpu_seconds / measured_seconds, 1),
+        "server_cpu_ms_per_connection_second": round(1000 * cpu_seconds / measured_seconds / connected, 4),
+        "server_rss_idle_bytes": idle_rss,
+        "server_rss_loaded_bytes": loaded_rss,
+        "server_rss_per_connection_bytes": (loaded_rss - idle_rss) // connected,
+    }
+
+def flatten(report: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in report.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+def print_comparison(baseline: dict, report: dict) -> None:
+    before, after = flatten(baseline), flatten(report)
+    print(f"{'metric':<42} {'baseline':>14} {'this build':>14} {'change':>9}")
+    for key, value in after.items():
+        old = before.get(key)
+        change = ""
+        if isinstance(value, (int, float)) and isinstance(old, (int, float)) and old:
+            change = f"{(value - old) / abs(old):+.1%}"
+        print(f"{key:<42} {str(old):>14} {str(value):>14} {change:>9}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Websocket fan-out load test for /sim/stream.")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--holdings", type=int, default=3, help="portfolio entries per session")
+    parser.add_argument("--interval", type=float, default=1.0, help="SIM_STREAM_INTERVAL_SECONDS for the server")
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds after the ramp")
+    parser.add_argument("--ramp-batch", type=int, default=100, help="clients opened between pauses")
+    parser.add_argument("--ramp-pause", type=float, default=0.2)
+    parser.add_argument("--firestore-latency-ms", type=float, default=0.0)
+    parser.add_argument("--report", help="write the JSON report here")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="ws_fanout_") as data_dir:
+        seed_path = write_fixtures(data_dir, args.sessions, symbol_names(args.symbols), args.holdings)
+        port = free_port()
+        server = start_server(port, data_dir, seed_path, args.interval, args.firestore_latency_ms)
+        try:
+            report = asyncio.run(drive(port, args, server.pid))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    print(json.dumps(report, indent=2))
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), report)
+
+if __name__ == "__main__":
+    main()
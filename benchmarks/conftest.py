@@ -0,0 +1,96 @@
+import sys
+import os
+import atexit
+import json
+import shutil
+import tempfile
+import tracemalloc
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# The suite runs against synthetic files, never the bucket; this has to happen
+# before anything imports the S3 adapter
+os.environ["MARKET_DATA_BACKEND"] = "local"
+os.environ["MARKET_DATA_DIR"] = tempfile.mkdtemp(prefix="bench_market_data_")
+# Set at import rather than in a fixture, so removed at exit rather than by tmp_path_factory
+atexit.register(shutil.rmtree, os.environ["MARKET_DATA_DIR"], ignore_errors=True)
+
+import pytest
+
+from sim_services.synthetic_data import TICKS_PER_DAY, generate_ohlcv
+
+"""
+Fixtures for the pytest-benchmark suite: synthetic 30s series at each size,
+and tracemalloc peaks that can be saved and compared like the timings.
+"""
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+def pytest_addoption(parser):
+    group = parser.getgroup("market data benchmarks")
+    group.addoption("--bench-sizes", default=",".join(SIZES),
+                    help="comma-separated series sizes to run (1k,100k,1m)")
+    group.addoption("--memory-save", default=None, help="write tracemalloc peaks to this JSON file")
+    group.addoption("--memory-compare", default=None, help="fail when a peak grows past the peaks in this JSON file")
+    group.addoption("--memory-tolerance", type=float, default=0.25,
+                    help="allowed relative growth over --memory-compare (default 0.25)")
+
+def pytest_generate_tests(metafunc):
+    if "size" in metafunc.fixturenames:
+        sizes = [size.strip() for size in metafunc.config.getoption("--bench-sizes").split(",") if size.strip()]
+        unknown = set(sizes) - set(SIZES)
+        if unknown:
+            raise pytest.UsageError(f"Unknown --bench-sizes: {', '.join(sorted(unknown))}")
+        metafunc.parametrize("size", sizes, scope="session")
+
+@pytest.fixture(scope="session")
+def bench_symbol(size):
+    """Symbol whose 30s file holds SIZES[size] bars, written on first use."""
+    symbol = f"BENCH{size.upper()}"
+    path = os.path.join(os.environ["MARKET_DATA_DIR"], "30s", f"{symbol}-30s.csv")
+    if not os.path.exists(path):
+        n = SIZES[size]
+        df = generate_ohlcv(-(-n // TICKS_PER_DAY), seed=n).iloc[:n]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_csv(path, index=False)
+    return symbol
+
+def pytest_configure(config):
+    config._memory_peaks = {}
+    baseline_path = config.getoption("--memory-compare", default=None)
+    config._memory_baseline = {}
+    if baseline_path:
+        with open(baseline_path, "r") as f:
+            config._memory_baseline = json.load(f)
+
+def pytest_sessionfinish(session, exitstatus):
+    path = session.config.getoption("--memory-save", default=None)
+    if path and session.config._memory_peaks:
+        with open(path, "w") as f:
+            json.dump(session.config._memory_peaks, f, indent=2, sort_keys=True)
+
+@pytest.fixture
+def memory_peak(request, benchmark):
+    """
+    Call memory_peak(fn) to run fn once under tracemalloc. The peak goes into the
+    benchmark's extra_info and is checked against --memory-compare.
+    """
+    config = request.config
+
+    def record(fn):
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        name = request.node.name
+        benchmark.extra_info["peak_bytes"] = peak
+        config._memory_peaks[name] = peak
+
+        baseline = config._memory_baseline.get(name)
+        tolerance = config.getoption("--memory-tolerance")
+        if baseline and peak > baseline * (1 + tolerance):
+            pytest.fail(f"{name}: peak memory {peak:,} B exceeds baseline {baseline:,} B by more than {tolerance:.0%}")
+        return peak
+
+    return record
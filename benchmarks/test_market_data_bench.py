@@ -0,0 +1,125 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+
+from conftest import SIZES
+from sim_services.ohlcv_cache import OHLCVCache
+from sim_services.s3_data_adapter import s3_adapter
+from sim_services.tick_indexer import tick_indexer
+
+"""
+Market data hot path at 1k, 100k and 1M 30s bars of synthetic local data:
+CSV load, the DataFrame cache, TickIndexer lookups and the last-N-days window.
+Each benchmark records throughput (ticks or calls per second) and the
+tracemalloc peak of one call in extra_info.
+
+Needs pytest-benchmark (pip install pytest-benchmark).
+
+run this with pytest benchmarks/test_market_data_bench.py --memory-compare benchmarks/memory_baseline.json
+and narrow the sizes with --bench-sizes 1k,100k
+
+Memory peaks depend on the code and library versions, not machine speed, so
+benchmarks/memory_baseline.json is committed; refresh it with --memory-save
+benchmarks/memory_baseline.json when a change is meant to move them. Timings do
+depend on the machine, so their baseline stays local (.benchmarks/, ignored by
+git). Save one on the base commit, then compare a branch:
+    git checkout main && pytest benchmarks/test_market_data_bench.py --benchmark-save=main
+    git checkout my-branch && pytest benchmarks/test_market_data_bench.py --benchmark-compare --benchmark-compare-fail=mean:15%
+--benchmark-compare with no value picks the latest saved run; pass its number
+(e.g. 0001, see pytest-benchmark list) to pin one.
+"""
+
+LOOKUPS = 1000  # random ticks per lookup benchmark round
+RANGE_WIDTH = 500
+# Slow calls on big series get a fixed number of rounds instead of pytest-benchmark's calibration
+ROUNDS = {"1k": None, "100k": 5, "1m": 3}
+
+def run(benchmark, size, fn):
+    if ROUNDS[size] is None:
+        return benchmark(fn)
+    return benchmark.pedantic(fn, rounds=ROUNDS[size], iterations=1, warmup_rounds=1)
+
+def per_second(benchmark, count):
+    # No stats under --benchmark-disable, which runs each benchmark once as a plain test
+    if benchmark.stats is None:
+        return None
+    return count / benchmark.stats.stats.mean
+
+@pytest.fixture
+def warm_indexer(bench_symbol):
+    """
+    TickIndexer with the series loaded and its date index built, so lookups don't
+    time the CSV parse and no case's memory peak depends on which case ran first.
+    """
+    assert tick_indexer.get_dataframe(bench_symbol) is not None
+    assert tick_indexer.get_date_index(bench_symbol) is not None
+    return tick_indexer
+
+@pytest.fixture
+def random_ticks(size):
+    return np.random.default_rng(0).integers(0, SIZES[size], LOOKUPS).tolist()
+
+def test_get_dataframe(benchmark, memory_peak, bench_symbol, size):
+    memory_peak(lambda: s3_adapter.get_dataframe(bench_symbol))
+    df = run(benchmark, size, lambda: s3_adapter.get_dataframe(bench_symbol))
+    assert len(df) == SIZES[size]
+    benchmark.extra_info["ticks_per_second"] = per_second(benchmark, SIZES[size])
+
+def test_tick_indexer_cold_load(benchmark, memory_peak, bench_symbol, size):
+    def cold_load():
+        tick_indexer.invalidate_symbol(bench_symbol)
+        return tick_indexer.get_dataframe(bench_symbol)
+
+    memory_peak(cold_load)
+    df = run(benchmark, size, cold_load)
+    assert len(df) == SIZES[size]
+    benchmark.extra_info["ticks_per_second"] = per_second(benchmark, SIZES[size])
+
+def test_ohlcv_cache_set_get(benchmark, memory_peak, warm_indexer, bench_symbol):
+    df = warm_indexer.get_dataframe(bench_symbol)
+    cache = OHLCVCache()
+
+    def set_get():
+        cache.set(bench_symbol, df)
+        return cache.get(bench_symbol)
+
+    memory_peak(set_get)
+    assert benchmark(set_get) is df
+    benchmark.extra_info["calls_per_second"] = per_second(benchmark, 1)
+
+def test_get_tick_data(benchmark, memory_peak, warm_indexer, bench_symbol, random_ticks):
+    def lookups():
+        return [warm_indexer.get_tick_data(bench_symbol, tick) for tick in random_ticks]
+
+    memory_peak(lookups)
+    assert all(benchmark(lookups))
+    benchmark.extra_info["calls_per_second"] = per_second(benchmark, LOOKUPS)
+
+def test_get_tick_range(benchmark, memory_peak, warm_indexer, bench_symbol, size):
+    starts = np.random.default_rng(1).integers(0, max(1, SIZES[size] - RANGE_WIDTH), 100).tolist()
+
+    def ranges():
+        return [warm_indexer.get_tick_range(bench_symbol, start, start + RANGE_WIDTH - 1) for start in starts]
+
+    memory_peak(ranges)
+    result = benchmark(ranges)
+    assert len(result[0]) == min(RANGE_WIDTH, SIZES[size])
+    benchmark.extra_info["ticks_per_second"] = per_second(benchmark, sum(len(rows) for rows in result))
+
+def test_get_quote(benchmark, memory_peak, warm_indexer, bench_symbol, random_ticks):
+    def quotes():
+        return [warm_indexer.get_quote(bench_symbol, tick) for tick in random_ticks]
+
+    memory_peak(quotes)
+    assert all(benchmark(quotes))
+    benchmark.extra_info["calls_per_second"] = per_second(benchmark, LOOKUPS)
+
+@pytest.mark.parametrize("days", [1, 5])
+def test_get_ohlc_by_days(benchmark, memory_peak, warm_indexer, bench_symbol, days):
+    memory_peak(lambda: s3_adapter.get_ohlc_by_days(bench_symbol, days))
+    rows = benchmark(lambda: s3_adapter.get_ohlc_by_days(bench_symbol, days))
+    assert rows
+    benchmark.extra_info["ticks_per_second"] = per_second(benchmark, len(rows))
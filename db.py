@@ -5,6 +5,7 @@ from models import * # importing every model for import
 from sqlmodel import Session
 from contextlib import contextmanager
 from typing import Generator
+import os
 import sqlite3
 
 # ------ CONFIG DEETS --------
@@ -13,13 +14,18 @@ DATABASE_URL = "sqlite:///./momoney.db"
 # engine to generate tables off metadata
 engine = create_engine(
     DATABASE_URL, 
-    echo=True,  # setting echo=False to silence SQL logs
+    # Every statement is logged when on, which is costly on the trade path; SQL_ECHO=1 turns it on
+    echo=os.getenv("SQL_ECHO", "").lower() in ("1", "true", "yes"),
     connect_args={
         "check_same_thread": False,
         "timeout": 30.0,  # Increase timeout for busy database
     }
 )
 
+# Statement time shows up as the "sqlite" stage in Server-Timing headers
+from sim_services.request_timing import instrument_engine
+instrument_engine(engine)
+
 # Enable WAL mode for better concurrency
 def enable_wal_mode():
     """Enable WAL mode for better concurrent access."""
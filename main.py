@@ -7,6 +7,9 @@ from routers.chart_data import router as chart_data_router
 from routers.simulation_sesh import router as simulation_router
 from fastapi.middleware.cors import CORSMiddleware
 from db import create_db_and_tables
+from sim_services.request_timing import ServerTimingMiddleware, TimedJSONResponse
+from sim_services.event_loop import stall_detector_from_env
+from contextlib import asynccontextmanager
 import uvicorn
 import os
 
@@ -18,7 +21,17 @@ SERVER_CONFIG = {
     "log_level": "info"
 }
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # LOOP_STALL_MS=<ms> logs the event loop's stack whenever it is blocked that long
+    detector = stall_detector_from_env()
+    if detector:
+        detector.start()
+    yield
+    if detector:
+        detector.stop()
+
+app = FastAPI(default_response_class=TimedJSONResponse, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,6 +41,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so its total covers CORS handling as well
+app.add_middleware(ServerTimingMiddleware)
+
 # Register all routers dynamically
 for router in all_routers:
     app.include_router(router)
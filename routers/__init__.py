@@ -8,6 +8,8 @@ from .mo_ai import router as mo_ai_router
 from .simulation_sesh import router as simulation_router
 from .sim_dashboard import router as sim_dashboard_router
 from .unit_path import router as unit_router
+from .metrics import router as metrics_router
+from .debug import router as debug_router
 
 # from .quizLesson import router as quiz_lesson_router
 # quiz_lesson_router excluded since it lacks a router
@@ -23,5 +25,7 @@ all_routers = [
     mo_ai_router,
     quiz_page_router,
     simulation_router,
-    sim_dashboard_router
+    sim_dashboard_router,
+    metrics_router,
+    debug_router
 ]
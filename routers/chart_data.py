@@ -1,71 +1,137 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
 from sqlmodel import Session
 from db import get_session
 from typing import List, Dict, Optional
 from sim_services.s3_data_adapter import s3_adapter
 from sim_services.tick_indexer import tick_indexer
+from sim_services.downsampling import DOWNSAMPLE_MODES, downsample_columns
+from sim_services.chart_encoding import encode_json, to_columnar
+from sim_services.http_cache import accepts_gzip, cache_headers, etag_matches, gzip_etag, make_etag, matched_etag
+from sim_services.response_cache import response_cache
+from sim_services.request_timing import stage
 
 router = APIRouter(prefix="/chart_data", tags=["Chart Data"])
 
+# Handlers that load or slice market data are plain `def`: FastAPI runs them in its
+# threadpool, so a cold pandas load does not stall the event loop and every websocket on it
+
+def _get_session_tick(db: Session, session_id: str) -> int:
+    """Current 30s tick of a simulation session, or 404 if the session does not exist."""
+    from models.trading_sim import SimulationSession
+    from sqlmodel import select
+    from sim_services.simulation_engine import get_current_tick
+    
+    session = db.exec(select(SimulationSession).where(SimulationSession.id == session_id)).first()
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    # Calculate current tick based on elapsed time using centralized function
+    return get_current_tick(db, session)
+
+def _cached_json(request: Request, key: Optional[tuple], build, headers: Optional[dict] = None,
+                 precompress: bool = True) -> Response:
+    """
+    Serve a JSON body from the response cache, building and serializing it only on
+    a miss. key must cover everything the body depends on; None skips the cache.
+    precompress=False leaves gzipping to the first request that accepts it, for
+    keys that are rarely hit twice (session views move with the current tick).
+    """
+    if key is None:
+        body = build()
+        with stage("serialize"):
+            return Response(content=encode_json(body), media_type="application/json", headers=headers)
+    
+    entry = response_cache.get(key)
+    if entry is None:
+        body = build()
+        with stage("serialize"):
+            entry = response_cache.set(key, encode_json(body), compress=precompress)
+    
+    headers = dict(headers or {})
+    headers["Vary"] = "Accept-Encoding"
+    gzipped = response_cache.gzipped(key, entry) if accepts_gzip(request.headers.get("accept-encoding")) else None
+    if gzipped is not None:
+        headers["Content-Encoding"] = "gzip"
+        if "ETag" in headers:
+            headers["ETag"] = gzip_etag(headers["ETag"])
+        return Response(content=gzipped, media_type="application/json", headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+def _cache_key(kind: str, symbol: str, interval: str, *params) -> Optional[tuple]:
+    """Response cache key, tied to the data version so reloaded data is never served stale."""
+    version = tick_indexer.get_data_version(symbol, interval)
+    if version is None:
+        return None
+    return (kind, symbol, interval, version) + params
+
 @router.get("/{symbol}")
-async def get_chart_data(
+def get_chart_data(
     symbol: str,
-    interval: str = Query('30s', description="Time interval (30s, 1min, 5min, 30min)"),
+    request: Request,
+    interval: str = Query('30s', description="Time interval (30s, 1min, 5min, 30min or any multiple of 30s)"),
     days: int = Query(7, description="Number of days of data to retrieve"),
     session_id: str = Query(None, description="Simulation session ID to get data up to current tick"),
+    max_points: Optional[int] = Query(None, ge=3, description="Downsample to at most this many points"),
+    downsample: str = Query('ohlc', description="Downsampling mode (ohlc, lttb)"),
     db: Session = Depends(get_session)
 ):
     """
     Get OHLCV chart data for a symbol with specified interval and time range.
     If session_id is provided, returns data up to the current simulation tick.
+    With max_points, the series is reduced on the server: 'ohlc' merges bars into
+    candles, 'lttb' keeps the points that best preserve the close line.
     
-    Example: GET /chart_data/AAPL?interval=5min&days=7&session_id=abc123
+    Example: GET /chart_data/AAPL?interval=5min&days=7&session_id=abc123&max_points=1000
     """
     try:
-        # Validate interval
-        available_intervals = s3_adapter.get_available_intervals()
-        if interval not in available_intervals:
+        # Validate interval; anything that is a multiple of the 30s base series can be served
+        if not tick_indexer.is_supported_interval(interval):
             raise HTTPException(
                 status_code=400, 
-                detail=f"Invalid interval. Available intervals: {available_intervals}"
+                detail=f"Invalid interval {interval}. Use a multiple of 30s, e.g. 30s, 1min, 2min, 15min, 1h"
             )
         
-        # If session_id is provided, get data up to current tick
-        if session_id:
-            from sim_services.simulation_engine import get_quote_for_symbol
-            from models.trading_sim import SimulationSession
-            from sqlmodel import select
-            
-            # Get session and calculate current tick
-            session = db.exec(select(SimulationSession).where(SimulationSession.id == session_id)).first()
-            if not session:
-                raise HTTPException(status_code=404, detail="Session not found")
-            
-            # Calculate current tick based on elapsed time using centralized function
-            from sim_services.simulation_engine import get_current_tick
-            current_tick = get_current_tick(db, session)
-            
-            # Get data up to current tick
-            data = tick_indexer.get_tick_range(symbol, 0, current_tick, interval)
-        else:
-            # Get data by days (original behavior)
-            data = s3_adapter.get_ohlc_by_days(symbol, days, interval)
-        
-        if not data:
+        if downsample not in DOWNSAMPLE_MODES:
             raise HTTPException(
-                status_code=404,
-                detail=f"No data found for {symbol} with interval {interval}"
+                status_code=400,
+                detail=f"Invalid downsample mode. Available modes: {list(DOWNSAMPLE_MODES)}"
             )
         
-        return {
-            "symbol": symbol,
-            "interval": interval,
-            "days": days if not session_id else None,
-            "session_id": session_id,
-            "current_tick": current_tick if session_id else None,
-            "data": data,
-            "count": len(data)
-        }
+        current_tick = _get_session_tick(db, session_id) if session_id else None
+        
+        def build():
+            # If session_id is provided, get data up to current tick
+            if session_id:
+                # current_tick counts 30s bars, so coarser intervals end at the
+                # (partial) bar containing it
+                columns = tick_indexer.get_session_columns(symbol, current_tick, interval)
+            else:
+                # Get data by days (original behavior)
+                columns = tick_indexer.get_day_columns(symbol, days, interval)
+            source_count = len(columns["close"]) if columns is not None else 0
+            if columns is not None and max_points:
+                columns = downsample_columns(columns, max_points, downsample)
+            data = tick_indexer.columns_to_rows(symbol, columns)
+            
+            if not data:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No data found for {symbol} with interval {interval}"
+                )
+            
+            return {
+                "symbol": symbol,
+                "interval": interval,
+                "days": days if not session_id else None,
+                "session_id": session_id,
+                "current_tick": current_tick,
+                "data": data,
+                "count": len(data),
+                "downsampled": max_points is not None and len(data) < source_count
+            }
+        
+        key = _cache_key("chart", symbol, interval, days, session_id, current_tick, max_points, downsample)
+        return _cached_json(request, key, build, precompress=not session_id)
         
     except HTTPException:
         raise
@@ -73,41 +139,176 @@ async def get_chart_data(
         raise HTTPException(status_code=500, detail=f"Error retrieving chart data: {str(e)}")
 
 @router.get("/{symbol}/range")
-async def get_chart_data_range(
+def get_chart_data_range(
     symbol: str,
+    request: Request,
     start_tick: int = Query(..., description="Starting tick index"),
     end_tick: int = Query(..., description="Ending tick index"),
     interval: str = Query('30s', description="Time interval"),
+    max_points: Optional[int] = Query(None, ge=3, description="Downsample to at most this many points"),
+    downsample: str = Query('ohlc', description="Downsampling mode (ohlc, lttb)"),
     db: Session = Depends(get_session)
 ):
     """
     Get OHLCV chart data for a symbol within a specific tick range.
+    Responses carry a strong ETag; ranges that lie entirely inside the stored
+    series are marked immutable, and If-None-Match revalidation returns 304.
     
     Example: GET /chart_data/AAPL/range?start_tick=1000&end_tick=2000&interval=30s
     """
     try:
-        # Validate interval
-        available_intervals = s3_adapter.get_available_intervals()
-        if interval not in available_intervals:
+        # Validate interval; anything that is a multiple of the 30s base series can be served
+        if not tick_indexer.is_supported_interval(interval):
             raise HTTPException(
                 status_code=400, 
-                detail=f"Invalid interval. Available intervals: {available_intervals}"
+                detail=f"Invalid interval {interval}. Use a multiple of 30s, e.g. 30s, 1min, 2min, 15min, 1h"
             )
         
-        # Get data by tick range
-        data = tick_indexer.get_tick_range(symbol, start_tick, end_tick, interval)
+        if downsample not in DOWNSAMPLE_MODES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid downsample mode. Available modes: {list(DOWNSAMPLE_MODES)}"
+            )
         
-        if not data:
+        # A range inside the stored series can never change for this data version
+        version = tick_indexer.get_data_version(symbol, interval)
+        headers = None
+        if version is not None:
+            etag = make_etag(symbol, interval, start_tick, end_tick, max_points, downsample, version)
+            immutable = 0 <= start_tick <= end_tick < tick_indexer.get_total_ticks(symbol, interval)
+            headers = cache_headers(etag, immutable)
+            matched = matched_etag(request.headers.get("if-none-match"), etag)
+            if matched is not None:
+                # Revalidates whichever representation the client holds
+                return Response(status_code=304, headers=dict(headers, ETag=matched))
+        
+        def build():
+            # Get data by tick range
+            data = tick_indexer.get_tick_range(symbol, start_tick, end_tick, interval, max_points, downsample)
+            
+            if not data:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No data found for {symbol} in tick range {start_tick}-{end_tick}"
+                )
+            
+            return {
+                "symbol": symbol,
+                "interval": interval,
+                "start_tick": start_tick,
+                "end_tick": end_tick,
+                "data": data,
+                "count": len(data)
+            }
+        
+        key = _cache_key("range", symbol, interval, start_tick, end_tick, max_points, downsample)
+        return _cached_json(request, key, build, headers)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving chart data: {str(e)}")
+
+@router.get("/{symbol}/columns")
+def get_chart_columns(
+    symbol: str,
+    request: Request,
+    interval: str = Query('30s', description="Time interval (any multiple of 30s)"),
+    cursor: int = Query(0, ge=0, description="Tick to start from; pass next_cursor to get the following page"),
+    limit: int = Query(5000, ge=1, le=50000, description="Maximum bars per page"),
+    end_tick: Optional[int] = Query(None, description="Last tick to include (defaults to the end of the series)"),
+    days: Optional[int] = Query(None, ge=1, description="Only the last N days of the series"),
+    session_id: str = Query(None, description="Simulation session ID to stop at the current tick"),
+    db: Session = Depends(get_session)
+):
+    """
+    Get OHLCV chart data as columns: {"tick": [...], "t": [...], "o": [...], "h": [...],
+    "l": [...], "c": [...], "v": [...]} with t in epoch seconds. Long ranges are paged;
+    next_cursor is the tick to request next, or null on the last page.
+    
+    Example: GET /chart_data/AAPL/columns?interval=5min&cursor=0&limit=5000
+    """
+    try:
+        # Validate interval; anything that is a multiple of the 30s base series can be served
+        if not tick_indexer.is_supported_interval(interval):
             raise HTTPException(
-                status_code=404,
-                detail=f"No data found for {symbol} in tick range {start_tick}-{end_tick}"
+                status_code=400, 
+                detail=f"Invalid interval {interval}. Use a multiple of 30s, e.g. 30s, 1min, 2min, 15min, 1h"
+            )
+        
+        current_tick = _get_session_tick(db, session_id) if session_id else None
+        
+        def build():
+            if session_id:
+                columns = tick_indexer.get_session_columns(symbol, current_tick, interval)
+            elif days:
+                columns = tick_indexer.get_day_columns(symbol, days, interval)
+            else:
+                total_ticks = tick_indexer.get_total_ticks(symbol, interval)
+                columns = tick_indexer.get_tick_columns(symbol, 0, total_ticks - 1, interval)
+            
+            if columns is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No data found for {symbol} with interval {interval}"
+                )
+            
+            # Ticks are contiguous, so end_tick and the page are plain slices
+            # offset from the window's first tick
+            first_tick = int(columns["tick"][0]) if len(columns["tick"]) else 0
+            if end_tick is not None:
+                columns = {name: values[:max(0, end_tick - first_tick + 1)] for name, values in columns.items()}
+            total = len(columns["close"])
+            start = min(max(0, cursor - first_tick), total)
+            page = slice(start, min(start + limit, total))
+            columns = {name: values[page] for name, values in columns.items()}
+            next_cursor = first_tick + page.stop if page.stop < total else None
+            
+            return to_columnar(symbol, interval, columns, next_cursor)
+        
+        # The payload depends on the session only through its current tick
+        key = _cache_key("columns", symbol, interval, current_tick, days, cursor, limit, end_tick)
+        return _cached_json(request, key, build, precompress=not session_id)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving chart data: {str(e)}")
+
+@router.get("/{symbol}/since")
+def get_chart_data_since(
+    symbol: str,
+    session_id: str = Query(..., description="Simulation session ID"),
+    since_tick: int = Query(..., description="Last tick the client already has"),
+    interval: str = Query('30s', description="Time interval (any multiple of 30s)"),
+    db: Session = Depends(get_session)
+):
+    """
+    Get only the bars a live chart is missing: from since_tick up to the session's
+    current tick. The bar at since_tick is sent again because for intervals coarser
+    than 30s it may have been partial; clients replace their bars from the first
+    returned tick onward.
+    
+    Example: GET /chart_data/AAPL/since?session_id=abc123&since_tick=1500&interval=30s
+    """
+    try:
+        # Validate interval; anything that is a multiple of the 30s base series can be served
+        if not tick_indexer.is_supported_interval(interval):
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Invalid interval {interval}. Use a multiple of 30s, e.g. 30s, 1min, 2min, 15min, 1h"
             )
         
+        current_tick = _get_session_tick(db, session_id)
+        columns = tick_indexer.get_session_columns(symbol, current_tick, interval, start_tick=max(0, since_tick))
+        data = tick_indexer.columns_to_rows(symbol, columns)
+        
         return {
             "symbol": symbol,
             "interval": interval,
-            "start_tick": start_tick,
-            "end_tick": end_tick,
+            "session_id": session_id,
+            "since_tick": since_tick,
+            "current_tick": current_tick,
             "data": data,
             "count": len(data)
         }
@@ -118,24 +319,26 @@ async def get_chart_data_range(
         raise HTTPException(status_code=500, detail=f"Error retrieving chart data: {str(e)}")
 
 @router.get("/{symbol}/tick/{tick}")
-async def get_tick_data(
+def get_tick_data(
     symbol: str,
     tick: int,
+    request: Request,
+    response: Response,
     interval: str = Query('30s', description="Time interval"),
     db: Session = Depends(get_session)
 ):
     """
-    Get OHLCV data for a specific tick.
+    Get OHLCV data for a specific tick. Existing ticks are served with an
+    immutable strong ETag and honour If-None-Match.
     
     Example: GET /chart_data/AAPL/tick/1000?interval=30s
     """
     try:
-        # Validate interval
-        available_intervals = s3_adapter.get_available_intervals()
-        if interval not in available_intervals:
+        # Validate interval; anything that is a multiple of the 30s base series can be served
+        if not tick_indexer.is_supported_interval(interval):
             raise HTTPException(
                 status_code=400, 
-                detail=f"Invalid interval. Available intervals: {available_intervals}"
+                detail=f"Invalid interval {interval}. Use a multiple of 30s, e.g. 30s, 1min, 2min, 15min, 1h"
             )
         
         # Get specific tick data
@@ -147,6 +350,12 @@ async def get_tick_data(
                 detail=f"No data found for {symbol} at tick {tick}"
             )
         
+        etag = make_etag(symbol, interval, tick, tick_indexer.get_data_version(symbol, interval))
+        headers = cache_headers(etag, immutable=True)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+        
         return data
         
     except HTTPException:
@@ -155,7 +364,7 @@ async def get_tick_data(
         raise HTTPException(status_code=500, detail=f"Error retrieving tick data: {str(e)}")
 
 @router.get("/intervals")
-async def get_available_intervals(db: Session = Depends(get_session)):
+def get_available_intervals(db: Session = Depends(get_session)):
     """Get list of available time intervals."""
     try:
         intervals = s3_adapter.get_available_intervals()
@@ -167,7 +376,7 @@ async def get_available_intervals(db: Session = Depends(get_session)):
         raise HTTPException(status_code=500, detail=f"Error retrieving intervals: {str(e)}")
 
 @router.get("/symbols/{interval}")
-async def get_symbols_for_interval(
+def get_symbols_for_interval(
     interval: str,
     db: Session = Depends(get_session)
 ):
@@ -192,24 +401,33 @@ async def get_symbols_for_interval(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving symbols: {str(e)}")
 
+@router.get("/cache/stats")
+async def get_response_cache_stats():
+    """Hit rate and size of the serialized chart response cache."""
+    return response_cache.stats()
+
+@router.get("/storage/stats")
+async def get_storage_stats():
+    """Call counts, bytes and latency of the market data storage backend."""
+    return s3_adapter.backend.stats()
+
 @router.get("/metadata/{symbol}")
-async def get_symbol_metadata(
+def get_symbol_metadata(
     symbol: str,
     interval: str = Query('30s', description="Time interval"),
     db: Session = Depends(get_session)
 ):
     """Get metadata for a symbol including total ticks and date range."""
     try:
-        # Validate interval
-        available_intervals = s3_adapter.get_available_intervals()
-        if interval not in available_intervals:
+        # Validate interval; anything that is a multiple of the 30s base series can be served
+        if not tick_indexer.is_supported_interval(interval):
             raise HTTPException(
                 status_code=400, 
-                detail=f"Invalid interval. Available intervals: {available_intervals}"
+                detail=f"Invalid interval {interval}. Use a multiple of 30s, e.g. 30s, 1min, 2min, 15min, 1h"
             )
         
         # Get DataFrame to extract metadata
-        df = s3_adapter.get_dataframe(symbol, interval)
+        df = tick_indexer.get_dataframe(symbol, interval)
         
         if df is None or len(df) == 0:
             raise HTTPException(
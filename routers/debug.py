@@ -0,0 +1,38 @@
+import asyncio
+import os
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from sim_services import profiler
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+def _require_admin(token: Optional[str]) -> None:
+    """The debug endpoints only exist when ADMIN_TOKEN is set, and need it in X-Admin-Token."""
+    expected = os.getenv("ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token or not secrets.compare_digest(token, expected):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+@router.get("/profile")
+async def get_profile(
+    seconds: float = Query(10.0, gt=0, le=profiler.MAX_SECONDS, description="How long to sample"),
+    hz: float = Query(100.0, ge=1, le=profiler.MAX_HZ, description="Samples per second"),
+    thread: Optional[str] = Query(None, description="Only threads whose name contains this"),
+    x_admin_token: Optional[str] = Header(None),
+):
+    """
+    Sample every thread of this worker (event loop, price update loop, request
+    threads) and return collapsed stacks, e.g. for flamegraph.pl or speedscope:
+
+        curl -H "X-Admin-Token: $ADMIN_TOKEN" "localhost:8000/debug/profile?seconds=30" > api.folded
+    """
+    _require_admin(x_admin_token)
+    try:
+        # Sampled from a worker thread so the event loop keeps serving (and shows up in the profile)
+        stacks, rounds = await asyncio.to_thread(profiler.profile, seconds, hz, thread)
+    except profiler.ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return Response(content=stacks, media_type="text/plain",
+                    headers={"X-Profile-Samples": str(rounds), "Cache-Control": "no-store"})
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+from sim_services.metrics import CONTENT_TYPE, registry
+
+router = APIRouter(tags=["Metrics"])
+
+@router.get("/metrics")
+def get_metrics():
+    """
+    Counters and histograms for market data storage, the OHLCV cache, the tick
+    indexer, Firestore, /sim/stream, trades and the price update loop, in the
+    Prometheus text format.
+    """
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
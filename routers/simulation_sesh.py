@@ -4,12 +4,18 @@ from db import get_session
 from models.trading_sim import Action, Trade, OrderType, OrderStatus, SimulationSession, PortfolioEntry
 from sim_services.simulation_engine import (start_session, process_trade, get_current_tick,
                                           sync_current_tick_for_session, get_active_portfolio,
-                                          get_quote_for_symbol, get_all_symbols, get_ohlc_for_symbol,
+                                          get_quote_for_symbol, get_quotes_for_symbols, get_all_symbols, get_ohlc_for_symbol,
                                           get_df_len, end_session, update_prices, set_exit_conditions,
                                           sim_engine)
 from sim_services.s3_data_adapter import s3_adapter
 from sim_services.tick_indexer import tick_indexer
-from typing import Optional, List, Dict
+from sim_services.session_journal import session_journal
+from sim_services.indicator_engine import indicator_engine
+from sim_services.fundamentals_store import fundamentals_store
+from sim_services.logging_setup import get_logger, log_sampled
+from sim_services.metrics import TRADE_SECONDS, WS_CONNECTIONS, WS_FRAME_SECONDS, WS_FRAMES
+from sim_services.event_loop import run_blocking
+from typing import Optional, List, Dict, Tuple
 from pydantic import BaseModel
 from google.cloud.firestore import FieldFilter
 
@@ -17,14 +23,25 @@ from google.cloud.firestore import FieldFilter
 from sim_services import simulation_engine as session_service
 import asyncio
 import json
+import logging
+import os
+import time
 from datetime import datetime, timezone
-import pandas as pd
-import pandas_ta as ta
 
 """ ABSOLUTELY CRUCIAL ALL DATASETS ARE EQUALLY LONG 〜(￣▽￣〜) """
 
 router = APIRouter(prefix="/sim", tags=["Simulation"])
 
+logger = get_logger("sim.api")
+stream_logger = get_logger("sim.stream")
+trade_logger = get_logger("sim.trade")
+
+_frames_sent = WS_FRAMES.labels("sent")
+_frames_failed = WS_FRAMES.labels("error")
+
+# Seconds between frames on /sim/stream; load tests shorten it to push more frames per socket
+STREAM_INTERVAL_SECONDS = float(os.getenv("SIM_STREAM_INTERVAL_SECONDS", "30"))
+
 class TradeRequest(BaseModel):
     symbol: str
     action: Action
@@ -44,7 +61,7 @@ async def activate_simulation_session(request: SessionActivationRequest):
     This endpoint handles the complete activation process.
     """
     try:
-        success = sim_engine.activate_firestore_session(request.session_id)
+        success = await run_blocking(sim_engine.activate_firestore_session, request.session_id)
         
         if success:
             return {
@@ -65,7 +82,7 @@ async def deactivate_simulation_session(request: SessionActivationRequest):
     This stops the session and calculates final P&L.
     """
     try:
-        success = sim_engine.deactivate_firestore_session(request.session_id)
+        success = await run_blocking(sim_engine.deactivate_firestore_session, request.session_id)
         
         if success:
             return {
@@ -85,7 +102,7 @@ async def get_session_status(session_id: str):
     Get the status of a Firestore simulation session.
     """
     try:
-        status = sim_engine.get_firestore_session_status(session_id)
+        status = await run_blocking(sim_engine.get_firestore_session_status, session_id)
         
         if status:
             return {
@@ -109,7 +126,8 @@ async def get_user_firestore_sessions(user_id: str):
         # Query Firestore for user's sessions
         sessions_ref = db.collection("simulation_sessions")
         sessions_query = sessions_ref.where("user_id", "==", user_id)
-        sessions_docs = sessions_query.stream()
+        # stream() is lazy; the documents are fetched when the list is built
+        sessions_docs = await run_blocking(list, sessions_query.stream())
         
         sessions = []
         for doc in sessions_docs:
@@ -126,203 +144,216 @@ async def get_user_firestore_sessions(user_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting user sessions: {str(e)}")
 
+def _build_stream_frame(session_id: str) -> Tuple[Dict, bool]:
+    """
+    Build one /sim/stream frame. Every Firestore and tick indexer call here
+    blocks, so the websocket handler runs this through run_blocking instead of
+    on the event loop. Returns the frame and whether the stream should close
+    after sending it.
+    """
+    # Use Firestore for session and portfolio data
+    from unified_app.firebase_setup.firebaseSet import db as firestore_db
+    
+    # Get session from Firestore
+    session_ref = firestore_db.collection("simulation_sessions").document(session_id)
+    session_doc = session_ref.get()
+    
+    if not session_doc.exists:
+        stream_logger.warning("Stream session %s not found in Firestore", session_id)
+        return {"error": "Session not found"}, True
+    
+    session_data = session_doc.to_dict()
+    stream_logger.debug("Stream session %s data: %s", session_id, session_data)
+    
+    # Check if session is active
+    is_active = session_data.get("is_active", False)
+    
+    if not is_active:
+        stream_logger.info("Stream session %s is not active; closing", session_id)
+        return {"status": "session_ended"}, True
+    
+    # Calculate current tick based on elapsed time
+    current_time = datetime.now(timezone.utc)
+    start_time_str = session_data.get("start_time")
+    
+    if not start_time_str:
+        stream_logger.warning("Stream session %s has no start_time", session_id)
+        return {"error": "Session start time not found"}, True
+    
+    # Parse start time
+    if isinstance(start_time_str, str):
+        start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
+    else:
+        start_time = start_time_str
+    
+    # Ensure timezone awareness
+    if start_time.tzinfo is None:
+        start_time = start_time.replace(tzinfo=timezone.utc)
+    
+    # Calculate elapsed time and current tick
+    elapsed_seconds = (current_time - start_time).total_seconds()
+    duration_seconds = session_data.get("duration_seconds", 3600)
+    
+    # Calculate current tick based on elapsed time
+    # 1 day = 780 ticks (6.5 hours * 2 trades/min)
+    ticks_per_day = 780
+    total_ticks = (duration_seconds / 86400) * ticks_per_day
+    
+    # Ensure we have a minimum number of ticks
+    if total_ticks < 1:
+        total_ticks = 780  # Default to 1 day worth of ticks
+    
+    # Calculate current tick based on elapsed time
+    if elapsed_seconds <= 0:
+        current_tick = 0
+    elif elapsed_seconds >= duration_seconds:
+        current_tick = int(total_ticks) - 1
+    else:
+        current_tick = int((elapsed_seconds / duration_seconds) * total_ticks)
+    
+    # Ensure current_tick is within bounds
+    current_tick = max(0, min(current_tick, int(total_ticks) - 1))
+    
+    stream_logger.debug("Stream session %s: tick %s of %s, elapsed %.0fs of %ss",
+                        session_id, current_tick, total_ticks, elapsed_seconds, duration_seconds)
+    
+    # Update current_tick in Firestore session
+    try:
+        session_ref.update({
+            "current_tick": current_tick,
+            "last_updated": datetime.now(timezone.utc).isoformat()
+        })
+        session_journal.record_tick(session_id, current_tick)
+
+    except Exception as e:
+        stream_logger.warning("Could not update current_tick for session %s: %s", session_id, e)
+    
+    # Get portfolio data from Firestore
+    portfolio_ref = firestore_db.collection("portfolio_entries")
+    portfolio_entries = list(portfolio_ref.where("session_id", "==", session_id).stream())
+    
+    portfolio_data = []
+    for entry_doc in portfolio_entries:
+        entry = entry_doc.to_dict()
+        # Get current price for this symbol
+        symbol = entry.get("symbol")
+        current_price = 0.0
+        
+        if symbol:
+            try:
+                # Get current price from tick data
+                current_price = tick_indexer.get_current_price(symbol, current_tick)
+                if current_price is not None:
+                    # Update the portfolio entry in Firestore with current price
+                    portfolio_ref = firestore_db.collection("portfolio_entries")
+                    portfolio_query = portfolio_ref.where("session_id", "==", session_id).where("symbol", "==", symbol)
+                    portfolio_docs = list(portfolio_query.stream())
+                    
+                    if portfolio_docs:
+                        doc_ref = portfolio_docs[0].reference
+                        holdings = entry.get("holdings", 0)
+                        avg_price = entry.get("avg_price", 0.0)
+                        
+                        # Calculate PnL
+                        if holdings > 0 and avg_price > 0:
+                            pnl = (current_price - avg_price) * holdings
+                        else:
+                            pnl = 0.0
+                        
+                        doc_ref.update({
+                            "last_price": current_price,
+                            "pnl": pnl,
+                            "updated_at": datetime.now(timezone.utc).isoformat()
+                        })
+                        
+                        # Update entry data for response
+                        entry["last_price"] = current_price
+                        entry["pnl"] = pnl
+                    else:
+                        current_price = entry.get("last_price", 0.0)
+                else:
+                    current_price = entry.get("last_price", 0.0)
+            except Exception as e:
+                stream_logger.warning("Could not get current price for %s: %s", symbol, e)
+                current_price = entry.get("last_price", 0.0)
+        else:
+            current_price = entry.get("last_price", 0.0)
+        
+        portfolio_data.append({
+            "symbol": entry.get("symbol"),
+            "holdings": entry.get("holdings", 0),
+            "last_price": current_price,
+            "avg_price": entry.get("avg_price", 0),
+            "pnl": entry.get("pnl", 0),
+            "market_value": entry.get("holdings", 0) * current_price,
+            "stop_loss_price": entry.get("stop_loss_price"),
+            "take_profit_price": entry.get("take_profit_price")
+        })
+    
+    # Prepare response
+    response = {
+        "session_id": session_id,
+        "current_tick": current_tick,
+        "cash": session_data.get("cash", 100000),
+        "is_active": session_data.get("is_active", False),
+        "pnl": session_data.get("pnl", 0),
+        "portfolio": portfolio_data,
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+    
+    stream_logger.debug("Stream session %s frame: %s", session_id, response)
+    log_sampled(stream_logger, logging.INFO, f"frame:{session_id}",
+                "Stream session %s at tick %s with %d positions", session_id, current_tick, len(portfolio_data))
+    return response, False
+
 @router.websocket("/stream/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
-    print(f"🔍 WebSocket: Attempting to connect for session {session_id}")
+    stream_logger.debug("Connecting stream for session %s", session_id)
+    connected = False
     
     try:
         await websocket.accept()
-        print(f"✅ WebSocket: Successfully connected for session {session_id}")
+        connected = True
+        WS_CONNECTIONS.inc()
+        stream_logger.info("Stream connected for session %s", session_id)
         
         while True:
+            frame_start = time.perf_counter()
             try:
-                # Use Firestore for session and portfolio data
-                from unified_app.firebase_setup.firebaseSet import db as firestore_db
-                
-                print(f"🔍 WebSocket: Fetching session data for {session_id}")
-                
-                # Get session from Firestore
-                session_ref = firestore_db.collection("simulation_sessions").document(session_id)
-                session_doc = session_ref.get()
-                
-                if not session_doc.exists:
-                    print(f"❌ WebSocket: Session {session_id} not found in Firestore")
-                    await websocket.send_text(json.dumps({"error": "Session not found"}))
-                    break
-                
-                session_data = session_doc.to_dict()
-                print(f"🔍 WebSocket: Session data retrieved: {session_data}")
-                
-                # Check if session is active
-                is_active = session_data.get("is_active", False)
-                print(f"🔍 WebSocket: Session is_active = {is_active}")
-                
-                if not is_active:
-                    print(f"❌ WebSocket: Session {session_id} is not active")
-                    await websocket.send_text(json.dumps({"status": "session_ended"}))
+                # Firestore and tick data calls block, so the frame is built off the event loop
+                frame, done = await run_blocking(_build_stream_frame, session_id)
+                await websocket.send_text(json.dumps(frame))
+                if done:
                     break
-                
-                # Calculate current tick based on elapsed time
-                current_time = datetime.now(timezone.utc)
-                start_time_str = session_data.get("start_time")
-                
-                print(f"🔍 WebSocket: start_time_str = {start_time_str}")
-                
-                if not start_time_str:
-                    print(f"❌ WebSocket: No start_time found for session {session_id}")
-                    await websocket.send_text(json.dumps({"error": "Session start time not found"}))
-                    break
-                
-                # Parse start time
-                if isinstance(start_time_str, str):
-                    start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-                else:
-                    start_time = start_time_str
-                
-                # Ensure timezone awareness
-                if start_time.tzinfo is None:
-                    start_time = start_time.replace(tzinfo=timezone.utc)
-                
-                # Calculate elapsed time and current tick
-                elapsed_seconds = (current_time - start_time).total_seconds()
-                duration_seconds = session_data.get("duration_seconds", 3600)
-                
-                print(f"🔍 WebSocket: elapsed_seconds = {elapsed_seconds}, duration_seconds = {duration_seconds}")
-                
-                # Calculate current tick based on elapsed time
-                # 1 day = 780 ticks (6.5 hours * 2 trades/min)
-                ticks_per_day = 780
-                total_ticks = (duration_seconds / 86400) * ticks_per_day
-                
-                # Ensure we have a minimum number of ticks
-                if total_ticks < 1:
-                    total_ticks = 780  # Default to 1 day worth of ticks
-                
-                # Calculate current tick based on elapsed time
-                if elapsed_seconds <= 0:
-                    current_tick = 0
-                elif elapsed_seconds >= duration_seconds:
-                    current_tick = int(total_ticks) - 1
-                else:
-                    current_tick = int((elapsed_seconds / duration_seconds) * total_ticks)
-                
-                # Ensure current_tick is within bounds
-                current_tick = max(0, min(current_tick, int(total_ticks) - 1))
-                
-                print(f"🔍 WebSocket: calculated current_tick = {current_tick}, total_ticks = {total_ticks}")
-                print(f"🔍 WebSocket: elapsed_seconds = {elapsed_seconds}, duration_seconds = {duration_seconds}")
-                print(f"🔍 WebSocket: progress = {(elapsed_seconds / duration_seconds) * 100:.2f}%")
-                
-                # Update current_tick in Firestore session
-                try:
-                    session_ref.update({
-                        "current_tick": current_tick,
-                        "last_updated": datetime.now(timezone.utc).isoformat()
-                    })
-                    print(f"✅ Updated current_tick in Firestore: {current_tick}")
-
-                except Exception as e:
-                    print(f"⚠️ Warning: Could not update current_tick in Firestore: {e}")
-                
-                # Get portfolio data from Firestore
-                portfolio_ref = firestore_db.collection("portfolio_entries")
-                portfolio_entries = list(portfolio_ref.where("session_id", "==", session_id).stream())
-                
-                print(f"🔍 WebSocket: Found {len(portfolio_entries)} portfolio entries")
-                
-                portfolio_data = []
-                for entry_doc in portfolio_entries:
-                    entry = entry_doc.to_dict()
-                    # Get current price for this symbol
-                    symbol = entry.get("symbol")
-                    current_price = 0.0
-                    
-                    if symbol:
-                        try:
-                            # Get current price from tick data
-                            current_price = tick_indexer.get_current_price(symbol, current_tick)
-                            if current_price is not None:
-                                # Update the portfolio entry in Firestore with current price
-                                portfolio_ref = firestore_db.collection("portfolio_entries")
-                                portfolio_query = portfolio_ref.where("session_id", "==", session_id).where("symbol", "==", symbol)
-                                portfolio_docs = list(portfolio_query.stream())
-                                
-                                if portfolio_docs:
-                                    doc_ref = portfolio_docs[0].reference
-                                    holdings = entry.get("holdings", 0)
-                                    avg_price = entry.get("avg_price", 0.0)
-                                    
-                                    # Calculate PnL
-                                    if holdings > 0 and avg_price > 0:
-                                        pnl = (current_price - avg_price) * holdings
-                                    else:
-                                        pnl = 0.0
-                                    
-                                    doc_ref.update({
-                                        "last_price": current_price,
-                                        "pnl": pnl,
-                                        "updated_at": datetime.now(timezone.utc).isoformat()
-                                    })
-                                    
-                                    # Update entry data for response
-                                    entry["last_price"] = current_price
-                                    entry["pnl"] = pnl
-                                else:
-                                    current_price = entry.get("last_price", 0.0)
-                            else:
-                                current_price = entry.get("last_price", 0.0)
-                        except Exception as e:
-                            print(f"⚠️ Warning: Could not get current price for {symbol}: {e}")
-                            current_price = entry.get("last_price", 0.0)
-                    else:
-                        current_price = entry.get("last_price", 0.0)
-                    
-                    portfolio_data.append({
-                        "symbol": entry.get("symbol"),
-                        "holdings": entry.get("holdings", 0),
-                        "last_price": current_price,
-                        "avg_price": entry.get("avg_price", 0),
-                        "pnl": entry.get("pnl", 0),
-                        "market_value": entry.get("holdings", 0) * current_price,
-                        "stop_loss_price": entry.get("stop_loss_price"),
-                        "take_profit_price": entry.get("take_profit_price")
-                    })
-                
-                # Prepare response
-                response = {
-                    "session_id": session_id,
-                    "current_tick": current_tick,
-                    "cash": session_data.get("cash", 100000),
-                    "is_active": session_data.get("is_active", False),
-                    "pnl": session_data.get("pnl", 0),
-                    "portfolio": portfolio_data,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                }
-                
-                print(f"🔍 WebSocket: Sending response: {response}")
-                await websocket.send_text(json.dumps(response))
+                WS_FRAME_SECONDS.observe(time.perf_counter() - frame_start)
+                _frames_sent.inc()
             
                 # Wait before next update
-                await asyncio.sleep(30)
+                await asyncio.sleep(STREAM_INTERVAL_SECONDS)
             
             except Exception as e:
-                print(f"❌ WebSocket: Error in main loop for session {session_id}: {e}")
+                stream_logger.exception("Stream loop failed for session %s: %s", session_id, e)
+                _frames_failed.inc()
                 await websocket.send_text(json.dumps({"error": str(e)}))
                 break
                 
     except WebSocketDisconnect:
-        print(f"🔌 WebSocket: Disconnected for session {session_id}")
+        stream_logger.info("Stream disconnected for session %s", session_id)
     except Exception as e:
-        print(f"❌ WebSocket: Connection error for session {session_id}: {e}")
+        stream_logger.warning("Stream connection error for session %s: %s", session_id, e)
         try:
             await websocket.send_text(json.dumps({"error": str(e)}))
         except:
             pass
+    finally:
+        if connected:
+            WS_CONNECTIONS.dec()
 
 """
 The WebSocket and the POST /trade endpoint are completely separate communication channels.
 """
 @router.post("/trade")
+@TRADE_SECONDS.time()
 def place_trade(
     session_id: str = Query(..., description="The ID of the simulation session"),
     user_id: str = Query(..., description="The user ID"),
@@ -339,7 +370,7 @@ def place_trade(
     try:
         from unified_app.firebase_setup.firebaseSet import db as firestore_db
         
-        print(f"[TRADE] Processing trade: {symbol} {action} {quantity} @ ${price}")
+        trade_logger.debug("Processing trade for session %s: %s %s %s @ %s", session_id, symbol, action, quantity, price)
         
         # Get session from Firestore
         session_ref = firestore_db.collection("simulation_sessions").document(session_id)
@@ -466,8 +497,20 @@ def place_trade(
         }
         trade_doc = trades_ref.add(trade_data)[1]
         
-        print(f"✅ Trade executed: {symbol} {action} {quantity} @ ${price}")
-        print(f"   New holdings: {new_holdings}, New cash: ${new_cash:.2f}")
+        session_journal.record(
+            session_id, "trade",
+            trade_id=trade_doc.id,
+            symbol=symbol,
+            action=trade_data["action"],
+            quantity=quantity,
+            price=price,
+            new_holdings=new_holdings,
+            new_avg_price=new_avg_price,
+            new_cash=new_cash
+        )
+        
+        trade_logger.info("Trade filled for session %s: %s %s %s @ %.2f; holdings %s, cash %.2f",
+                          session_id, symbol, trade_data["action"], quantity, price, new_holdings, new_cash)
         
         return {
             "success": True,
@@ -484,7 +527,7 @@ def place_trade(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Trade processing failed: {e}")
+        trade_logger.exception("Trade processing failed for session %s: %s", session_id, e)
         raise HTTPException(status_code=500, detail=f"Trade processing failed: {str(e)}")
 
 @router.get("/orders")
@@ -496,7 +539,7 @@ def get_orders(
 ):
     """Get all trades/orders for a session and user from Firestore."""
     try:
-        print(f"[ORDERS] user_id={user_id}, session_id={session_id}, status={status}")
+        logger.debug("Orders for user %s, session %s, status %s", user_id, session_id, status)
         from unified_app.firebase_setup.firebaseSet import db as firestore_db
         
         # Get trades from Firestore
@@ -506,14 +549,13 @@ def get_orders(
         if status:
             query = query.where("status", "==", status)
             
-        print(f"[ORDERS] Executing Firestore query...")
         trades = [doc.to_dict() for doc in query.stream()]
-        print(f"[ORDERS] Found {len(trades)} trades")
+        logger.debug("Found %d orders for session %s", len(trades), session_id)
         
         return trades
         
     except Exception as e:
-        print(f"[ORDERS] Error fetching orders: {e}")
+        logger.exception("Error fetching orders for session %s: %s", session_id, e)
         raise HTTPException(status_code=500, detail=f"Failed to fetch orders: {str(e)}")
 
 @router.post("/orders/{order_id}/cancel")
@@ -546,44 +588,44 @@ def get_portfolio(
 ):
     """Get portfolio for a user in a specific session using Firebase"""
     try:
-        print(f"[PORTFOLIO] user_id={user_id}, session_id={session_id}")
+        logger.debug("Portfolio for user %s, session %s", user_id, session_id)
         from unified_app.firebase_setup.firebaseSet import db as firestore_db
         from google.cloud.firestore import FieldFilter
         # Get session from Firestore
         session_ref = firestore_db.collection("simulation_sessions").document(session_id)
         session_doc = session_ref.get()
-        print(f"[PORTFOLIO] session_doc.exists={session_doc.exists}")
         if not session_doc.exists:
-            print(f"[PORTFOLIO] Session not found: {session_id}")
+            logger.info("Portfolio session not found: %s", session_id)
             raise HTTPException(status_code=404, detail="Session not found")
         session_data = session_doc.to_dict()
-        print(f"[PORTFOLIO] session_data: {session_data}")
+        logger.debug("Portfolio session %s data: %s", session_id, session_data)
         if not session_data.get("is_active", False):
-            print(f"[PORTFOLIO] Session is not active")
+            logger.info("Portfolio session %s is not active", session_id)
             raise HTTPException(status_code=400, detail="Session is not active")
         if session_data.get("user_id") != user_id:
-            print(f"[PORTFOLIO] Access denied: session user_id={session_data.get('user_id')} != {user_id}")
+            logger.warning("Portfolio access denied: session %s belongs to %s, not %s",
+                           session_id, session_data.get('user_id'), user_id)
             raise HTTPException(status_code=403, detail="Access denied")
         # Get portfolio entries from Firebase
         try:
             portfolio_ref = firestore_db.collection("portfolio_entries")
             portfolio_entries = list(portfolio_ref.where("session_id", "==", session_id).stream())
-            print(f"[PORTFOLIO] Found {len(portfolio_entries)} portfolio entries")
+            logger.debug("Found %d portfolio entries for session %s", len(portfolio_entries), session_id)
         except Exception as e:
-            print(f"[PORTFOLIO] Error fetching portfolio entries: {e}")
+            logger.exception("Error fetching portfolio entries for session %s: %s", session_id, e)
             raise HTTPException(status_code=500, detail=f"Failed to fetch portfolio entries: {e}")
         portfolio = []
         for entry_doc in portfolio_entries:
             try:
                 entry_data = entry_doc.to_dict()
-                print(f"[PORTFOLIO] Processing entry: {entry_data}")
+                logger.debug("Portfolio entry: %s", entry_data)
                 symbol = entry_data.get("symbol")
                 if not symbol:
-                    print(f"[PORTFOLIO] Skipping entry with no symbol: {entry_data}")
+                    logger.warning("Skipping portfolio entry with no symbol: %s", entry_data)
                     continue
                 start_time_str = session_data.get("start_time")
                 if not start_time_str:
-                    print(f"[PORTFOLIO] No start_time for session, using last_price")
+                    logger.debug("No start_time for session %s, using last_price", session_id)
                     current_price = entry_data.get("last_price", 0.0)
                 else:
                     try:
@@ -596,17 +638,16 @@ def get_portfolio(
                         total_ticks = (duration_seconds / 86400) * ticks_per_day
                         current_tick = min(int((elapsed_seconds / duration_seconds) * total_ticks), int(total_ticks) - 1)
                         current_tick = max(0, current_tick)
-                        print(f"[PORTFOLIO] Calculated current_tick={current_tick} for symbol={symbol}")
                         try:
                             current_price = tick_indexer.get_current_price(symbol, current_tick)
-                            print(f"[PORTFOLIO] Current price for {symbol} at tick {current_tick}: {current_price}")
+                            logger.debug("Current price for %s at tick %s: %s", symbol, current_tick, current_price)
                             if current_price is None:
                                 current_price = entry_data.get("last_price", 0.0)
                         except Exception as e:
-                            print(f"[PORTFOLIO] Error getting current price for {symbol}: {e}")
+                            logger.warning("Error getting current price for %s: %s", symbol, e)
                             current_price = entry_data.get("last_price", 0.0)
                     except Exception as e:
-                        print(f"[PORTFOLIO] Error parsing start_time or calculating tick: {e}")
+                        logger.warning("Error parsing start_time or calculating tick for session %s: %s", session_id, e)
                         current_price = entry_data.get("last_price", 0.0)
                 holdings = entry_data.get("holdings", 0)
                 avg_price = entry_data.get("avg_price", 0.0)
@@ -626,8 +667,8 @@ def get_portfolio(
                     "take_profit_price": entry_data.get("take_profit_price")
                 })
             except Exception as e:
-                print(f"[PORTFOLIO] Error processing entry: {e}")
-        print(f"[PORTFOLIO] Final portfolio: {portfolio}")
+                logger.warning("Error processing portfolio entry for session %s: %s", session_id, e)
+        logger.debug("Portfolio for session %s: %s", session_id, portfolio)
         return {
             "session_id": session_id,
             "user_id": user_id,
@@ -640,7 +681,7 @@ def get_portfolio(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[PORTFOLIO] Unhandled error: {e}")
+        logger.exception("Portfolio request failed for session %s: %s", session_id, e)
         raise HTTPException(status_code=500, detail=f"Failed to get portfolio: {str(e)}")
 
 @router.get("/quote/{session_id}/{symbol}")
@@ -650,6 +691,22 @@ def get_quote(session_id: str, symbol: str, db: Session = Depends(get_session)):
     """
     return get_quote_for_symbol(db, session_id, symbol)
 
+@router.get("/quotes/{session_id}")
+def get_quotes(
+    session_id: str,
+    symbols: str = Query(..., description="Comma-separated symbols, e.g. AAPL,MSFT,NVDA"),
+    db: Session = Depends(get_session)
+):
+    """
+    Returns quotes for several symbols at the session's current tick, with one
+    session lookup for the whole batch. Symbols without data map to null.
+    """
+    symbol_list = [symbol.strip() for symbol in symbols.split(",") if symbol.strip()]
+    result = get_quotes_for_symbols(db, session_id, symbol_list)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Session not found or not active")
+    return result
+
 @router.get("/symbols")
 def list_symbols(db: Session = Depends(get_session)):
     """Returns all available symbols for the watchlist"""
@@ -697,7 +754,7 @@ def get_current_tick_for_symbol(session_id: str, symbol: str, db: Session = Depe
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error getting current tick for {symbol}: {e}")
+        logger.exception("Error getting current tick for %s: %s", symbol, e)
         raise HTTPException(status_code=500, detail=f"Error getting current tick: {str(e)}")
 
 class ExitConditionsRequest(BaseModel):
@@ -782,6 +839,12 @@ def set_exit_conditions_endpoint(
             stop_loss=request.stop_loss,
             take_profit=request.take_profit
         )
+        session_journal.record(
+            request.session_id, "exit_conditions",
+            symbol=request.symbol,
+            stop_loss=request.stop_loss,
+            take_profit=request.take_profit
+        )
         
         # Return updated position
         updated_position = db.exec(select(PortfolioEntry)
@@ -801,7 +864,7 @@ def set_exit_conditions_endpoint(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error setting exit conditions: {e}")
+        logger.exception("Error setting exit conditions: %s", e)
         raise HTTPException(status_code=500, detail=f"Error setting exit conditions: {str(e)}")
 
 @router.get("/fundamentals/{session_id}/{symbol}")
@@ -814,7 +877,7 @@ def get_fundamental_data_endpoint(
     Get fundamental and technical indicators for a symbol at its current tick date.
     """
     try:
-        print(f"API: Received request for fundamental data for {symbol} in session {session_id}")
+        logger.debug("Fundamentals requested for %s in session %s", symbol, session_id)
         
         # Use Firestore to validate session instead of SQLite
         from unified_app.firebase_setup.firebaseSet import db as firestore_db
@@ -832,8 +895,6 @@ def get_fundamental_data_endpoint(
         if not session_data.get("is_active", False):
             raise HTTPException(status_code=400, detail="Session is not active")
         
-        print(f"API: Session validated in Firestore - {session_id} is active")
-
         # Get the current tick for the session
         # Calculate current tick based on elapsed time
         current_time = datetime.now(timezone.utc)
@@ -869,68 +930,38 @@ def get_fundamental_data_endpoint(
             # Use an empty dict if no fundamental data is found for the date
             indicators = {}
         else:
-            indicators = s3_adapter.get_fundamental_indicators(symbol, date_str)
+            indicators = fundamentals_store.get_indicators(symbol, date_str)
             if not indicators:
                 indicators = {}
 
-        # 2. Calculate technical indicators from recent tick data
-        # Fetch last 100 ticks for indicator calculation (e.g., for SMA, RSI)
-        history_ticks = 100
-        start_tick = max(0, current_tick - history_ticks)
-        
-        # Get historical data as a list of dicts
-        tick_data_list = tick_indexer.get_tick_range(symbol, start_tick, current_tick)
+        # 2. Technical indicators, read from the columns precomputed when the series loaded
+        technicals = indicator_engine.get_indicators(symbol, current_tick)
         
-        if not tick_data_list:
+        if not technicals:
             # If no tick data, return whatever fundamental data we have
             return indicators if indicators else {"message": "No data available"}
         
-        # Convert to DataFrame for TA calculations
-        df = pd.DataFrame(tick_data_list)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df.set_index('timestamp', inplace=True)
-
-        # Standardize column names for pandas_ta
-        df.rename(columns={
-            "open": "Open", "high": "High", "low": "Low", 
-            "close": "Close", "volume": "Volume"
-        }, inplace=True)
-        
-        # Calculate indicators
-        df.ta.sma(length=20, append=True)
-        df.ta.rsi(length=14, append=True)
-        df.ta.atr(length=14, append=True)
-        df.ta.macd(append=True)
-        df.ta.vwap(append=True)
-        
         # Calculate 5-day change % (approximate with ticks)
         # 1 day = 780 ticks (6.5 hours * 2 trades/min)
         five_day_ticks = 780 * 5 
         if current_tick >= five_day_ticks:
             price_5_days_ago = tick_indexer.get_current_price(symbol, current_tick - five_day_ticks)
-            if price_5_days_ago and price_5_days_ago > 0:
-                current_price = df['Close'].iloc[-1]
+            current_price = tick_indexer.get_current_price(symbol, current_tick)
+            if price_5_days_ago and price_5_days_ago > 0 and current_price is not None:
                 indicators['5D_Change%'] = ((current_price - price_5_days_ago) / price_5_days_ago) * 100
             else:
                 indicators['5D_Change%'] = 0
         else:
             indicators['5D_Change%'] = 0
 
-        # Extract the latest values of the calculated indicators
-        latest_indicators = df.iloc[-1]
-        indicators['SMA_20'] = latest_indicators.get('SMA_20')
-        indicators['RSI_14'] = latest_indicators.get('RSI_14')
-        indicators['ATR_14'] = latest_indicators.get('ATRr_14') # pandas-ta names it ATRr_14
-        indicators['MACD'] = latest_indicators.get('MACD_12_26_9')
-        indicators['VWAP'] = latest_indicators.get('VWAP_D')
+        indicators.update(technicals)
 
-        print(f"API: Successfully retrieved and calculated indicators for {symbol}. Returning data.")
         return indicators
 
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error getting fundamental data for {symbol}: {e}")
+        logger.exception("Error getting fundamental data for %s: %s", symbol, e)
         raise HTTPException(status_code=500, detail=f"Error getting fundamental data: {str(e)}")
 
 @router.post("/validate-trade")
@@ -0,0 +1,219 @@
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_STARTING_CASH = 100000.0  # matches the Firestore session default
+
+class VectorizedBacktester:
+    """
+    Runs many rule-based strategies against the same close-price matrix at once.
+
+    Cash and holdings for every strategy session live in (strategies, symbols)
+    NumPy arrays, so one step through the tick loop advances every session with
+    a handful of array operations. Each strategy splits its starting cash into
+    equal sleeves per symbol and trades each sleeve long-only at the close.
+
+    Strategies are plain dicts:
+        {"type": "sma_cross", "fast": 10, "slow": 30}
+        {"type": "rsi", "length": 14, "lower": 30, "upper": 70}
+    """
+
+    def __init__(self, closes: np.ndarray, symbols: Optional[List[str]] = None,
+                 starting_cash: float = DEFAULT_STARTING_CASH, fee_rate: float = 0.0):
+        closes = np.asarray(closes, dtype=np.float64)
+        if closes.ndim == 1:
+            closes = closes[np.newaxis, :]
+        if closes.ndim != 2 or closes.shape[1] < 2:
+            raise ValueError("closes must be a (symbols, ticks) matrix with at least 2 ticks")
+
+        # Stored tick-major so each step reads one contiguous row
+        self._closes = np.ascontiguousarray(closes.T)
+        self.n_ticks, self.n_symbols = self._closes.shape
+        self.symbols = symbols or [str(i) for i in range(self.n_symbols)]
+        self.starting_cash = float(starting_cash)
+        self.fee_rate = float(fee_rate)
+
+    def _parse_strategies(self, strategies: List[Dict]) -> Tuple[Dict, Dict]:
+        """Split strategies by type and map their parameters onto shared indicator tables."""
+        sma_rows, fast, slow = [], [], []
+        rsi_rows, lengths, lower, upper = [], [], [], []
+
+        for row, strategy in enumerate(strategies):
+            kind = strategy.get("type")
+            if kind == "sma_cross":
+                if not 0 < int(strategy["fast"]) < int(strategy["slow"]):
+                    raise ValueError(f"Strategy {row}: need 0 < fast < slow")
+                sma_rows.append(row)
+                fast.append(int(strategy["fast"]))
+                slow.append(int(strategy["slow"]))
+            elif kind == "rsi":
+                length = int(strategy.get("length", 14))
+                if length < 1:
+                    raise ValueError(f"Strategy {row}: RSI length must be positive")
+                rsi_rows.append(row)
+                lengths.append(length)
+                lower.append(float(strategy.get("lower", 30)))
+                upper.append(float(strategy.get("upper", 70)))
+            else:
+                raise ValueError(f"Strategy {row}: unknown type {kind!r}")
+
+        # Each distinct window is computed once per tick and shared by every strategy using it
+        windows, window_idx = np.unique(np.array(fast + slow, dtype=np.int64), return_inverse=True)
+        rsi_lengths, length_idx = np.unique(np.array(lengths, dtype=np.int64), return_inverse=True)
+
+        # Strategies are regrouped by type so each group is a contiguous block of rows
+        sma = {
+            "rows": slice(0, len(sma_rows)),
+            "order": np.array(sma_rows, dtype=np.int64),
+            "windows": windows,
+            "fast_idx": window_idx[:len(fast)],
+            "slow_idx": window_idx[len(fast):],
+        }
+        rsi = {
+            "rows": slice(len(sma_rows), len(sma_rows) + len(rsi_rows)),
+            "order": np.array(rsi_rows, dtype=np.int64),
+            "lengths": rsi_lengths.astype(np.float64),
+            "length_idx": length_idx,
+            "lower": np.array(lower, dtype=np.float64)[:, np.newaxis],
+            "upper": np.array(upper, dtype=np.float64)[:, np.newaxis],
+        }
+        return sma, rsi
+
+    def run(self, strategies: List[Dict]) -> Dict:
+        """Step every strategy through the full series and return per-strategy statistics."""
+        n_strategies = len(strategies)
+        if n_strategies == 0:
+            return {"strategies": [], "final_equity": np.array([]), "total_return": np.array([]),
+                    "max_drawdown": np.array([]), "trades": np.array([], dtype=np.int64)}
+
+        sma, rsi = self._parse_strategies(strategies)
+        closes = self._closes
+
+        # Running sums give any SMA window in O(1) per tick
+        cumsum = np.zeros((self.n_ticks + 1, self.n_symbols))
+        np.cumsum(closes, axis=0, out=cumsum[1:])
+
+        # Wilder averages of gains/losses, one row per distinct RSI length
+        avg_gain = np.zeros((len(rsi["lengths"]), self.n_symbols))
+        avg_loss = np.zeros_like(avg_gain)
+
+        sleeve = self.starting_cash / self.n_symbols
+        cash = np.full((n_strategies, self.n_symbols), sleeve)
+        shares = np.zeros((n_strategies, self.n_symbols))
+        long = np.zeros((n_strategies, self.n_symbols), dtype=bool)
+        want = np.zeros_like(long)
+        trades = np.zeros((n_strategies, self.n_symbols), dtype=np.int64)
+        peak = np.full(n_strategies, self.starting_cash)
+        max_drawdown = np.zeros(n_strategies)
+        equity = np.full(n_strategies, self.starting_cash)
+
+        ones = np.ones(self.n_symbols)  # row sums via matmul are much cheaper than .sum(axis=1)
+        buy_cost = 1.0 + self.fee_rate
+        sell_keep = 1.0 - self.fee_rate
+
+        for t in range(self.n_ticks):
+            price = closes[t]
+            tradable = price > 0
+
+            if len(sma["order"]):
+                start = t + 1 - sma["windows"]
+                ready = start >= 0
+                means = (cumsum[t + 1] - cumsum[np.maximum(start, 0)]) / sma["windows"][:, np.newaxis]
+                both_ready = ready[sma["fast_idx"]] & ready[sma["slow_idx"]]
+                want[sma["rows"]] = (means[sma["fast_idx"]] > means[sma["slow_idx"]]) & both_ready[:, np.newaxis]
+
+            if len(rsi["order"]) and t > 0:
+                delta = price - closes[t - 1]
+                # Dividing by min(n, length) gives the simple mean during warm-up, then Wilder smoothing
+                divisor = np.minimum(float(t), rsi["lengths"])[:, np.newaxis]
+                avg_gain += (np.maximum(delta, 0.0) - avg_gain) / divisor
+                avg_loss += (np.maximum(-delta, 0.0) - avg_loss) / divisor
+                total = avg_gain + avg_loss
+                values = np.divide(100.0 * avg_gain, total, out=np.full_like(total, 50.0), where=total > 0)
+                values = values[rsi["length_idx"]]
+                ready = (t >= rsi["lengths"])[rsi["length_idx"]][:, np.newaxis]
+                held = long[rsi["rows"]]
+                decided = np.where(values < rsi["lower"], True, np.where(values > rsi["upper"], False, held))
+                want[rsi["rows"]] = np.where(ready, decided, held)
+
+            sell = long & ~want & tradable
+            buy = want & ~long & tradable
+
+            if sell.any():
+                cash += np.where(sell, shares * (price * sell_keep), 0.0)
+                shares[sell] = 0.0
+                long &= ~sell
+                trades += sell
+
+            if buy.any():
+                unit_cost = np.where(tradable, price * buy_cost, np.inf)
+                quantity = np.where(buy, np.floor(cash / unit_cost), 0.0)
+                filled = quantity > 0
+                cash -= quantity * unit_cost
+                shares += quantity
+                long |= filled
+                trades += filled
+
+            equity = cash @ ones + shares @ np.where(tradable, price, 0.0)
+            np.maximum(peak, equity, out=peak)
+            np.maximum(max_drawdown, (peak - equity) / peak, out=max_drawdown)
+
+        # Map the grouped rows back to the caller's strategy order
+        restore = np.argsort(np.concatenate([sma["order"], rsi["order"]]))
+        return {
+            "strategies": strategies,
+            "final_equity": equity[restore],
+            "total_return": equity[restore] / self.starting_cash - 1.0,
+            "max_drawdown": max_drawdown[restore],
+            "trades": trades.sum(axis=1)[restore],
+        }
+
+    def leaderboard(self, results: Dict, top: int = 10) -> List[Dict]:
+        """Rank strategies by total return for tournament displays."""
+        order = np.argsort(-results["total_return"])[:top]
+        return [
+            {
+                "rank": rank + 1,
+                "strategy": results["strategies"][i],
+                "final_equity": float(results["final_equity"][i]),
+                "total_return_pct": float(results["total_return"][i] * 100),
+                "max_drawdown_pct": float(results["max_drawdown"][i] * 100),
+                "trades": int(results["trades"][i]),
+            }
+            for rank, i in enumerate(order)
+        ]
+
+def strategy_grid(sma_fast: List[int] = (5, 10, 20), sma_slow: List[int] = (30, 50, 100),
+                  rsi_lengths: List[int] = (14,), rsi_lower: List[float] = (30,),
+                  rsi_upper: List[float] = (70,)) -> List[Dict]:
+    """Build the cartesian product of SMA-cross and RSI-threshold strategies."""
+    strategies = [
+        {"type": "sma_cross", "fast": f, "slow": s}
+        for f in sma_fast for s in sma_slow if f < s
+    ]
+    strategies += [
+        {"type": "rsi", "length": n, "lower": lo, "upper": hi}
+        for n in rsi_lengths for lo in rsi_lower for hi in rsi_upper if lo < hi
+    ]
+    return strategies
+
+def load_close_matrix(symbols: List[str], interval: str = '30s') -> np.ndarray:
+    """Stack close prices for symbols into a (symbols, ticks) matrix from the tick store."""
+    from .tick_indexer import tick_indexer
+
+    series = []
+    for symbol in symbols:
+        df = tick_indexer.get_dataframe(symbol, interval)
+        if df is None or len(df) == 0:
+            raise ValueError(f"No data found for {symbol} with interval {interval}")
+        series.append(df["close"].to_numpy(dtype=np.float64))
+
+    # Datasets are expected to be equally long; trim defensively if they are not
+    length = min(len(s) for s in series)
+    return np.vstack([s[:length] for s in series])
+
+def run_backtest(strategies: List[Dict], symbols: List[str], interval: str = '30s',
+                 starting_cash: float = DEFAULT_STARTING_CASH, fee_rate: float = 0.0) -> Dict:
+    """Load closes for symbols and evaluate all strategies in one vectorized pass."""
+    closes = load_close_matrix(symbols, interval)
+    backtester = VectorizedBacktester(closes, symbols, starting_cash, fee_rate)
+    return backtester.run(strategies)
@@ -0,0 +1,112 @@
+import json
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # fall back to the standard library encoder
+    orjson = None
+
+"""
+Chart payload formats. The row format repeats every key per bar; the columnar
+format holds one array per field with epoch-second timestamps and is encoded
+straight from the numpy arrays.
+"""
+
+def epoch_seconds(timestamps) -> np.ndarray:
+    """Epoch seconds (UTC) for a datetime array."""
+    index = pd.DatetimeIndex(timestamps)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    # Go through datetime64[s] so the result does not depend on the stored resolution
+    return index.to_numpy(dtype="datetime64[s]").astype(np.int64)
+
+def frame_columns(df: pd.DataFrame, start_tick: int, end_tick: int) -> Dict[str, np.ndarray]:
+    """OHLCV arrays for ticks start_tick..end_tick of a frame; numeric columns are views, not copies."""
+    window = slice(start_tick, end_tick + 1)
+    return {
+        "tick": np.arange(start_tick, end_tick + 1),
+        "timestamp": df["timestamp"].array[window],
+        "open": df["open"].to_numpy(dtype=np.float64)[window],
+        "high": df["high"].to_numpy(dtype=np.float64)[window],
+        "low": df["low"].to_numpy(dtype=np.float64)[window],
+        "close": df["close"].to_numpy(dtype=np.float64)[window],
+        "volume": df["volume"].to_numpy()[window],
+    }
+
+def _int_volume(volume) -> np.ndarray:
+    """Volume as int64; missing (NaN) volume counts as nothing traded instead of a garbage cast."""
+    volume = np.asarray(volume)
+    if volume.dtype.kind == "f":
+        volume = np.nan_to_num(volume, nan=0.0, posinf=0.0, neginf=0.0)
+    return volume.astype(np.int64)
+
+def to_rows(symbol: str, columns: Optional[Dict[str, np.ndarray]]) -> List[Dict]:
+    """The original row format: one dict per bar."""
+    if columns is None:
+        return []
+    return [
+        {
+            "symbol": symbol,
+            "tick": tick,
+            "timestamp": timestamp.isoformat(),
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": volume
+        }
+        for tick, timestamp, open_, high, low, close, volume in zip(
+            columns["tick"].tolist(), columns["timestamp"],
+            columns["open"].tolist(), columns["high"].tolist(), columns["low"].tolist(),
+            columns["close"].tolist(), _int_volume(columns["volume"]).tolist()
+        )
+    ]
+
+def to_columnar(symbol: str, interval: str, columns: Optional[Dict[str, np.ndarray]],
+                next_cursor: Optional[int] = None) -> Dict:
+    """Build the columnar payload for OHLCV arrays from TickIndexer.get_tick_columns."""
+    if columns is None:
+        columns = {name: np.zeros(0) for name in ("tick", "open", "high", "low", "close", "volume")}
+        columns["timestamp"] = pd.DatetimeIndex([], tz="UTC")
+    return {
+        "symbol": symbol,
+        "interval": interval,
+        "count": len(columns["close"]),
+        "next_cursor": next_cursor,
+        "tick": columns["tick"].astype(np.int64),
+        "t": epoch_seconds(columns["timestamp"]),
+        "o": columns["open"].astype(np.float64),
+        "h": columns["high"].astype(np.float64),
+        "l": columns["low"].astype(np.float64),
+        "c": columns["close"].astype(np.float64),
+        "v": _int_volume(columns["volume"]),
+    }
+
+def _finite(value):
+    """Copy of a payload with numpy values as Python ones and NaN/inf as None, as orjson writes them."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == "f":
+            return [item if math.isfinite(item) else None for item in value.tolist()]
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return _finite(value.item())
+    return value
+
+def encode_json(payload) -> bytes:
+    """
+    Serialize a payload that may hold numpy arrays, with orjson when it is installed.
+    NaN and infinity become null either way; bare NaN is not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(_finite(payload), separators=(",", ":"), allow_nan=False).encode("utf-8")
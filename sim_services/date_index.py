@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .indicator_engine import day_keys
+
+EPOCH = date(1970, 1, 1)
+DAY_NS = 86400 * 10**9
+
+class TickDateIndex:
+    """
+    Two-way mapping between tick indexes and trading dates for one series.
+
+    Each tick's trading date (wall-clock date in the exchange's time zone) is kept
+    as a day ordinal, and every distinct date keeps its first and last tick, so
+    tick -> date and date -> tick range are both array lookups.
+    """
+
+    def __init__(self, timestamps: pd.Series):
+        # Absolute instants, sorted because ticks are in time order
+        self.timestamps_ns = timestamps.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        self.tick_days = day_keys(timestamps)
+        # Bars are stored in time order, so each date's ticks are one contiguous run
+        self.days, self.first_ticks = np.unique(self.tick_days, return_index=True)
+        self.last_ticks = np.append(self.first_ticks[1:] - 1, len(self.tick_days) - 1)
+        self._date_strings = [str(EPOCH + timedelta(days=int(day))) for day in self.days]
+        self._day_positions = np.searchsorted(self.days, self.tick_days)
+
+    def __len__(self) -> int:
+        return len(self.tick_days)
+
+    def date_from_tick(self, tick: int) -> Optional[str]:
+        """Trading date (YYYY-MM-DD) of a tick, or None if out of range."""
+        if tick < 0 or tick >= len(self.tick_days):
+            return None
+        return self._date_strings[self._day_positions[tick]]
+
+    def tick_range_for_date(self, day: str) -> Optional[Tuple[int, int]]:
+        """First and last tick of a trading date, or None if the date has no bars."""
+        ordinal = (date.fromisoformat(day) - EPOCH).days
+        pos = int(np.searchsorted(self.days, ordinal))
+        if pos == len(self.days) or self.days[pos] != ordinal:
+            return None
+        return int(self.first_ticks[pos]), int(self.last_ticks[pos])
+
+    def last_days_start_tick(self, n_days: int, end_tick: Optional[int] = None) -> int:
+        """First tick of the window covering the last n trading dates up to end_tick."""
+        if len(self.tick_days) == 0:
+            return 0
+        if end_tick is None or end_tick >= len(self.tick_days):
+            end_tick = len(self.tick_days) - 1
+        end_pos = int(self._day_positions[end_tick])
+        return int(self.first_ticks[max(0, end_pos - n_days + 1)])
+
+    def calendar_window_start_tick(self, days: int) -> int:
+        """First tick at or after (last timestamp - days), found by binary search."""
+        if len(self.timestamps_ns) == 0:
+            return 0
+        return int(np.searchsorted(self.timestamps_ns, self.timestamps_ns[-1] - days * DAY_NS, side="left"))
+
+    def dates(self) -> List[str]:
+        """All trading dates in the series, oldest first."""
+        return list(self._date_strings)
@@ -0,0 +1,86 @@
+from typing import Dict
+
+import numpy as np
+
+"""
+Server-side downsampling for chart series. Columns are plain numpy arrays keyed
+by name (tick, timestamp, open, high, low, close, volume), so the same code
+serves the session, tick-range and day-window chart endpoints.
+"""
+
+DOWNSAMPLE_MODES = ("ohlc", "lttb")
+
+def bucket_starts(n: int, n_buckets: int) -> np.ndarray:
+    """Start index of each of n_buckets near-equal contiguous buckets over n points."""
+    n_buckets = max(1, min(n_buckets, n))
+    return (np.arange(n_buckets, dtype=np.int64) * n) // n_buckets
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indexes of the n_out points that best keep
+    the visual shape of y over x. The first and last points are always kept.
+    """
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1], dtype=np.int64)[:max(n_out, 0)]
+
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+
+    # Interior points go into n_out - 2 buckets; each bucket's average is the
+    # third triangle vertex for the bucket before it
+    edges = 1 + bucket_starts(n - 2, n_out - 2)
+    edges = np.append(edges, n - 1)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    avg_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+    avg_x = np.append(avg_x, x[n - 1])
+    avg_y = np.append(avg_y, y[n - 1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        cx, cy = avg_x[b + 1], avg_y[b + 1]
+        # Twice the triangle area between the last pick, each candidate and the next bucket's average
+        areas = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(areas))
+        selected[b + 1] = a
+    return selected
+
+def aggregate_runs(columns: Dict[str, np.ndarray], starts: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Merge each run of bars beginning at `starts` into one candle: first open,
+    max high, min low, last close and summed volume. Each candle keeps its first
+    bar's tick and timestamp, so highs and lows are never clipped by the reduction.
+    """
+    ends = np.append(starts[1:], len(columns["close"])) - 1
+    return {
+        "tick": columns["tick"][starts],
+        "timestamp": columns["timestamp"][starts],
+        "open": columns["open"][starts],
+        "high": np.maximum.reduceat(columns["high"], starts),
+        "low": np.minimum.reduceat(columns["low"], starts),
+        "close": columns["close"][ends],
+        "volume": np.add.reduceat(columns["volume"], starts),
+    }
+
+def aggregate_ohlc(columns: Dict[str, np.ndarray], n_out: int) -> Dict[str, np.ndarray]:
+    """Merge consecutive bars into n_out near-equal candles."""
+    return aggregate_runs(columns, bucket_starts(len(columns["close"]), n_out))
+
+def downsample_columns(columns: Dict[str, np.ndarray], max_points: int, mode: str = "ohlc") -> Dict[str, np.ndarray]:
+    """Reduce a chart series to at most max_points rows with the given mode."""
+    n = len(columns["close"])
+    if max_points is None or n <= max_points:
+        return columns
+    if mode == "lttb":
+        keep = lttb_indices(columns["tick"], columns["close"], max_points)
+        return {name: values[keep] for name, values in columns.items()}
+    if mode == "ohlc":
+        return aggregate_ohlc(columns, max_points)
+    raise ValueError(f"Unknown downsample mode: {mode}. Expected one of {DOWNSAMPLE_MODES}")
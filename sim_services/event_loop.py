@@ -0,0 +1,113 @@
+import asyncio
+import contextvars
+import functools
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from .logging_setup import get_logger
+from .metrics import BLOCKING_CALLS_IN_FLIGHT, EVENT_LOOP_LAG_SECONDS, EVENT_LOOP_STALLS
+
+"""
+Keeping the event loop responsive. Every websocket and async route on a worker
+shares one loop, so a synchronous Firestore call or pandas load made directly
+in an async handler stalls all of them.
+
+run_blocking(fn, *args) runs a blocking call on a bounded thread pool
+(BLOCKING_WORKERS threads, default 16) and awaits the result. Context
+variables, such as the request's Server-Timing stages, go along with the call.
+
+LoopStallDetector is the instrumentation mode, on when LOOP_STALL_MS is set. A
+heartbeat callback on the loop stamps the time every few milliseconds; a
+watchdog thread that sees no stamp for LOOP_STALL_MS logs the loop thread's
+stack at that moment to sim.loop, which names the call that is blocking.
+"""
+
+BLOCKING_WORKERS = int(os.getenv("BLOCKING_WORKERS", "16"))
+
+logger = get_logger("sim.loop")
+
+_executor = ThreadPoolExecutor(max_workers=BLOCKING_WORKERS, thread_name_prefix="blocking")
+
+async def run_blocking(fn, *args, **kwargs):
+    """Run `fn(*args, **kwargs)` on the blocking pool without holding up the event loop."""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+    BLOCKING_CALLS_IN_FLIGHT.inc()
+    try:
+        return await loop.run_in_executor(_executor, call)
+    finally:
+        BLOCKING_CALLS_IN_FLIGHT.dec()
+
+class LoopStallDetector:
+    """
+    Reports event loop stalls longer than `threshold` seconds with the stack
+    the loop was stuck in. One report per stall, plus its total length once
+    the loop recovers.
+    """
+
+    def __init__(self, threshold: float, interval: Optional[float] = None):
+        self.threshold = threshold
+        # Beat often enough that a stall is noticed well within the threshold
+        self.interval = interval or max(threshold / 4, 0.005)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._last_beat = 0.0
+        self._reported_beat: Optional[float] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+        self.stalls = 0
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Start watching; call from the loop's own thread."""
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop.clear()
+        self._handle = self._loop.call_later(self.interval, self._beat, self._last_beat + self.interval)
+        self._watchdog = threading.Thread(target=self._watch, name="loop-stall-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._handle is not None:
+            self._handle.cancel()
+        if self._watchdog is not None:
+            self._watchdog.join()
+
+    def _beat(self, expected: float) -> None:
+        now = time.perf_counter()
+        lag = max(0.0, now - expected)
+        EVENT_LOOP_LAG_SECONDS.observe(lag)
+        if self._reported_beat is not None:
+            logger.warning("Event loop was stalled for %.0fms", (now - self._reported_beat) * 1000,
+                           extra={"stall_ms": round((now - self._reported_beat) * 1000, 1)})
+            self._reported_beat = None
+        self._last_beat = now
+        if not self._stop.is_set():
+            self._handle = self._loop.call_later(self.interval, self._beat, now + self.interval)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            last_beat = self._last_beat
+            blocked = time.perf_counter() - last_beat
+            if blocked < self.threshold or self._reported_beat == last_beat:
+                continue
+            self._reported_beat = last_beat
+            self.stalls += 1
+            EVENT_LOOP_STALLS.inc()
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = traceback.format_stack(frame) if frame is not None else []
+            logger.warning("Event loop blocked for %.0fms so far, in:\n%s", blocked * 1000, "".join(stack),
+                           extra={"blocked_ms": round(blocked * 1000, 1),
+                                  "stack": [line.strip() for line in stack]})
+
+def stall_detector_from_env() -> Optional[LoopStallDetector]:
+    """A detector for LOOP_STALL_MS, or None when it is unset or 0."""
+    threshold_ms = float(os.getenv("LOOP_STALL_MS", "0") or 0)
+    return LoopStallDetector(threshold_ms / 1000) if threshold_ms > 0 else None
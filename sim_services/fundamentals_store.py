@@ -0,0 +1,105 @@
+import threading
+import time
+from datetime import timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# The fundamentals CSVs are stamped in Eastern time (UTC-4); bare dates are read the same way
+FUNDAMENTALS_TZ = timezone(timedelta(hours=-4))
+MAX_DISTANCE_NS = 86400 * 10**9  # nearest row must be within 1 day
+
+class FundamentalsStore:
+    """
+    Daily fundamental indicators, loaded once per symbol into a sorted date index.
+
+    Lookups binary-search the index for an exact date or the nearest row within
+    one day, so after the first request for a symbol no further S3 calls are made.
+    A symbol with no usable file is remembered as missing for
+    `negative_ttl_seconds`, so it costs one fetch per window rather than one per
+    request; the loader also returns None on S3 errors, which are retried after.
+    """
+
+    def __init__(self, loader: Optional[Callable[[str], Optional[pd.DataFrame]]] = None,
+                 negative_ttl_seconds: float = 300):
+        self._loader = loader
+        self._indexes: Dict[str, Tuple[np.ndarray, List[Dict]]] = {}
+        self._missing: Dict[str, float] = {}  # Symbol -> time its negative entry expires
+        self._negative_ttl_seconds = negative_ttl_seconds
+        self._lock = threading.Lock()
+
+    def _load_dataframe(self, symbol: str) -> Optional[pd.DataFrame]:
+        if self._loader is not None:
+            return self._loader(symbol)
+        from .s3_data_adapter import s3_adapter
+        return s3_adapter.get_fundamentals_dataframe(symbol)
+
+    def _get_index(self, symbol: str) -> Optional[Tuple[np.ndarray, List[Dict]]]:
+        index = self._indexes.get(symbol)
+        if index is not None:
+            return index
+        expires = self._missing.get(symbol)
+        if expires is not None and time.monotonic() < expires:
+            return None
+
+        df = self._load_dataframe(symbol)
+        if df is None or "Date" not in df.columns:
+            with self._lock:
+                self._missing[symbol] = time.monotonic() + self._negative_ttl_seconds
+            return None
+
+        dates = pd.to_datetime(df["Date"], utc=True).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        order = np.argsort(dates, kind="stable")
+        records = df.astype(object).where(df.notna(), None).to_dict("records")
+
+        index = (dates[order], [records[i] for i in order])
+        with self._lock:
+            self._missing.pop(symbol, None)
+            return self._indexes.setdefault(symbol, index)
+
+    def get_indicators(self, symbol: str, date: str) -> Optional[Dict]:
+        """Get the fundamentals row for a date, or the nearest row within one day."""
+        index = self._get_index(symbol)
+        if index is None:
+            return None
+        dates, records = index
+        if len(dates) == 0:
+            return None
+
+        target = pd.Timestamp(date)
+        if target.tzinfo is None:
+            target = target.tz_localize(FUNDAMENTALS_TZ)
+        target_ns = target.value
+
+        pos = int(np.searchsorted(dates, target_ns))
+        if pos < len(dates) and dates[pos] == target_ns:
+            best = pos
+        else:
+            neighbours = [i for i in (pos - 1, pos) if 0 <= i < len(dates)]
+            best = min(neighbours, key=lambda i: abs(int(dates[i]) - target_ns))
+            if abs(int(dates[best]) - target_ns) > MAX_DISTANCE_NS:
+                return None
+
+        # Callers add their own keys to the result, so hand out a copy
+        return dict(records[best])
+
+    def warm(self, symbols: List[str]) -> None:
+        """Load fundamentals for symbols ahead of the first request."""
+        for symbol in symbols:
+            self._get_index(symbol)
+
+    def invalidate(self, symbol: str) -> None:
+        """Drop the cached index for a symbol."""
+        with self._lock:
+            self._indexes.pop(symbol, None)
+            self._missing.pop(symbol, None)
+
+    def clear(self) -> None:
+        """Drop all cached indexes."""
+        with self._lock:
+            self._indexes.clear()
+            self._missing.clear()
+
+# Global fundamentals store instance
+fundamentals_store = FundamentalsStore()
@@ -0,0 +1,75 @@
+import hashlib
+from typing import Optional
+
+"""
+Conditional-request helpers for chart responses. Historical bars never change,
+so a response is identified by what was asked for plus the version of the
+underlying data file. The gzipped body is a different representation with its
+own strong ETag, the identity one plus "-gzip", and every response carries
+Vary: Accept-Encoding so caches keep the two apart.
+"""
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+def make_etag(*parts) -> str:
+    """Strong ETag over the request parameters and data version."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+def gzip_etag(etag: str) -> str:
+    """ETag of the gzipped representation of the body tagged `etag`."""
+    return f'{etag[:-1]}-gzip"'
+
+def matched_etag(if_none_match: Optional[str], etag: str) -> Optional[str]:
+    """
+    The representation's ETag an If-None-Match header value covers, identity
+    (`etag`) or gzip; None when it covers neither.
+    """
+    if not if_none_match:
+        return None
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" in candidates:
+        return etag
+    for tag in (etag, gzip_etag(etag)):
+        # Weak validators compare equal to their strong form for GET revalidation
+        if tag in candidates or f"W/{tag}" in candidates:
+            return tag
+    return None
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value covers either representation of the given ETag."""
+    return matched_etag(if_none_match, etag) is not None
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """
+    Whether an Accept-Encoding header allows gzip: listed as gzip or x-gzip, or
+    covered by "*", with a q-value above zero. "gzip;q=0" rules it out.
+    """
+    if not accept_encoding:
+        return False
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    for coding in ("gzip", "x-gzip"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return qualities.get("*", 0.0) > 0
+
+def cache_headers(etag: str, immutable: bool) -> dict:
+    """ETag plus Cache-Control: immutable when the content can never change, revalidate otherwise."""
+    return {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
@@ -0,0 +1,250 @@
+import math
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+"""
+Technical indicators for the tick series. Stored series get them as columns,
+computed once at load; the O(1) per-tick updaters are the incremental form of
+the same formulas. Both follow pandas_ta's defaults, so values line up with what
+df.ta.sma/rsi/atr/macd/vwap would return over the same history. RSI and ATR use
+0.3's Wilder smoothing; 0.4 seeds it at the first bar instead, so its early
+values differ until the seed decays.
+"""
+
+class SMA:
+    """Simple moving average over a fixed window."""
+
+    def __init__(self, length: int):
+        self.length = length
+        self._window = deque()
+        self._sum = 0.0
+
+    def update(self, value: float) -> float:
+        self._window.append(value)
+        self._sum += value
+        if len(self._window) > self.length:
+            self._sum -= self._window.popleft()
+        return self._sum / self.length if len(self._window) == self.length else math.nan
+
+class RMA:
+    """Wilder's moving average as pandas_ta 0.3 computes it: ewm(alpha=1/length, adjust=True)."""
+
+    def __init__(self, length: int):
+        self.length = length
+        self._decay = 1.0 - 1.0 / length
+        self._numerator = 0.0
+        self._denominator = 0.0
+        self._count = 0
+
+    def update(self, value: float) -> float:
+        if math.isnan(value):
+            # Only the leading value can be missing, and it carries no weight
+            return math.nan
+        self._numerator = value + self._decay * self._numerator
+        self._denominator = 1.0 + self._decay * self._denominator
+        self._count += 1
+        return self._numerator / self._denominator if self._count >= self.length else math.nan
+
+class EMA:
+    """Exponential moving average seeded with the SMA of the first `length` values (pandas_ta default)."""
+
+    def __init__(self, length: int):
+        self.length = length
+        self._alpha = 2.0 / (length + 1)
+        self._seed = []
+        self._value = math.nan
+
+    def update(self, value: float) -> float:
+        if len(self._seed) < self.length:
+            self._seed.append(value)
+            if len(self._seed) == self.length:
+                self._value = sum(self._seed) / self.length
+            return self._value
+        self._value = self._alpha * value + (1.0 - self._alpha) * self._value
+        return self._value
+
+class RSI:
+    """Relative strength index from Wilder-smoothed gains and losses."""
+
+    def __init__(self, length: int = 14):
+        self._gains = RMA(length)
+        self._losses = RMA(length)
+        self._prev_close = math.nan
+
+    def update(self, close: float) -> float:
+        change = close - self._prev_close
+        self._prev_close = close
+        avg_gain = self._gains.update(max(change, 0.0) if not math.isnan(change) else math.nan)
+        avg_loss = self._losses.update(max(-change, 0.0) if not math.isnan(change) else math.nan)
+        total = avg_gain + avg_loss
+        if math.isnan(total) or total == 0:
+            return math.nan
+        return 100.0 * avg_gain / total
+
+class ATR:
+    """Average true range smoothed with RMA."""
+
+    def __init__(self, length: int = 14):
+        self._average = RMA(length)
+        self._prev_close = math.nan
+
+    def update(self, high: float, low: float, close: float) -> float:
+        if math.isnan(self._prev_close):
+            true_range = math.nan
+        else:
+            true_range = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        return self._average.update(true_range)
+
+class MACD:
+    """MACD line: fast EMA minus slow EMA."""
+
+    def __init__(self, fast: int = 12, slow: int = 26):
+        self._fast = EMA(fast)
+        self._slow = EMA(slow)
+
+    def update(self, close: float) -> float:
+        return self._fast.update(close) - self._slow.update(close)
+
+class SessionVWAP:
+    """Volume-weighted average price that resets at the start of each trading day."""
+
+    def __init__(self):
+        self._day = None
+        self._price_volume = 0.0
+        self._volume = 0.0
+
+    def update(self, high: float, low: float, close: float, volume: float, day: int) -> float:
+        if day != self._day:
+            self._day = day
+            self._price_volume = 0.0
+            self._volume = 0.0
+        self._price_volume += (high + low + close) / 3.0 * volume
+        self._volume += volume
+        return self._price_volume / self._volume if self._volume else math.nan
+
+INDICATOR_NAMES = ("SMA_20", "RSI_14", "ATR_14", "MACD", "VWAP")
+
+def day_keys(timestamps: pd.Series) -> np.ndarray:
+    """Calendar day of each timestamp in its own wall-clock time, as days since epoch."""
+    if getattr(timestamps.dt, "tz", None) is not None:
+        timestamps = timestamps.dt.tz_localize(None)
+    return timestamps.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]").astype(np.int64)
+
+def _seeded_ema(close: pd.Series, length: int) -> pd.Series:
+    """Vectorized counterpart of EMA: SMA seed at length-1, then the adjust=False recursion."""
+    if len(close) < length:
+        return pd.Series(np.nan, index=close.index)
+    seeded = close.copy()
+    seeded.iloc[length - 1] = close.iloc[:length].mean()
+    seeded.iloc[:length - 1] = np.nan
+    return seeded.ewm(span=length, adjust=False).mean()
+
+def add_indicator_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Materialize SMA_20, RSI_14, ATR_14, MACD and VWAP as columns next to the OHLCV
+    data. Historical bars never change, so this runs once when a series is loaded
+    and every later lookup is an array index.
+    """
+    close, high, low = df["close"].astype(np.float64), df["high"], df["low"]
+
+    def rma(series: pd.Series, length: int) -> pd.Series:
+        return series.ewm(alpha=1.0 / length, min_periods=length).mean()
+
+    change = close.diff()
+    avg_gain = rma(change.clip(lower=0), 14)
+    avg_loss = rma((-change).clip(lower=0), 14)
+    rsi = 100.0 * avg_gain / (avg_gain + avg_loss)
+
+    prev_close = close.shift(1)
+    true_range = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()],
+                           axis=1).max(axis=1, skipna=False)
+
+    typical = (high + low + close) / 3.0
+    days = day_keys(df["timestamp"])
+    volume = df["volume"].astype(np.float64)
+    vwap = (typical * volume).groupby(days).cumsum() / volume.groupby(days).cumsum()
+
+    df["SMA_20"] = close.rolling(20).mean()
+    df["RSI_14"] = rsi
+    df["ATR_14"] = rma(true_range, 14)
+    df["MACD"] = _seeded_ema(close, 12) - _seeded_ema(close, 26)
+    df["VWAP"] = vwap.replace([np.inf, -np.inf], np.nan)
+    return df
+
+class IndicatorStream:
+    """
+    Indicator state for one (symbol, interval) series.
+
+    Ticks are fed forward once each; every computed value is kept, so any tick at
+    or before the stream's position is answered by an array lookup and moving
+    forward costs O(new ticks). Stored series are served from their precomputed
+    columns instead; this is the incremental form those columns are checked against.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._high = df["high"].to_numpy(dtype=np.float64)
+        self._low = df["low"].to_numpy(dtype=np.float64)
+        self._close = df["close"].to_numpy(dtype=np.float64)
+        self._volume = df["volume"].to_numpy(dtype=np.float64)
+        self._days = day_keys(df["timestamp"])
+        self.total_ticks = len(df)
+
+        self._sma = SMA(20)
+        self._rsi = RSI(14)
+        self._atr = ATR(14)
+        self._macd = MACD(12, 26)
+        self._vwap = SessionVWAP()
+
+        self._values = np.full((self.total_ticks, len(INDICATOR_NAMES)), np.nan)
+        self.next_tick = 0
+
+    def advance_to(self, tick: int) -> None:
+        """Feed every tick up to and including `tick` through the updaters."""
+        tick = min(tick, self.total_ticks - 1)
+        for t in range(self.next_tick, tick + 1):
+            high, low, close = self._high[t], self._low[t], self._close[t]
+            self._values[t] = (
+                self._sma.update(close),
+                self._rsi.update(close),
+                self._atr.update(high, low, close),
+                self._macd.update(close),
+                self._vwap.update(high, low, close, self._volume[t], self._days[t]),
+            )
+        self.next_tick = max(self.next_tick, tick + 1)
+
+    def get(self, tick: int) -> Optional[Dict]:
+        """Indicator values at a tick, with missing values as None."""
+        if tick < 0 or tick >= self.total_ticks:
+            return None
+        if tick >= self.next_tick:
+            self.advance_to(tick)
+        return {
+            name: (None if math.isnan(value) else float(value))
+            for name, value in zip(INDICATOR_NAMES, self._values[tick])
+        }
+
+class IndicatorEngine:
+    """
+    Serves indicator values straight from the columns add_indicator_columns
+    materializes on each cached series, so a lookup is an array index and the
+    engine keeps no per-series state of its own.
+    """
+
+    def get_indicators(self, symbol: str, tick: int, interval: str = '30s') -> Optional[Dict]:
+        """Get SMA_20, RSI_14, ATR_14, MACD and VWAP for a symbol at a tick."""
+        from .tick_indexer import tick_indexer
+        df = tick_indexer.get_dataframe(symbol, interval)
+        if df is None or tick < 0 or tick >= len(df):
+            return None
+        values = (df[name].iat[tick] for name in INDICATOR_NAMES)
+        return {
+            name: (None if math.isnan(value) else float(value))
+            for name, value in zip(INDICATOR_NAMES, values)
+        }
+
+# Global indicator engine instance
+indicator_engine = IndicatorEngine()
@@ -0,0 +1,137 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Optional, TextIO
+
+"""
+Logging for the backend. Everything logs under the "sim" logger tree
+(sim.stream, sim.trade, sim.engine, ...). Records go through a QueueHandler, so
+a request thread only enqueues; a listener thread formats and writes them.
+
+Configured from the environment:
+    LOG_LEVEL         level for the "sim" tree (default INFO)
+    LOG_LEVELS        per-logger overrides, e.g. "sim.stream=DEBUG,sim.engine=WARNING"
+    LOG_FORMAT        "text" (default) or "json", one object per line
+    LOG_SAMPLE_EVERY  how often sampled per-tick messages are emitted (default 100)
+
+Per-tick detail (whole session dicts, every frame) is logged at DEBUG, which
+costs one level check at INFO. LOG_LEVELS=sim.stream=DEBUG turns it back on for
+just that logger.
+"""
+
+ROOT_LOGGER = "sim"
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with `extra=` fields at the top level."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class Sampler:
+    """
+    Lets one in every `every` calls per key through, starting with the first.
+    Counts are kept for the `max_keys` most recently sampled keys; a key that
+    falls out starts over, so its next call is let through.
+    """
+
+    def __init__(self, every: int, max_keys: int = 10000):
+        self.every = max(1, every)
+        self.max_keys = max(1, max_keys)
+        self._counts: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, key: str) -> bool:
+        with self._lock:
+            count = self._counts.pop(key, 0)
+            self._counts[key] = count + 1
+            if len(self._counts) > self.max_keys:
+                self._counts.popitem(last=False)
+        return count % self.every == 0
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_configure_lock = threading.Lock()
+sampler = Sampler(int(os.getenv("LOG_SAMPLE_EVERY", "100")))
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """'a=DEBUG,b.c=warning' -> {'a': 10, 'b.c': 30}; malformed entries are skipped."""
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        level = logging.getLevelName(level.strip().upper())
+        if name.strip() and isinstance(level, int):
+            levels[name.strip()] = level
+    return levels
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None,
+                      stream: Optional[TextIO] = None, force: bool = False) -> logging.handlers.QueueListener:
+    """Install the queued handler on the "sim" logger. Safe to call more than once."""
+    global _listener
+    with _configure_lock:
+        if _listener is not None and not force:
+            return _listener
+        if _listener is not None:
+            _listener.stop()
+
+        handler = logging.StreamHandler(stream or sys.stderr)
+        if (fmt or os.getenv("LOG_FORMAT", "text")).lower() == "json":
+            handler.setFormatter(JsonFormatter())
+        else:
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger(ROOT_LOGGER)
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        root.setLevel(logging.getLevelName((level or os.getenv("LOG_LEVEL", "INFO")).upper()))
+        root.propagate = False
+
+        for name, logger_level in parse_levels(os.getenv("LOG_LEVELS", "")).items():
+            logging.getLogger(name).setLevel(logger_level)
+
+        _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        return _listener
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the "sim" tree, configuring logging on first use."""
+    if _listener is None:
+        configure_logging()
+    return logging.getLogger(name if name.startswith(ROOT_LOGGER + ".") else f"{ROOT_LOGGER}.{name}")
+
+def log_sampled(logger: logging.Logger, level: int, key: str, msg: str, *args, **kwargs) -> None:
+    """Log a per-tick message only once in every LOG_SAMPLE_EVERY calls for `key`."""
+    if logger.isEnabledFor(level) and sampler(key):
+        logger.log(level, msg, *args, **kwargs)
+
+def flush_logging() -> None:
+    """Write out everything queued so far; the listener restarts afterwards."""
+    if _listener is not None:
+        _listener.stop()
+        _listener.start()
+
+@atexit.register
+def _stop_listener() -> None:
+    if _listener is not None:
+        _listener.stop()
@@ -0,0 +1,308 @@
+import functools
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+"""
+In-process metrics rendered in the Prometheus text format at GET /metrics.
+
+Collectors are plain counters, gauges and fixed-bucket histograms guarded by a
+per-series lock, so recording a value costs a lock and an addition. Hot paths
+bind their label values once at import time:
+
+    _quote_calls = TICK_INDEXER_CALLS.labels("get_quote")
+    _quote_calls.inc()
+
+Histograms also work as a context manager or decorator through `.time()`.
+"""
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; finer at the low end than Prometheus' defaults since most calls here are sub-millisecond
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class _Timer:
+    """Context manager and decorator that observes elapsed seconds into a histogram series."""
+
+    def __init__(self, series: "_HistogramSeries"):
+        self._series = series
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._series.observe(time.perf_counter() - self._start)
+
+    def __call__(self, fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._series.observe(time.perf_counter() - start)
+        return wrapper
+
+class _CounterSeries:
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def get(self) -> float:
+        return self._value
+
+class _GaugeSeries(_CounterSeries):
+    def __init__(self):
+        super().__init__()
+        self._function: Optional[Callable[[], float]] = None
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = float(value)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        """Read the value from `fn` at scrape time instead of tracking it."""
+        self._function = fn
+
+    def get(self) -> float:
+        if self._function is not None:
+            return float(self._function())
+        return self._value
+
+class _HistogramSeries:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return list(self._counts), self._sum
+
+class _Metric(ABC):
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _new_series(self):
+        ...
+
+    def labels(self, *values) -> object:
+        """The series for these label values, created on first use."""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        key = tuple(str(value) for value in values)
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(key, self._new_series())
+        return series
+
+    def _unlabeled(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels {self.labelnames}; call .labels() first")
+        return self.labels()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        ...
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+class Counter(_Metric):
+    type = "counter"
+
+    def _new_series(self):
+        return _CounterSeries()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._unlabeled().inc(amount)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_label_text(self.labelnames, key)} {_format_value(series.get())}"
+                for key, series in sorted(self._series.items())]
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def _new_series(self):
+        return _GaugeSeries()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._unlabeled().dec(amount)
+
+    def set(self, value: float) -> None:
+        self._unlabeled().set(value)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        self._unlabeled().set_function(fn)
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if bound != math.inf))
+
+    def _new_series(self):
+        return _HistogramSeries(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._unlabeled().observe(value)
+
+    def time(self) -> _Timer:
+        return self._unlabeled().time()
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, series in sorted(self._series.items()):
+            counts, total = series.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_label_text(self.labelnames, key, le)} {cumulative}")
+            labels = _label_text(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+class Registry:
+    """Named metrics; asking for an existing name returns the same collector."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+                if not metric.labelnames:
+                    # Unlabeled metrics report zero before their first use
+                    metric.labels()
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered as a different {metric.type}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+# Global registry; /metrics renders it
+registry = Registry()
+
+# Market data storage and parsing
+STORAGE_REQUEST_SECONDS = registry.histogram(
+    "sim_storage_request_seconds", "Market data storage calls by backend and operation.", ("backend", "operation"))
+STORAGE_READ_BYTES = registry.counter(
+    "sim_storage_read_bytes_total", "Bytes read from market data storage.", ("backend",))
+STORAGE_ERRORS = registry.counter(
+    "sim_storage_errors_total", "Failed market data storage calls.", ("backend", "operation"))
+CSV_PARSE_SECONDS = registry.histogram(
+    "sim_csv_parse_seconds", "Time to parse a market data CSV into a DataFrame.", ("interval",))
+
+# OHLCV DataFrame cache
+OHLCV_CACHE_REQUESTS = registry.counter(
+    "sim_ohlcv_cache_requests_total", "OHLCV cache lookups by result.", ("result",))
+OHLCV_CACHE_EVICTIONS = registry.counter(
+    "sim_ohlcv_cache_evictions_total", "OHLCV cache entries removed, by reason.", ("reason",))
+OHLCV_CACHE_ENTRIES = registry.gauge("sim_ohlcv_cache_entries", "DataFrames held by the OHLCV cache.")
+OHLCV_CACHE_BYTES = registry.gauge("sim_ohlcv_cache_bytes", "Memory held by DataFrames in the OHLCV cache.")
+
+TICK_INDEXER_CALLS = registry.counter(
+    "sim_tick_indexer_calls_total", "Calls into the tick indexer by method.", ("method",))
+
+FIRESTORE_OPERATIONS = registry.counter(
+    "sim_firestore_operations_total", "Firestore reads and writes by collection.", ("collection", "kind"))
+FIRESTORE_OPERATION_SECONDS = registry.histogram(
+    "sim_firestore_operation_seconds", "Firestore call latency by operation.", ("operation",))
+
+# /sim/stream websockets
+WS_CONNECTIONS = registry.gauge("sim_ws_connections", "Open /sim/stream websocket connections.")
+WS_FRAMES = registry.counter("sim_ws_frames_total", "Frames sent on /sim/stream, by outcome.", ("outcome",))
+WS_FRAME_SECONDS = registry.histogram(
+    "sim_ws_frame_seconds", "Time to build and send one /sim/stream frame.")
+
+TRADE_SECONDS = registry.histogram("sim_trade_seconds", "Latency of POST /sim/trade.")
+
+PRICE_UPDATE_CYCLE_SECONDS = registry.histogram(
+    "sim_price_update_cycle_seconds", "Time for one pass of the background price update loop over active sessions.")
+PRICE_UPDATE_SESSIONS = registry.gauge(
+    "sim_price_update_sessions", "Sessions handled by the background price update loop.")
+
+# Event loop health
+EVENT_LOOP_LAG_SECONDS = registry.histogram(
+    "sim_event_loop_lag_seconds", "How late the event loop ran its heartbeat callback.")
+EVENT_LOOP_STALLS = registry.counter(
+    "sim_event_loop_stalls_total", "Event loop stalls longer than LOOP_STALL_MS.")
+BLOCKING_CALLS_IN_FLIGHT = registry.gauge(
+    "sim_blocking_calls_in_flight", "Blocking calls submitted from async handlers and not yet finished.")
@@ -1,8 +1,14 @@
 import pandas as pd
-from typing import Dict, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 import threading
 import time
 from datetime import datetime, timedelta
+from .metrics import OHLCV_CACHE_BYTES, OHLCV_CACHE_ENTRIES, OHLCV_CACHE_EVICTIONS, OHLCV_CACHE_REQUESTS
+
+_hits = OHLCV_CACHE_REQUESTS.labels("hit")
+_misses = OHLCV_CACHE_REQUESTS.labels("miss")
+_capacity_evictions = OHLCV_CACHE_EVICTIONS.labels("capacity")
+_expired_evictions = OHLCV_CACHE_EVICTIONS.labels("expired")
 
 class OHLCVCache:
     """
@@ -11,9 +17,11 @@ class OHLCVCache:
     
     def __init__(self, max_size: int = 50, ttl_seconds: int = 300):
         self._cache: Dict[str, Tuple[pd.DataFrame, float]] = {}
+        self._sizes: Dict[str, int] = {}  # Shallow memory_usage of each cached DataFrame
         self._lock = threading.RLock()
         self._max_size = max_size
         self._ttl_seconds = ttl_seconds
+        self._evict_callbacks: List[Callable[[str], None]] = []
     
     def _get_cache_key(self, symbol: str, interval: str) -> str:
         """Generate cache key for symbol and interval."""
@@ -30,10 +38,13 @@ class OHLCVCache:
             if key in self._cache:
                 df, timestamp = self._cache[key]
                 if not self._is_expired(timestamp):
+                    _hits.inc()
                     return df
                 else:
                     # Remove expired item
-                    del self._cache[key]
+                    self._remove(key)
+                    _expired_evictions.inc()
+            _misses.inc()
             return None
     
     def set(self, symbol: str, df: pd.DataFrame, interval: str = '30s') -> None:
@@ -45,21 +56,34 @@ class OHLCVCache:
             if len(self._cache) >= self._max_size and key not in self._cache:
                 oldest_key = min(self._cache.keys(), 
                                key=lambda k: self._cache[k][1])
-                del self._cache[oldest_key]
+                self._remove(oldest_key)
+                _capacity_evictions.inc()
             
             self._cache[key] = (df, time.time())
+            self._sizes[key] = int(df.memory_usage(index=True).sum())
+    
+    def on_evict(self, callback: Callable[[str], None]) -> None:
+        """Call `callback(key)` whenever a DataFrame leaves the cache, so derived data can go with it."""
+        self._evict_callbacks.append(callback)
+    
+    def _remove(self, key: str) -> None:
+        del self._cache[key]
+        self._sizes.pop(key, None)
+        for callback in self._evict_callbacks:
+            callback(key)
     
     def invalidate(self, symbol: str, interval: str = '30s') -> None:
         """Remove specific item from cache."""
         with self._lock:
             key = self._get_cache_key(symbol, interval)
             if key in self._cache:
-                del self._cache[key]
+                self._remove(key)
     
     def clear(self) -> None:
         """Clear all cached data."""
         with self._lock:
-            self._cache.clear()
+            for key in list(self._cache):
+                self._remove(key)
     
     def cleanup_expired(self) -> None:
         """Remove all expired items from cache."""
@@ -69,7 +93,13 @@ class OHLCVCache:
                 if self._is_expired(timestamp)
             ]
             for key in expired_keys:
-                del self._cache[key]
+                self._remove(key)
+            _expired_evictions.inc(len(expired_keys))
+    
+    def total_bytes(self) -> int:
+        """Memory held by the cached DataFrames (shallow, excluding Python object contents)."""
+        with self._lock:
+            return sum(self._sizes.values())
     
     def get_stats(self) -> Dict:
         """Get cache statistics."""
@@ -79,8 +109,12 @@ class OHLCVCache:
                 "size": len(self._cache),
                 "max_size": self._max_size,
                 "ttl_seconds": self._ttl_seconds,
+                "bytes": self.total_bytes(),
                 "keys": list(self._cache.keys())
             }
 
 # Global cache instance
-ohlcv_cache = OHLCVCache(max_size=50, ttl_seconds=300)  # 5 minutes TTL 
\ No newline at end of file
+ohlcv_cache = OHLCVCache(max_size=50, ttl_seconds=300)  # 5 minutes TTL
+
+OHLCV_CACHE_ENTRIES.set_function(lambda: len(ohlcv_cache._cache))
+OHLCV_CACHE_BYTES.set_function(ohlcv_cache.total_bytes)
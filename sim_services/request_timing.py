@@ -0,0 +1,169 @@
+import functools
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from fastapi.responses import JSONResponse
+
+from .logging_setup import get_logger, log_sampled
+
+"""
+Per-request latency breakdown. ServerTimingMiddleware gives each HTTP request
+a dict of stage timers in a context variable; code on the request path wraps
+its calls in `stage("firestore")` and friends, and the totals go out as a
+Server-Timing header, which browser devtools show under Network > Timing:
+
+    Server-Timing: firestore;desc="4 calls";dur=12.8, tick_indexer;desc="3 calls";dur=0.4, total;dur=15.2
+
+Outside a request (background threads, websockets, tests) `stage` is a no-op
+apart from one context variable lookup. A stage nested in itself is counted
+once, so get_quote calling get_tick_data is one tick_indexer call, but
+different stages can overlap: tick_indexer includes storage on a cold cache.
+
+Every request slower than SLOW_REQUEST_MS (default 500) logs its breakdown to
+sim.trace at WARNING; faster ones are sampled at INFO (LOG_SAMPLE_EVERY).
+SERVER_TIMING=0 turns the middleware off.
+"""
+
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_MS", "500")) / 1000
+ENABLED = os.getenv("SERVER_TIMING", "1").lower() not in ("0", "false", "no")
+
+trace_logger = get_logger("sim.trace")
+
+class RequestTimings:
+    """Stage totals for one request. Sync handlers run in a worker thread, but one request at a time."""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.active: Dict[str, int] = {}
+
+    def add(self, name: str, seconds: float, calls: int = 1) -> None:
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + calls
+
+    def header(self, total_seconds: float) -> str:
+        entries = [f'{name};desc="{self.calls[name]} calls";dur={self.seconds[name] * 1000:.1f}'
+                   for name in sorted(self.seconds, key=self.seconds.get, reverse=True)]
+        entries.append(f"total;dur={total_seconds * 1000:.1f}")
+        return ", ".join(entries)
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+class stage:
+    """Time a block as `name` on the current request; usable as a context manager or decorator."""
+
+    __slots__ = ("name", "_timings", "_start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        timings = self._timings = _current.get()
+        if timings is not None:
+            depth = timings.active.get(self.name, 0)
+            timings.active[self.name] = depth + 1
+            # Only the outermost block of a stage is timed
+            self._start = time.perf_counter() if depth == 0 else None
+        return self
+
+    def __exit__(self, *exc):
+        timings = self._timings
+        if timings is not None:
+            timings.active[self.name] -= 1
+            if self._start is not None:
+                timings.add(self.name, time.perf_counter() - self._start)
+        return False
+
+    def __call__(self, fn):
+        name = self.name
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return fn(*args, **kwargs)
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse that counts rendering the body as the "serialize" stage."""
+
+    def render(self, content) -> bytes:
+        with stage("serialize"):
+            return super().render(content)
+
+def instrument_engine(engine) -> None:
+    """Count SQLAlchemy statements on `engine` as the "sqlite" stage."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("request_timing_starts", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        timings = _current.get()
+        starts: List[float] = conn.info.get("request_timing_starts")
+        if timings is not None and starts:
+            timings.add("sqlite", time.perf_counter() - starts.pop())
+
+class ServerTimingMiddleware:
+    """ASGI middleware that adds a Server-Timing header and logs a trace of each HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timings.header(time.perf_counter() - start).encode("latin-1")))
+                # Cross-origin pages (the Vite dev server) only see the timings with this
+                origin = dict(scope.get("headers", [])).get(b"origin")
+                if origin:
+                    headers.append((b"timing-allow-origin", origin))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            log_trace(scope, status["code"], time.perf_counter() - start, timings)
+
+def log_trace(scope, status: int, seconds: float, timings: RequestTimings) -> None:
+    level = logging.WARNING if seconds >= SLOW_REQUEST_SECONDS else logging.INFO
+    if not trace_logger.isEnabledFor(level):
+        return
+    extra = {
+        "method": scope.get("method"),
+        "path": scope.get("path"),
+        "status": status,
+        "duration_ms": round(seconds * 1000, 2),
+        "stages_ms": {name: round(value * 1000, 2) for name, value in timings.seconds.items()},
+        "stage_calls": dict(timings.calls),
+    }
+    message = "%s %s %s in %.1fms (%s)"
+    breakdown = ", ".join(f"{name} {ms}ms" for name, ms in extra["stages_ms"].items())
+    args = (extra["method"], extra["path"], status, extra["duration_ms"], breakdown or "no stages")
+    if level == logging.WARNING:
+        trace_logger.warning(message, *args, extra=extra)
+    else:
+        log_sampled(trace_logger, level, "trace", message, *args, extra=extra)
@@ -0,0 +1,85 @@
+import re
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .downsampling import aggregate_runs
+from .indicator_engine import day_keys
+
+"""
+Derives coarser OHLCV bars from the 30s base series, so one download serves
+every interval and coarse ticks always map back onto base ticks.
+"""
+
+BASE_INTERVAL = '30s'
+BASE_SECONDS = 30
+
+_UNIT_SECONDS = {"s": 1, "min": 60, "h": 3600, "d": 86400}
+_INTERVAL_PATTERN = re.compile(r"^(\d+)(s|min|h|d)$")
+
+def interval_seconds(interval: str) -> Optional[int]:
+    """Length of an interval string like '30s', '2min', '1h' in seconds, or None if unparseable."""
+    match = _INTERVAL_PATTERN.match(interval or "")
+    if not match:
+        return None
+    seconds = int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+    return seconds if seconds > 0 else None
+
+def is_derived_interval(interval: str) -> bool:
+    """Whether an interval can be built from the base series (a multiple of 30s)."""
+    seconds = interval_seconds(interval)
+    return seconds is not None and seconds % BASE_SECONDS == 0
+
+def bar_starts(timestamps: pd.Series, seconds: int) -> np.ndarray:
+    """
+    Base tick where each coarse bar begins. Buckets are counted from each trading
+    day's first bar, so hourly bars run 9:30-10:30 rather than 9:00-10:00 and no
+    bar ever spans two sessions.
+    """
+    if getattr(timestamps.dt, "tz", None) is not None:
+        timestamps = timestamps.dt.tz_localize(None)
+    ns = timestamps.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    days = day_keys(timestamps)
+    if len(ns) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    new_day = np.empty(len(ns), dtype=bool)
+    new_day[0] = True
+    new_day[1:] = days[1:] != days[:-1]
+    day_first = np.flatnonzero(new_day)
+    day_open = ns[day_first][np.cumsum(new_day) - 1]
+
+    bucket = (ns - day_open) // (seconds * 10**9)
+    new_bar = new_day.copy()
+    new_bar[1:] |= bucket[1:] != bucket[:-1]
+    return np.flatnonzero(new_bar)
+
+def resample_ohlcv(df: pd.DataFrame, seconds: int) -> pd.DataFrame:
+    """
+    Aggregate a base OHLCV frame into `seconds`-long bars. The result carries a
+    base_tick column holding the first base tick of each bar.
+    """
+    starts = bar_starts(df["timestamp"], seconds)
+    columns = {
+        "tick": np.arange(len(df)),
+        "timestamp": df["timestamp"].array,
+        "open": df["open"].to_numpy(dtype=np.float64),
+        "high": df["high"].to_numpy(dtype=np.float64),
+        "low": df["low"].to_numpy(dtype=np.float64),
+        "close": df["close"].to_numpy(dtype=np.float64),
+        "volume": df["volume"].to_numpy(),
+    }
+    bars = aggregate_runs(columns, starts) if len(starts) else {name: values[:0] for name, values in columns.items()}
+    resampled = pd.DataFrame({
+        "timestamp": bars["timestamp"],
+        "open": bars["open"],
+        "high": bars["high"],
+        "low": bars["low"],
+        "close": bars["close"],
+        "volume": bars["volume"],
+        "base_tick": bars["tick"],
+    })
+    # Derived bars share the base series' data version
+    resampled.attrs.update(df.attrs)
+    return resampled
@@ -0,0 +1,119 @@
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+class CachedResponse:
+    """A serialized response body, with a gzipped copy when compression pays off."""
+
+    __slots__ = ("body", "gzipped")
+
+    def __init__(self, body: bytes, gzipped: Optional[bytes] = None):
+        self.body = body
+        self.gzipped = gzipped
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + (len(self.gzipped) if self.gzipped is not None else 0)
+
+class ResponseCache:
+    """
+    Thread-safe LRU of fully serialized response bodies, bounded by total bytes.
+    Keys should include everything the body depends on, including the data version.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, gzip_level: int = 6, min_gzip_bytes: int = 1024):
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._max_bytes = max_bytes
+        self._gzip_level = gzip_level
+        self._min_gzip_bytes = min_gzip_bytes
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """Get a cached body and mark it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def set(self, key: Hashable, body: bytes, compress: bool = True) -> CachedResponse:
+        """
+        Store a serialized body. With compress, it is gzipped up front so hits never
+        compress; without, gzipped() compresses it the first time a client asks.
+        """
+        gzipped = None
+        if compress and len(body) >= self._min_gzip_bytes:
+            gzipped = gzip.compress(body, compresslevel=self._gzip_level)
+        entry = CachedResponse(body, gzipped)
+        if entry.size > self._max_bytes:
+            # Too large to keep; hand it back uncached
+            return entry
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            self._evict()
+        return entry
+
+    def gzipped(self, key: Hashable, entry: CachedResponse) -> Optional[bytes]:
+        """The entry's gzipped body, compressing and storing it on first use; None if too small to pay off."""
+        if entry.gzipped is not None or len(entry.body) < self._min_gzip_bytes:
+            return entry.gzipped
+        gzipped = gzip.compress(entry.body, compresslevel=self._gzip_level)
+        with self._lock:
+            if entry.gzipped is None:
+                entry.gzipped = gzipped
+                # Only count it if the entry is still cached
+                if self._entries.get(key) is entry:
+                    self._bytes += len(gzipped)
+                    self._evict()
+        return entry.gzipped
+
+    def _evict(self) -> None:
+        while self._bytes > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self._evictions += 1
+
+    def invalidate(self, predicate) -> int:
+        """Drop every entry whose key satisfies predicate; returns how many were dropped."""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._bytes -= self._entries.pop(key).size
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> Dict:
+        """Hit rate and size figures for monitoring."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+            }
+
+# Global response cache instance
+response_cache = ResponseCache()
@@ -1,4 +1,3 @@
-import boto3
 import pandas as pd
 from io import StringIO
 from typing import Dict, List, Optional, Tuple
@@ -6,9 +5,14 @@ import os
 from datetime import datetime, timedelta
 from functools import lru_cache
 from dotenv import load_dotenv
+from .storage_backends import StorageBackend, create_storage_backend
+from .logging_setup import get_logger
+from .metrics import CSV_PARSE_SECONDS
 
 load_dotenv()
 
+logger = get_logger("sim.market_data")
+
 class S3DataAdapter:
     """
     Adapter for S3-based market data with folder structure:
@@ -17,20 +21,17 @@ class S3DataAdapter:
     ├── 1min/
     ├── 5min/
     └── 30min/
+    
+    Files are read through a storage backend (S3, or a local directory with the
+    same layout), selected by MARKET_DATA_BACKEND.
     """
     
-    def __init__(self):
-        self.s3_client = boto3.client(
-            's3',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_REGION', 'us-east-1')
-        )
-        self.bucket_name = os.getenv('S3_BUCKET_NAME')
+    def __init__(self, backend: Optional[StorageBackend] = None):
+        self.backend = backend or create_storage_backend()
+        # Kept for scripts that talk to the bucket directly
+        self.s3_client = getattr(self.backend, 'client', None)
+        self.bucket_name = getattr(self.backend, 'bucket_name', None)
         self.default_interval = '30s'  # Default to 30-second data
-        
-        if not all([self.s3_client, self.bucket_name]):
-            raise ValueError("AWS credentials and bucket name must be set in environment variables")
     
     def _get_s3_key(self, symbol: str, interval: str = None) -> str:
         """Generate S3 key for a symbol and interval."""
@@ -41,7 +42,7 @@ class S3DataAdapter:
         """Load DataFrame for a symbol and interval from S3."""
         try:
             s3_key = self._get_s3_key(symbol, interval)
-            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
+            body, version = self.backend.get_object(s3_key)
             
             # Specify dtypes to avoid warnings and improve performance
             dtype_dict = {
@@ -53,19 +54,23 @@ class S3DataAdapter:
                 'volume': int
             }
             
-            df = pd.read_csv(
-                StringIO(response['Body'].read().decode('utf-8')),
-                dtype=dtype_dict,
-                low_memory=False
-            )
+            with CSV_PARSE_SECONDS.labels(interval or self.default_interval).time():
+                df = pd.read_csv(
+                    StringIO(body.decode('utf-8')),
+                    dtype=dtype_dict,
+                    low_memory=False
+                )
+                
+                # Convert timestamp to datetime
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
             
-            # Convert timestamp to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            # The object's version changes whenever the file is rewritten; HTTP caching keys off it
+            df.attrs["data_version"] = version
             
             return df
             
         except Exception as e:
-            print(f"Error loading DataFrame for {symbol} ({interval}): {e}")
+            logger.error("Error loading DataFrame for %s (%s): %s", symbol, interval, e)
             return None
     
     def get_tick_data(self, symbol: str, tick: int, interval: str = None) -> Optional[Dict]:
@@ -114,44 +119,18 @@ class S3DataAdapter:
     
     def get_ohlc_by_days(self, symbol: str, days: int, interval: str = None) -> List[Dict]:
         """Get OHLCV data for the last N days."""
-        df = self.get_dataframe(symbol, interval)
-        if df is None:
-            return []
-        
-        # Calculate the start date
-        end_date = df['timestamp'].max()
-        start_date = end_date - timedelta(days=days)
-        
-        # Filter data
-        mask = (df['timestamp'] >= start_date) & (df['timestamp'] <= end_date)
-        filtered_df = df[mask]
-        
-        data = []
-        for idx, row in filtered_df.iterrows():
-            data.append({
-                "tick": idx,
-                "timestamp": row["timestamp"].isoformat(),
-                "open": float(row["open"]),
-                "high": float(row["high"]),
-                "low": float(row["low"]),
-                "close": float(row["close"]),
-                "volume": int(row["volume"])
-            })
-        return data
+        # The window is a binary search over the cached timestamp index plus a slice
+        from .tick_indexer import tick_indexer
+        from .chart_encoding import to_rows
+        return to_rows(symbol, tick_indexer.get_day_columns(symbol, days, interval or self.default_interval))
     
     @lru_cache(maxsize=100)
     def get_available_symbols(self, interval: str = None) -> List[str]:
         """Get list of available symbols for an interval."""
         try:
             interval = interval or self.default_interval
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=f"{interval}/"
-            )
-            
             symbols = []
-            for obj in response.get('Contents', []):
-                key = obj['Key']
+            for key in self.backend.list_keys(f"{interval}/"):
                 if key.endswith('.csv'):
                     # Extract symbol from filename like "AAPL-30s.csv"
                     filename = key.split('/')[-1]
@@ -161,97 +140,33 @@ class S3DataAdapter:
             return sorted(symbols)
             
         except Exception as e:
-            print(f"Error getting available symbols for {interval}: {e}")
+            logger.error("Error getting available symbols for %s: %s", interval, e)
             return []
     
     def get_available_intervals(self) -> List[str]:
         """Get list of available time intervals."""
         try:
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Delimiter='/'
-            )
-            
-            intervals = []
-            for prefix in response.get('CommonPrefixes', []):
-                interval = prefix['Prefix'].rstrip('/')
-                intervals.append(interval)
-            
-            return sorted(intervals)
+            return sorted(self.backend.list_prefixes())
             
         except Exception as e:
-            print(f"Error getting available intervals: {e}")
+            logger.error("Error getting available intervals: %s", e)
             return []
 
-    def get_fundamental_indicators(self, symbol: str, date: str) -> Optional[Dict]:
-        """Load fundamental indicators for a symbol on a specific date."""
+    def get_fundamentals_dataframe(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Load the daily fundamental indicators CSV for a symbol from S3."""
         s3_key = f"fundamental-measures/{symbol}_indicators_1d.csv"
-        print(f"S3 Adapter: Attempting to load fundamental data from s3://{self.bucket_name}/{s3_key}")
         try:
-            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
-            
-            df = pd.read_csv(StringIO(response['Body'].read().decode('utf-8')))
-            
-            # Debug: Print the first few rows to see the date format
-            print(f"S3 Adapter: Loaded CSV with {len(df)} rows")
-            print(f"S3 Adapter: CSV columns: {df.columns.tolist()}")
-            print(f"S3 Adapter: First few Date values: {df['Date'].head().tolist()}")
-            
-            # Ensure the 'Date' column is in datetime format
-            df['Date'] = pd.to_datetime(df['Date'])
-            
-            # Debug: Print the date we're looking for
-            date_dt = pd.to_datetime(date)
-            print(f"S3 Adapter: Looking for date: {date} (parsed as: {date_dt})")
-            print(f"S3 Adapter: Date type: {type(date_dt)}")
-            
-            # Make the search date timezone-aware to match CSV dates
-            # The CSV dates appear to be in UTC-4 timezone
-            if date_dt.tzinfo is None:
-                # Assume the date is in UTC-4 timezone (Eastern Time)
-                from datetime import timezone, timedelta
-                et_tz = timezone(timedelta(hours=-4))
-                date_dt = date_dt.replace(tzinfo=et_tz)
-                print(f"S3 Adapter: Made date timezone-aware: {date_dt}")
-            
-            # Debug: Print unique dates in the dataframe
-            unique_dates = df['Date'].unique()
-            print(f"S3 Adapter: Available dates in CSV: {[str(d) for d in unique_dates[:10]]}")
-            
-            # Find the row for the specified date
-            row_series = df[df['Date'] == date_dt]
-
-            if row_series.empty:
-                print(f"S3 Adapter: No exact match found for {symbol} on date {date}")
-                print(f"S3 Adapter: Trying to find closest date...")
-                
-                # Try to find the closest date
-                if len(df) > 0:
-                    # Find the closest date
-                    date_diff = abs(df['Date'] - date_dt)
-                    closest_idx = date_diff.idxmin()
-                    closest_date = df.loc[closest_idx, 'Date']
-                    print(f"S3 Adapter: Closest date found: {closest_date}")
-                    
-                    # If the closest date is within 1 day, use it
-                    if abs((closest_date - date_dt).days) <= 1:
-                        print(f"S3 Adapter: Using closest date {closest_date} for {date}")
-                        row = df.loc[closest_idx]
-                        return row.where(pd.notnull(row), None).to_dict()
-                    else:
-                        print(f"S3 Adapter: Closest date {closest_date} is too far from {date}")
-                
-                return None
-
-            row = row_series.iloc[0]
-            print(f"S3 Adapter: Found exact match for {symbol} on date {date}")
-            
-            # Convert row to a dictionary and handle potential NaN values
-            return row.where(pd.notnull(row), None).to_dict()
+            body, _ = self.backend.get_object(s3_key)
+            return pd.read_csv(StringIO(body.decode('utf-8')))
             
         except Exception as e:
-            print(f"Error loading fundamental indicators for {symbol} on {date}: {e}")
+            logger.error("Error loading fundamental indicators for %s: %s", symbol, e)
             return None
 
+    def get_fundamental_indicators(self, symbol: str, date: str) -> Optional[Dict]:
+        """Load fundamental indicators for a symbol on a specific date (or the nearest within 1 day)."""
+        from .fundamentals_store import fundamentals_store
+        return fundamentals_store.get_indicators(symbol, date)
+
 # Global instance
 s3_adapter = S3DataAdapter() 
\ No newline at end of file
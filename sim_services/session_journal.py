@@ -0,0 +1,247 @@
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from .logging_setup import get_logger
+
+logger = get_logger("sim.journal")
+
+# Next to the package rather than the working directory, so every entry point shares one journal
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "session_journal")
+
+class SessionJournal:
+    """
+    Append-only event log with periodic snapshots for simulation sessions.
+
+    Layout under the journal directory:
+        {session_id}.log            one JSON event per line since the last snapshot
+        {session_id}.snapshot.json  compacted state, with the seq of the last event it covers
+        archive/                    snapshots of sessions that have ended
+
+    Restoring a session loads its snapshot and replays only the events written
+    after it, so boot time is bounded by the snapshot interval rather than by
+    the age of the session. Writing a snapshot truncates the log, and ending a
+    session moves its final snapshot to archive/ and deletes its log, so the
+    directory only grows with the number of live sessions.
+    """
+
+    def __init__(self, directory: Optional[str] = None, snapshot_every: int = 200):
+        self._directory = directory or os.getenv('SESSION_JOURNAL_DIR', DEFAULT_DIRECTORY)
+        self._snapshot_every = snapshot_every
+        self._lock = threading.RLock()
+        self._states: Dict[str, Dict] = {}
+        self._since_snapshot: Dict[str, int] = {}
+
+    def _log_path(self, session_id: str) -> str:
+        return os.path.join(self._directory, f"{session_id}.log")
+
+    def _snapshot_path(self, session_id: str) -> str:
+        return os.path.join(self._directory, f"{session_id}.snapshot.json")
+
+    def _archive_path(self, session_id: str) -> str:
+        return os.path.join(self._directory, "archive", f"{session_id}.snapshot.json")
+
+    @staticmethod
+    def _empty_state(session_id: str) -> Dict:
+        return {
+            "id": session_id,
+            "user_id": None,
+            "label": None,
+            "cash": 0.0,
+            "duration_seconds": None,
+            "start_time": None,
+            "is_active": False,
+            "current_tick": 0,
+            "pnl": 0.0,
+            "positions": {},
+            "seq": 0,
+        }
+
+    @staticmethod
+    def apply_event(state: Dict, event: Dict) -> Dict:
+        """Apply one event to a session state. Replaying the same log always yields the same state."""
+        kind = event["type"]
+
+        if kind == "activated":
+            state.update({
+                "user_id": event.get("user_id"),
+                "label": event.get("label"),
+                "cash": event.get("cash", 0.0),
+                "duration_seconds": event.get("duration_seconds"),
+                "start_time": event.get("start_time"),
+                "is_active": True,
+                "current_tick": 0,
+            })
+        elif kind == "deactivated":
+            state["is_active"] = False
+            state["pnl"] = event.get("pnl", state["pnl"])
+        elif kind == "trade":
+            position = state["positions"].setdefault(event["symbol"], {})
+            position["holdings"] = event["new_holdings"]
+            position["avg_price"] = event["new_avg_price"]
+            state["cash"] = event["new_cash"]
+        elif kind == "exit_conditions":
+            position = state["positions"].setdefault(event["symbol"], {})
+            position["stop_loss_price"] = event.get("stop_loss")
+            position["take_profit_price"] = event.get("take_profit")
+        elif kind == "tick":
+            state["current_tick"] = event["tick"]
+
+        state["seq"] = event["seq"]
+        return state
+
+    def _get_state(self, session_id: str) -> Dict:
+        """Return the in-memory state, restoring it from disk the first time it is touched."""
+        state = self._states.get(session_id)
+        if state is None:
+            state = self.restore(session_id) or self._empty_state(session_id)
+            self._states[session_id] = state
+        return state
+
+    def record(self, session_id: str, event_type: str, **data) -> None:
+        """Append an event to the session log. Journal errors never fail the caller."""
+        try:
+            with self._lock:
+                state = self._get_state(session_id)
+                event = {
+                    "seq": state["seq"] + 1,
+                    "type": event_type,
+                    "at": datetime.now(timezone.utc).isoformat(),
+                    **data
+                }
+
+                os.makedirs(self._directory, exist_ok=True)
+                with open(self._log_path(session_id), "a", encoding="utf-8") as log:
+                    log.write(json.dumps(event, default=str) + "\n")
+
+                self.apply_event(state, event)
+
+                if event_type == "deactivated":
+                    self.archive(session_id)
+                    return
+
+                count = self._since_snapshot.get(session_id, 0) + 1
+                self._since_snapshot[session_id] = count
+                if count >= self._snapshot_every:
+                    self.snapshot(session_id)
+
+        except Exception as e:
+            logger.warning("Could not journal %s for session %s: %s", event_type, session_id, e)
+
+    def record_tick(self, session_id: str, tick: int) -> None:
+        """Journal a tick advance for an active session, skipping ticks it is already at."""
+        with self._lock:
+            state = self._states.get(session_id) or self.restore(session_id)
+            # Ended sessions are archived; a late tick must not start a new log for them
+            if state is None or not state["is_active"] or state["current_tick"] == tick:
+                return
+            self._states[session_id] = state
+        self.record(session_id, "tick", tick=tick)
+
+    def _write_snapshot(self, path: str, state: Dict) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            # The log is truncated right after; a crash in between only leaves
+            # events whose seq the snapshot already covers, and restore skips them
+            json.dump({"state": state}, f, default=str)
+        os.replace(tmp_path, path)
+
+    def snapshot(self, session_id: str) -> None:
+        """Write the current state atomically, then truncate the log it replaces."""
+        with self._lock:
+            state = self._get_state(session_id)
+            self._write_snapshot(self._snapshot_path(session_id), state)
+            log_path = self._log_path(session_id)
+            if os.path.exists(log_path):
+                os.truncate(log_path, 0)
+            self._since_snapshot[session_id] = 0
+
+    def archive(self, session_id: str) -> None:
+        """Move an ended session's final state to archive/ and drop its live files and memory."""
+        with self._lock:
+            state = self._states.pop(session_id, None) or self.restore(session_id)
+            self._since_snapshot.pop(session_id, None)
+            if state is not None:
+                self._write_snapshot(self._archive_path(session_id), state)
+            for path in (self._snapshot_path(session_id), self._log_path(session_id)):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def restore(self, session_id: str) -> Optional[Dict]:
+        """Rebuild a session from its latest snapshot plus the log tail written after it."""
+        snapshot_path = self._snapshot_path(session_id)
+        log_path = self._log_path(session_id)
+        if not os.path.exists(snapshot_path) and not os.path.exists(log_path):
+            return None
+
+        state = self._empty_state(session_id)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                state = json.load(f)["state"]
+
+        replayed = 0
+        if os.path.exists(log_path):
+            with open(log_path, "rb+") as log:
+                position = 0
+                for line in log:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("incomplete line")
+                        event = json.loads(line)
+                    except ValueError:
+                        # A torn final line from a crash mid-write; drop it so new events append cleanly
+                        log.truncate(position)
+                        break
+                    position += len(line)
+                    if event["seq"] > state["seq"]:
+                        self.apply_event(state, event)
+                        replayed += 1
+
+        self._since_snapshot[session_id] = replayed
+        return state
+
+    def restore_all(self) -> Dict[str, Dict]:
+        """
+        Restore every session that was active when last journaled, keyed by
+        session id. Journals of sessions that had already ended are archived.
+        """
+        if not os.path.isdir(self._directory):
+            return {}
+
+        session_ids = set()
+        for filename in os.listdir(self._directory):
+            if filename.endswith(".snapshot.json"):
+                session_ids.add(filename[:-len(".snapshot.json")])
+            elif filename.endswith(".log"):
+                session_ids.add(filename[:-len(".log")])
+
+        restored = {}
+        with self._lock:
+            for session_id in sorted(session_ids):
+                state = self.restore(session_id)
+                if state is None:
+                    continue
+                if state.get("is_active"):
+                    restored[session_id] = self._states[session_id] = state
+                else:
+                    self._states[session_id] = state
+                    self.archive(session_id)
+            return restored
+
+    def get_active_sessions(self) -> List[Dict]:
+        """Return restored states for sessions that were active when last journaled."""
+        with self._lock:
+            return [state for state in self._states.values() if state.get("is_active")]
+
+    def get_state(self, session_id: str) -> Optional[Dict]:
+        """Get the current journaled state for a session."""
+        with self._lock:
+            state = self._states.get(session_id) or self.restore(session_id)
+            if state is not None:
+                self._states[session_id] = state
+            return state
+
+# Global journal instance
+session_journal = SessionJournal()
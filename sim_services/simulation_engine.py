@@ -9,16 +9,24 @@ from .tick_indexer import tick_indexer
 from datetime import datetime, timezone
 from unified_app.firebase_setup.firebaseSet import db
 from .s3_data_adapter import s3_adapter
+from .session_journal import session_journal
 from db import get_session
+from .logging_setup import get_logger
+from .metrics import PRICE_UPDATE_CYCLE_SECONDS, PRICE_UPDATE_SESSIONS
 import threading
 import time
 
+logger = get_logger("sim.engine")
+
 class SimulationEngine:
     def __init__(self):
         self.active_sessions = {}
         self.session_threads = {}
         self.stop_event = threading.Event()
         
+        # Pick up sessions that were active before this worker restarted
+        self.restore_sessions()
+        
         # Start background thread for price updates
         self.price_update_thread = threading.Thread(target=self._price_update_loop, daemon=True)
         self.price_update_thread.start()
@@ -56,7 +64,7 @@ class SimulationEngine:
             return tick
             
         except Exception as e:
-            print(f"Error getting current tick: {e}")
+            logger.error("Error getting current tick: %s", e)
             return 0
         finally:
             db.close()
@@ -77,14 +85,14 @@ class SimulationEngine:
             session_doc = session_ref.get()
             
             if not session_doc.exists:
-                print(f"Session {session_id} not found in Firestore")
+                logger.info("Session %s not found in Firestore", session_id)
                 return False
             
             session_data = session_doc.to_dict()
             
             # Check if session is already active
             if session_data.get("is_active", False):
-                print(f"Session {session_id} is already active")
+                logger.info("Session %s is already active", session_id)
                 return True
             
             # Update session to active status
@@ -133,17 +141,17 @@ class SimulationEngine:
                             sqlite_db.add(entry)
                         
                         sqlite_db.commit()
-                        print(f"   - Created SQLite session {session_id} for trading engine")
+                        logger.debug("Created SQLite session %s for trading engine", session_id)
                     else:
                         # Update existing SQLite session to active
                         existing_session.is_active = True
                         existing_session.start_time = current_time
                         existing_session.current_tick = 0
                         sqlite_db.commit()
-                        print(f"   - Reactivated existing SQLite session {session_id}")
+                        logger.debug("Reactivated existing SQLite session %s", session_id)
                         
             except Exception as e:
-                print(f"Warning: Could not create SQLite session: {e}")
+                logger.warning("Could not create SQLite session: %s", e)
                 # Continue with Firestore activation even if SQLite fails
             
             # Initialize portfolio entries if they don't exist
@@ -159,18 +167,54 @@ class SimulationEngine:
                 "label": session_data.get("label", "Trading Session")
             }
             
-            print(f"✅ Successfully activated session {session_id}")
-            print(f"   - User: {session_data.get('user_id')}")
-            print(f"   - Label: {session_data.get('label')}")
-            print(f"   - Cash: ${session_data.get('cash', 100000.0):,.2f}")
-            print(f"   - Duration: {session_data.get('duration_seconds', 3600)} seconds")
+            session_journal.record(
+                session_id, "activated",
+                user_id=session_data.get("user_id"),
+                label=session_data.get("label", "Trading Session"),
+                cash=session_data.get("cash", 100000.0),
+                duration_seconds=session_data.get("duration_seconds", 3600),
+                start_time=current_time.isoformat()
+            )
+            
+            logger.info("Activated session %s for user %s (label %s, cash %.2f, duration %ss)",
+                        session_id, session_data.get('user_id'), session_data.get('label'),
+                        session_data.get('cash', 100000.0), session_data.get('duration_seconds', 3600))
             
             return True
             
         except Exception as e:
-            print(f"❌ Error activating session {session_id}: {e}")
+            logger.error("Error activating session %s: %s", session_id, e)
             return False
     
+    def restore_sessions(self) -> int:
+        """
+        Rebuild active_sessions from the session journal after a worker restart.
+        Each session loads its latest snapshot and replays only the log tail.
+        """
+        try:
+            session_journal.restore_all()
+            restored = 0
+            for state in session_journal.get_active_sessions():
+                start_time = state.get("start_time")
+                self.active_sessions[state["id"]] = {
+                    "id": state["id"],
+                    "user_id": state.get("user_id"),
+                    "start_time": datetime.fromisoformat(start_time) if start_time else None,
+                    "duration_seconds": state.get("duration_seconds") or 3600,
+                    "cash": state.get("cash", 100000.0),
+                    "label": state.get("label") or "Trading Session",
+                    "current_tick": state.get("current_tick", 0)
+                }
+                restored += 1
+            
+            if restored:
+                logger.info("Restored %s active session(s) from the session journal", restored)
+            return restored
+            
+        except Exception as e:
+            logger.error("Error restoring sessions from journal: %s", e)
+            return 0
+    
     def _initialize_portfolio_entries(self, session_id: str) -> None:
         """
         Initialize portfolio entries for a session if they don't exist.
@@ -180,7 +224,7 @@ class SimulationEngine:
             # Get available symbols
             symbols = s3_adapter.get_available_symbols()
             if not symbols:
-                print(f"No symbols available for session {session_id}")
+                logger.info("No symbols available for session %s", session_id)
                 return
             
             # Check if portfolio entries already exist
@@ -202,10 +246,10 @@ class SimulationEngine:
                         "take_profit_price": None,
                         "created_at": datetime.now(timezone.utc).isoformat()
                     })
-                    print(f"   - Created portfolio entry for {symbol}")
+                    logger.debug("Created portfolio entry for %s", symbol)
             
         except Exception as e:
-            print(f"Error initializing portfolio entries for session {session_id}: {e}")
+            logger.error("Error initializing portfolio entries for session %s: %s", session_id, e)
     
     def deactivate_firestore_session(self, session_id: str) -> bool:
         """
@@ -218,14 +262,14 @@ class SimulationEngine:
             session_doc = session_ref.get()
             
             if not session_doc.exists:
-                print(f"Session {session_id} not found in Firestore")
+                logger.info("Session %s not found in Firestore", session_id)
                 return False
             
             session_data = session_doc.to_dict()
             
             # Check if session is already inactive
             if not session_data.get("is_active", False):
-                print(f"Session {session_id} is already inactive")
+                logger.info("Session %s is already inactive", session_id)
                 return True
             
             # Calculate final P&L from portfolio entries
@@ -262,21 +306,22 @@ class SimulationEngine:
                         sqlite_session.is_active = False
                         sqlite_session.pnl = total_pnl
                         sqlite_db.commit()
-                        print(f"   - Deactivated SQLite session {session_id}")
+                        logger.debug("Deactivated SQLite session %s", session_id)
             except Exception as e:
-                print(f"Warning: Could not deactivate SQLite session: {e}")
+                logger.warning("Could not deactivate SQLite session: %s", e)
             
             # Remove from active sessions tracking
             if session_id in self.active_sessions:
                 del self.active_sessions[session_id]
             
-            print(f"✅ Successfully deactivated session {session_id}")
-            print(f"   - Final P&L: ${total_pnl:,.2f}")
+            session_journal.record(session_id, "deactivated", pnl=total_pnl)
+            
+            logger.info("Deactivated session %s with final P&L %.2f", session_id, total_pnl)
             
             return True
             
         except Exception as e:
-            print(f"❌ Error deactivating session {session_id}: {e}")
+            logger.error("Error deactivating session %s: %s", session_id, e)
             return False
     
     def get_firestore_session_status(self, session_id: str) -> Optional[Dict]:
@@ -311,7 +356,7 @@ class SimulationEngine:
                                 current_tick = int((elapsed / duration) * total_ticks)
                                 current_tick = max(0, min(current_tick, total_ticks - 1))
                     except Exception as e:
-                        print(f"Error calculating current tick: {e}")
+                        logger.error("Error calculating current tick: %s", e)
             
             return {
                 "id": session_id,
@@ -327,7 +372,7 @@ class SimulationEngine:
             }
             
         except Exception as e:
-            print(f"Error getting session status {session_id}: {e}")
+            logger.error("Error getting session status %s: %s", session_id, e)
             return None
 
     def start_simulation_session(session_id):
@@ -339,9 +384,9 @@ class SimulationEngine:
                 "start_time": datetime.now(timezone.utc).isoformat(),
                 "current_tick": 0
             })
-            print(f"Session {session_id} started.")
+            logger.info("Session %s started.", session_id)
         else:
-            print(f"Session {session_id} not found.")
+            logger.info("Session %s not found.", session_id)
             
     def get_total_ticks(self, symbol: str, interval: str = '30s') -> int:
         """Get total number of ticks for a symbol."""
@@ -397,7 +442,7 @@ class SimulationEngine:
             return tick_indexer.get_quote(symbol, current_tick)
             
         except Exception as e:
-            print(f"Error getting quote: {e}")
+            logger.error("Error getting quote: %s", e)
             return None
             
     def sync_current_tick_for_session(self, session_id: str) -> None:
@@ -427,13 +472,13 @@ class SimulationEngine:
             session.current_tick = current_tick
             
             # Update prices for the new tick
-            print(f"Updating prices for session {session_id} at tick {session.current_tick}")
+            logger.debug("Updating prices for session %s at tick %s", session_id, session.current_tick)
             update_prices(db, session_id, session.current_tick)
             
             db.commit()
             
         except Exception as e:
-            print(f"Error syncing current tick: {e}")
+            logger.error("Error syncing current tick: %s", e)
             if db:
                 try:
                     db.rollback()
@@ -474,7 +519,7 @@ class SimulationEngine:
             db.commit()
             
         except Exception as e:
-            print(f"Error ending session: {e}")
+            logger.error("Error ending session: %s", e)
             if db:
                 try:
                     db.rollback()
@@ -496,7 +541,7 @@ class SimulationEngine:
                 return tick_data.get("close")
             return None
         except Exception as e:
-            print(f"Error getting price for {symbol} at tick {tick}: {e}")
+            logger.error("Error getting price for %s at tick %s: %s", symbol, tick, e)
             return None
 
     def start_session(self, session_id: str, user_id: str, duration_seconds: int = 3600, label: str = "Trading Session"):
@@ -538,11 +583,11 @@ class SimulationEngine:
                 # Add to active sessions
                 self.active_sessions[session_id] = session
                 
-                print(f"Started simulation session {session_id}")
+                logger.info("Started simulation session %s", session_id)
                 return True
                 
         except Exception as e:
-            print(f"Error starting session {session_id}: {e}")
+            logger.error("Error starting session %s: %s", session_id, e)
             return False
     
     def stop_session(self, session_id: str):
@@ -561,11 +606,11 @@ class SimulationEngine:
                 if session_id in self.active_sessions:
                     del self.active_sessions[session_id]
                 
-                print(f"Stopped simulation session {session_id}")
+                logger.info("Stopped simulation session %s", session_id)
                 return True
                 
         except Exception as e:
-            print(f"Error stopping session {session_id}: {e}")
+            logger.error("Error stopping session %s: %s", session_id, e)
             return False
     
     def get_session_status(self, session_id: str) -> Optional[Dict]:
@@ -594,55 +639,72 @@ class SimulationEngine:
                 }
                 
         except Exception as e:
-            print(f"Error getting session status {session_id}: {e}")
+            logger.error("Error getting session status %s: %s", session_id, e)
             return None
     
+    def _update_active_sessions(self) -> None:
+        """One pass of the price loop: advance every active session to its current tick."""
+        session_ids = list(self.active_sessions.keys())
+        PRICE_UPDATE_SESSIONS.set(len(session_ids))
+        for session_id in session_ids:
+            db = next(get_session())
+            try:
+                session = db.exec(select(SimulationSession).where(
+                    SimulationSession.id == session_id
+                )).first()
+                
+                if not session:
+                    # Restored from the journal but never mirrored to SQLite (the
+                    # Firestore activation carries on without it); nothing to advance here
+                    continue
+                
+                if not session.is_active:
+                    if session_id in self.active_sessions:
+                        del self.active_sessions[session_id]
+                    continue
+                
+                # Calculate current tick based on elapsed time
+                current_tick = self.get_current_tick(session_id)
+                
+                # Update session's current_tick field
+                session.current_tick = current_tick
+                db.commit()
+                session_journal.record_tick(session_id, current_tick)
+                
+                # Update prices for current tick
+                self.sync_current_tick_for_session(session_id)
+                
+                # Check exit conditions
+                symbols = s3_adapter.get_available_symbols()
+                if symbols:
+                    total_ticks = self.get_total_ticks(symbols[0])
+                    if current_tick >= total_ticks - 1:
+                        session.is_active = False
+                        db.commit()
+                        if session_id in self.active_sessions:
+                            del self.active_sessions[session_id]
+                        session_journal.record(session_id, "deactivated", pnl=session.pnl)
+                        logger.info("Session %s completed", session_id)
+                        
+            except Exception as e:
+                logger.error("Error updating session %s: %s", session_id, e)
+                continue
+            finally:
+                db.close()
+    
     def _price_update_loop(self):
         """Background loop for updating prices."""
         while not self.stop_event.is_set():
             try:
-                # Update prices for all active sessions
-                for session_id in list(self.active_sessions.keys()):
-                    try:
-                        with get_session() as db:
-                            session = db.query(SimulationSession).filter(
-                                SimulationSession.id == session_id
-                            ).first()
-                            
-                            if not session or not session.is_active:
-                                if session_id in self.active_sessions:
-                                    del self.active_sessions[session_id]
-                                continue
-                            
-                            # Calculate current tick based on elapsed time
-                            current_tick = self.get_current_tick(session_id)
-                            
-                            # Update session's current_tick field
-                            session.current_tick = current_tick
-                            
-                            # Update prices for current tick
-                            self.sync_current_tick_for_session(session_id)
-                            
-                            # Check exit conditions
-                            symbols = s3_adapter.get_available_symbols()
-                            if symbols:
-                                total_ticks = self.get_total_ticks(symbols[0])
-                                if current_tick >= total_ticks - 1:
-                                    session.is_active = False
-                                    db.commit()
-                                    if session_id in self.active_sessions:
-                                        del self.active_sessions[session_id]
-                                    print(f"Session {session_id} completed")
-                                    
-                    except Exception as e:
-                        print(f"Error updating session {session_id}: {e}")
-                        continue
+                cycle_start = time.perf_counter()
+                self._update_active_sessions()
+                PRICE_UPDATE_CYCLE_SECONDS.observe(time.perf_counter() - cycle_start)
                 
                 # Sleep for a short interval
                 time.sleep(30)
                 
             except Exception as e:
-                print(f"Error in price update loop: {e}")
+                logger.error("Error in price update loop: %s", e)
                 time.sleep(30)
     
     def cleanup(self):
@@ -762,10 +824,10 @@ def update_prices(db: Session, session_id: str, tick: int) -> bool:
                     else:
                         entry.pnl = 0.0
                     
-                    print(f"Updated {entry.symbol}: {old_price} -> {price} (tick {tick})")
+                    logger.debug("Updated %s: %s -> %s (tick %s)", entry.symbol, old_price, price, tick)
                         
             except Exception as e:
-                print(f"Error updating price for {entry.symbol}: {e}")
+                logger.error("Error updating price for %s: %s", entry.symbol, e)
                 continue
         
         # Commit changes
@@ -773,7 +835,7 @@ def update_prices(db: Session, session_id: str, tick: int) -> bool:
         return True
         
     except Exception as e:
-        print(f"Error updating prices for tick {tick}: {e}")
+        logger.error("Error updating prices for tick %s: %s", tick, e)
         return False
 
 
@@ -891,7 +953,7 @@ def execute_trade(db: Session, session: SimulationSession, entry: PortfolioEntry
         db.commit()
         
     except Exception as e:
-        print(f"Error executing trade: {e}")
+        logger.error("Error executing trade: %s", e)
         db.rollback()
         raise
 
@@ -932,7 +994,7 @@ def check_pending_orders(db: Session, session: SimulationSession):
         db.commit()
         
     except Exception as e:
-        print(f"Error checking pending orders: {e}")
+        logger.error("Error checking pending orders: %s", e)
         db.rollback()
 
 
@@ -955,7 +1017,7 @@ def cancel_order(db: Session, session_id: str, order_id: int):
         return order
         
     except Exception as e:
-        print(f"Error cancelling order: {e}")
+        logger.error("Error cancelling order: %s", e)
         db.rollback()
         raise
 
@@ -994,7 +1056,7 @@ def set_exit_conditions(db: Session, session_id: str, symbol: str, stop_loss: Op
         db.commit()
 
     except Exception as e:
-        print(f"Error setting exit conditions: {e}")
+        logger.error("Error setting exit conditions: %s", e)
         db.rollback()
         raise
 
@@ -1027,7 +1089,7 @@ def get_current_tick(db: Session, session: SimulationSession) -> int:
         return tick
         
     except Exception as e:
-        print(f"Error calculating current tick: {e}")
+        logger.error("Error calculating current tick: %s", e)
         return 0
 
 
@@ -1065,7 +1127,7 @@ def sync_current_tick_for_session(db: Session, session: SimulationSession) -> No
         db.commit()
 
     except Exception as e:
-        print(f"Error syncing current tick: {e}")
+        logger.error("Error syncing current tick: %s", e)
         try:
             db.rollback()
 
@@ -1121,7 +1183,7 @@ def check_exit_conditions(db: Session, session: SimulationSession):
                 db.commit()
         
     except Exception as e:
-        print(f"Error checking exit conditions: {e}")
+        logger.error("Error checking exit conditions: %s", e)
         db.rollback()
 
 
@@ -1149,7 +1211,7 @@ def end_session(db: Session, session: SimulationSession) -> None:
         db.commit()
         
     except Exception as e:
-        print(f"Error ending session: {e}")
+        logger.error("Error ending session: %s", e)
         try:
             db.rollback()
         except:
@@ -1167,7 +1229,7 @@ def get_df_len(db: Session) -> int:
         return tick_indexer.get_total_ticks(symbols[0])
         
     except Exception as e:
-        print(f"Error getting total ticks: {e}")
+        logger.error("Error getting total ticks: %s", e)
         return 0
 
 
@@ -1230,10 +1292,45 @@ def get_average_price_for_symbol(db: Session, session_id: str, symbol: str) -> O
         return None
 
     except Exception as e:
-        print(f"Error getting average price: {e}")
+        logger.error("Error getting average price: %s", e)
         return None
 
 
+def get_firestore_session_tick(session_data: Dict) -> Optional[int]:
+    """Current tick of an active Firestore session document, or None if it is inactive."""
+    # Check if session is active
+    if not session_data.get("is_active", False):
+        return None
+    
+    # Calculate current tick based on elapsed time
+    current_time = datetime.now(timezone.utc)
+    start_time_str = session_data.get("start_time")
+    
+    if not start_time_str:
+        return None
+    
+    # Parse start time
+    if isinstance(start_time_str, str):
+        start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
+    else:
+        start_time = start_time_str
+    
+    # Ensure timezone awareness
+    if start_time.tzinfo is None:
+        start_time = start_time.replace(tzinfo=timezone.utc)
+    
+    # Calculate elapsed time and current tick
+    elapsed_seconds = (current_time - start_time).total_seconds()
+    duration_seconds = session_data.get("duration_seconds", 3600)
+    
+    # Calculate current tick based on elapsed time
+    # 1 day = 780 ticks (6.5 hours * 2 trades/min)
+    ticks_per_day = 780
+    total_ticks = (duration_seconds / 86400) * ticks_per_day
+    current_tick = min(int((elapsed_seconds / duration_seconds) * total_ticks), int(total_ticks) - 1)
+    return max(0, current_tick)
+
+
 def get_quote_for_symbol(db: Session, session_id: str, symbol: str) -> Optional[Dict]:
     """Get current quote for a symbol in a session using Firebase."""
     try:
@@ -1247,44 +1344,38 @@ def get_quote_for_symbol(db: Session, session_id: str, symbol: str) -> Optional[
         if not session_doc.exists:
             return None
         
-        session_data = session_doc.to_dict()
-        
-        # Check if session is active
-        if not session_data.get("is_active", False):
+        current_tick = get_firestore_session_tick(session_doc.to_dict())
+        if current_tick is None:
             return None
         
-        # Calculate current tick based on elapsed time
-        current_time = datetime.now(timezone.utc)
-        start_time_str = session_data.get("start_time")
-        
-        if not start_time_str:
-            return None
-        
-        # Parse start time
-        if isinstance(start_time_str, str):
-            start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-        else:
-            start_time = start_time_str
+        return tick_indexer.get_quote(symbol, current_tick)
         
-        # Ensure timezone awareness
-        if start_time.tzinfo is None:
-            start_time = start_time.replace(tzinfo=timezone.utc)
+    except Exception as e:
+        logger.error("Error getting quote: %s", e)
+        return None
+
+
+def get_quotes_for_symbols(db: Session, session_id: str, symbols: List[str]) -> Optional[Dict]:
+    """Get current quotes for several symbols with a single session lookup."""
+    try:
+        from unified_app.firebase_setup.firebaseSet import db as firestore_db
         
-        # Calculate elapsed time and current tick
-        elapsed_seconds = (current_time - start_time).total_seconds()
-        duration_seconds = session_data.get("duration_seconds", 3600)
+        session_doc = firestore_db.collection("simulation_sessions").document(session_id).get()
+        if not session_doc.exists:
+            return None
         
-        # Calculate current tick based on elapsed time
-        # 1 day = 780 ticks (6.5 hours * 2 trades/min)
-        ticks_per_day = 780
-        total_ticks = (duration_seconds / 86400) * ticks_per_day
-        current_tick = min(int((elapsed_seconds / duration_seconds) * total_ticks), int(total_ticks) - 1)
-        current_tick = max(0, current_tick)
+        current_tick = get_firestore_session_tick(session_doc.to_dict())
+        if current_tick is None:
+            return None
         
-        return tick_indexer.get_quote(symbol, current_tick)
+        return {
+            "session_id": session_id,
+            "current_tick": current_tick,
+            "quotes": tick_indexer.get_quotes(symbols, current_tick)
+        }
         
     except Exception as e:
-        print(f"Error getting quote: {e}")
+        logger.error("Error getting quotes: %s", e)
         return None
 
 
@@ -1343,5 +1434,5 @@ def get_ohlc_for_symbol(db: Session, session_id: str, symbol: str):
         return tick_indexer.get_ohlc_for_tick(symbol, current_tick)
     
     except Exception as e:
-        print(f"Error getting OHLC: {e}")
+        logger.error("Error getting OHLC: %s", e)
         return None
\ No newline at end of file
@@ -0,0 +1,179 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+from .metrics import STORAGE_ERRORS, STORAGE_READ_BYTES, STORAGE_REQUEST_SECONDS
+from .request_timing import stage
+
+"""
+Storage backends for market data files. Keys follow the bucket layout:
+
+    {interval}/{symbol}-{interval}.csv
+    fundamental-measures/{symbol}_indicators_1d.csv
+
+Every backend times its calls so storage cost and latency can be modeled.
+"""
+
+class StorageBackend(ABC):
+    """
+    Read-only object storage with per-operation call statistics. Subclasses
+    implement _get_object, _list_keys and _list_prefixes; the public methods
+    wrap them with timing and metrics.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._stats_lock = threading.Lock()
+
+    def _record(self, operation: str, seconds: float, nbytes: int = 0) -> None:
+        with self._stats_lock:
+            entry = self._stats.setdefault(
+                operation, {"calls": 0, "errors": 0, "bytes": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            entry["calls"] += 1
+            entry["bytes"] += nbytes
+            entry["total_seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+
+    def _record_error(self, operation: str) -> None:
+        with self._stats_lock:
+            entry = self._stats.setdefault(
+                operation, {"calls": 0, "errors": 0, "bytes": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            entry["errors"] += 1
+
+    def _timed(self, operation: str, fn, *args):
+        start = time.perf_counter()
+        try:
+            with stage("storage"):
+                result = fn(*args)
+        except Exception:
+            self._record_error(operation)
+            STORAGE_ERRORS.labels(self.name, operation).inc()
+            raise
+        elapsed = time.perf_counter() - start
+        nbytes = len(result[0]) if operation == "get_object" else 0
+        self._record(operation, elapsed, nbytes)
+        STORAGE_REQUEST_SECONDS.labels(self.name, operation).observe(elapsed)
+        if nbytes:
+            STORAGE_READ_BYTES.labels(self.name).inc(nbytes)
+        return result
+
+    def get_object(self, key: str) -> Tuple[bytes, str]:
+        """Read an object; returns its bytes and a version string that changes when it is rewritten."""
+        return self._timed("get_object", self._get_object, key)
+
+    def list_keys(self, prefix: str) -> List[str]:
+        """Keys under a prefix."""
+        return self._timed("list_keys", self._list_keys, prefix)
+
+    def list_prefixes(self) -> List[str]:
+        """Top-level 'folders', without the trailing slash."""
+        return self._timed("list_prefixes", self._list_prefixes)
+
+    def stats(self) -> Dict:
+        """Call counts, bytes and latency per operation."""
+        with self._stats_lock:
+            operations = {}
+            for operation, entry in self._stats.items():
+                calls = entry["calls"]
+                operations[operation] = dict(entry, mean_seconds=entry["total_seconds"] / calls if calls else 0.0)
+            return {"backend": self.name, "operations": operations}
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._stats.clear()
+
+    @abstractmethod
+    def _get_object(self, key: str) -> Tuple[bytes, str]:
+        ...
+
+    @abstractmethod
+    def _list_keys(self, prefix: str) -> List[str]:
+        ...
+
+    @abstractmethod
+    def _list_prefixes(self) -> List[str]:
+        ...
+
+class S3StorageBackend(StorageBackend):
+    """Objects in an S3 bucket."""
+
+    name = "s3"
+
+    def __init__(self, bucket_name: Optional[str] = None, client=None):
+        super().__init__()
+        import boto3
+        self.client = client or boto3.client(
+            's3',
+            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+            region_name=os.getenv('AWS_REGION', 'us-east-1')
+        )
+        self.bucket_name = bucket_name or os.getenv('S3_BUCKET_NAME')
+
+        if not all([self.client, self.bucket_name]):
+            raise ValueError("AWS credentials and bucket name must be set in environment variables")
+
+    def _get_object(self, key: str) -> Tuple[bytes, str]:
+        response = self.client.get_object(Bucket=self.bucket_name, Key=key)
+        return response['Body'].read(), response.get('ETag', '').strip('"')
+
+    def _list_keys(self, prefix: str) -> List[str]:
+        response = self.client.list_objects_v2(Bucket=self.bucket_name, Prefix=prefix)
+        return [obj['Key'] for obj in response.get('Contents', [])]
+
+    def _list_prefixes(self) -> List[str]:
+        response = self.client.list_objects_v2(Bucket=self.bucket_name, Delimiter='/')
+        return [prefix['Prefix'].rstrip('/') for prefix in response.get('CommonPrefixes', [])]
+
+class LocalStorageBackend(StorageBackend):
+    """Objects as files under a local directory laid out like the bucket."""
+
+    name = "local"
+
+    def __init__(self, root: str):
+        super().__init__()
+        self.root = os.path.abspath(root)
+
+    def _path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError(f"Key escapes the data directory: {key}")
+        return path
+
+    def _get_object(self, key: str) -> Tuple[bytes, str]:
+        path = self._path(key)
+        with open(path, "rb") as f:
+            body = f.read()
+        stat = os.stat(path)
+        return body, f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+    def _list_keys(self, prefix: str) -> List[str]:
+        keys = []
+        for directory, _, files in os.walk(self.root):
+            for filename in files:
+                key = os.path.relpath(os.path.join(directory, filename), self.root).replace(os.sep, "/")
+                if key.startswith(prefix):
+                    keys.append(key)
+        return sorted(keys)
+
+    def _list_prefixes(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(entry.name for entry in os.scandir(self.root) if entry.is_dir())
+
+def create_storage_backend() -> StorageBackend:
+    """
+    Backend chosen by MARKET_DATA_BACKEND: 's3' (default) or 'local', which reads
+    from MARKET_DATA_DIR (default ./market_data).
+    """
+    backend = os.getenv('MARKET_DATA_BACKEND', 's3').lower()
+    if backend == 'local':
+        return LocalStorageBackend(os.getenv('MARKET_DATA_DIR', 'market_data'))
+    if backend == 's3':
+        return S3StorageBackend()
+    raise ValueError(f"Unknown MARKET_DATA_BACKEND: {backend}. Expected 's3' or 'local'")
@@ -0,0 +1,167 @@
+import argparse
+import os
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .resampler import BASE_SECONDS, interval_seconds, resample_ohlcv
+
+"""
+Synthetic market data in the layout S3DataAdapter reads:
+
+    {interval}/{symbol}-{interval}.csv
+    fundamental-measures/{symbol}_indicators_1d.csv
+
+Prices follow geometric Brownian motion over 30-second bars (780 per regular
+session), with a U-shaped intraday volume and volatility profile and price
+gaps across nights and weekends. Coarser intervals are aggregated from the
+30s series, so every interval describes the same market. The same seed always
+gives the same files.
+
+run this with python -m sim_services.synthetic_data --out market_data --symbols 5 --days 20
+"""
+
+TICKS_PER_DAY = 780
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=30)
+SESSION_TZ = "America/New_York"
+TRADING_SECONDS_PER_YEAR = 252 * TICKS_PER_DAY * BASE_SECONDS
+DEFAULT_INTERVALS = ("30s", "1min", "5min", "30min")
+
+def session_timestamps(days: int, start: str = "2024-01-02") -> pd.DatetimeIndex:
+    """Bar times for `days` weekday sessions, stamped in UTC."""
+    dates = pd.bdate_range(start, periods=days, tz=SESSION_TZ)
+    offsets = pd.to_timedelta(np.tile(np.arange(TICKS_PER_DAY) * BASE_SECONDS, days), unit="s")
+    # UTC keeps one offset for the whole file; Eastern stamps would switch at DST
+    return (dates.repeat(TICKS_PER_DAY) + SESSION_OPEN + offsets).tz_convert("UTC")
+
+def intraday_profile(ticks_per_day: int = TICKS_PER_DAY, depth: float = 2.5, width: float = 0.08) -> np.ndarray:
+    """U-shaped weight per bar of the session (heavy at the open and close), mean 1."""
+    t = np.linspace(0.0, 1.0, ticks_per_day)
+    profile = 1.0 + depth * (np.exp(-t / width) + np.exp(-(1.0 - t) / width))
+    return profile / profile.mean()
+
+def generate_ohlcv(days: int, seed: int = 0, start: str = "2024-01-02", start_price: float = 100.0,
+                   drift: float = 0.05, volatility: float = 0.3, gap_volatility: float = 0.01,
+                   base_volume: int = 2000) -> pd.DataFrame:
+    """
+    One symbol's 30s OHLCV series. `drift` and `volatility` are annualized;
+    `gap_volatility` is the standard deviation of the log move between one
+    session's close and the next session's open (scaled by the square root of
+    the calendar days in between).
+    """
+    rng = np.random.default_rng(seed)
+    timestamps = session_timestamps(days, start)
+    n = len(timestamps)
+    profile = np.tile(intraday_profile(), days)
+
+    dt = BASE_SECONDS / TRADING_SECONDS_PER_YEAR
+    bar_volatility = volatility * np.sqrt(dt) * np.sqrt(profile)
+    shocks = rng.standard_normal(n)
+    log_returns = (drift - 0.5 * volatility ** 2) * dt + bar_volatility * shocks
+
+    # Overnight and weekend gaps land on each session's first bar
+    gaps = np.zeros(n)
+    if days > 1:
+        session_dates = timestamps[::TICKS_PER_DAY].tz_convert(SESSION_TZ).normalize()
+        calendar_days = np.asarray((session_dates[1:] - session_dates[:-1]).days, dtype=np.float64)
+        gaps[TICKS_PER_DAY::TICKS_PER_DAY] = rng.normal(0.0, gap_volatility * np.sqrt(calendar_days))
+
+    close = start_price * np.exp(np.cumsum(log_returns + gaps))
+    open_ = np.empty(n)
+    open_[0] = start_price
+    open_[1:] = close[:-1] * np.exp(gaps[1:])
+
+    wick = bar_volatility * np.abs(rng.standard_normal((2, n))) * 0.5
+    high = np.maximum(open_, close) * np.exp(wick[0])
+    low = np.minimum(open_, close) * np.exp(-wick[1])
+
+    # Busy bars: more volume at the open/close and on large moves
+    noise = np.exp(rng.normal(0.0, 0.4, n))
+    volume = np.maximum(1, np.rint(base_volume * profile * noise * (1.0 + 0.5 * np.abs(shocks)))).astype(np.int64)
+
+    return pd.DataFrame({
+        "timestamp": timestamps,
+        "open": np.round(open_, 4),
+        "high": np.round(high, 4),
+        "low": np.round(low, 4),
+        "close": np.round(close, 4),
+        "volume": volume,
+    })
+
+def generate_fundamentals(df: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    """Daily fundamental indicators consistent with a generated price series."""
+    rng = np.random.default_rng(seed)
+    daily = df.groupby(df["timestamp"].dt.tz_convert(SESSION_TZ).dt.date, sort=True).agg(
+        high=("high", "max"), low=("low", "min"), close=("close", "last"))
+    n = len(daily)
+
+    close = daily["close"].to_numpy()
+    shares = rng.uniform(0.5e9, 10e9)
+    eps = close[0] / rng.uniform(12, 40) * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    return pd.DataFrame({
+        # Same Eastern-time stamp the production fundamentals files use
+        "Date": [f"{day.isoformat()} 00:00:00-04:00" for day in daily.index],
+        "MarketCap": np.round(close * shares, 0),
+        "PE_Ratio": np.round(close / eps, 2),
+        "ROE": np.round(rng.uniform(5, 35) + np.cumsum(rng.normal(0, 0.05, n)), 2),
+        "Debt_to_Equity": np.round(rng.uniform(0.1, 2.5) + np.cumsum(rng.normal(0, 0.005, n)), 3),
+        "52W_High": np.round(daily["high"].rolling(252, min_periods=1).max().to_numpy(), 4),
+        "52W_Low": np.round(daily["low"].rolling(252, min_periods=1).min().to_numpy(), 4),
+        "Dividend_Yield": np.round(np.full(n, rng.uniform(0, 3.5)), 2),
+        "Beta": np.round(np.full(n, rng.uniform(0.6, 1.8)), 2),
+    })
+
+def symbol_names(count: int) -> List[str]:
+    return [f"SYN{i:03d}" for i in range(count)]
+
+def write_dataset(root: str, symbols: Sequence[str], days: int, intervals: Sequence[str] = DEFAULT_INTERVALS,
+                  seed: int = 0, start: str = "2024-01-02", fundamentals: bool = True) -> List[str]:
+    """Write every symbol at every interval under `root`; returns the paths written."""
+    for interval in intervals:
+        if interval_seconds(interval) is None:
+            raise ValueError(f"Unsupported interval: {interval}")
+
+    written = []
+    for i, symbol in enumerate(symbols):
+        # Each symbol gets its own stream so adding symbols leaves the others unchanged
+        params_seed, series_seed = (int(s) for s in np.random.SeedSequence([seed, i]).generate_state(2))
+        rng = np.random.default_rng(params_seed)
+        base = generate_ohlcv(days, seed=series_seed, start=start,
+                              start_price=float(rng.uniform(20, 400)),
+                              volatility=float(rng.uniform(0.15, 0.6)))
+
+        for interval in intervals:
+            seconds = interval_seconds(interval)
+            df = base if seconds == BASE_SECONDS else resample_ohlcv(base, seconds).drop(columns="base_tick")
+            path = os.path.join(root, interval, f"{symbol}-{interval}.csv")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            df.to_csv(path, index=False)
+            written.append(path)
+
+        if fundamentals:
+            path = os.path.join(root, "fundamental-measures", f"{symbol}_indicators_1d.csv")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            generate_fundamentals(base, seed=params_seed).to_csv(path, index=False)
+            written.append(path)
+    return written
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Write synthetic market data in the S3 bucket layout.")
+    parser.add_argument("--out", default="market_data", help="output directory (MARKET_DATA_DIR)")
+    parser.add_argument("--symbols", default="5", help="a symbol count, or a comma-separated list of symbols")
+    parser.add_argument("--days", type=int, default=20, help="trading days per series (780 bars each)")
+    parser.add_argument("--intervals", default=",".join(DEFAULT_INTERVALS), help="comma-separated intervals")
+    parser.add_argument("--start", default="2024-01-02", help="first session date")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-fundamentals", action="store_true")
+    args = parser.parse_args(argv)
+
+    symbols = symbol_names(int(args.symbols)) if args.symbols.isdigit() else args.symbols.split(",")
+    intervals = [interval.strip() for interval in args.intervals.split(",") if interval.strip()]
+    written = write_dataset(args.out, symbols, args.days, intervals, seed=args.seed,
+                            start=args.start, fundamentals=not args.no_fundamentals)
+    print(f"Wrote {len(written)} files for {len(symbols)} symbols x {args.days} days to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,33 @@
+import functools
 from typing import Dict, Optional, List, Tuple
 from datetime import datetime, timedelta, timezone
+import numpy as np
 import pandas as pd
 from .s3_data_adapter import s3_adapter
 from .ohlcv_cache import ohlcv_cache
+from .indicator_engine import add_indicator_columns
+from .date_index import TickDateIndex
+from .downsampling import downsample_columns
+from .chart_encoding import frame_columns, to_rows
+from .resampler import BASE_INTERVAL, interval_seconds, is_derived_interval, resample_ohlcv
+from .metrics import TICK_INDEXER_CALLS
+from .request_timing import current_timings, stage
+
+def _counted(method):
+    """
+    Count calls to a TickIndexer method in sim_tick_indexer_calls_total and time
+    them as the request's "tick_indexer" stage.
+    """
+    calls = TICK_INDEXER_CALLS.labels(method.__name__)
+    
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        calls.inc()
+        if current_timings() is None:
+            return method(*args, **kwargs)
+        with stage("tick_indexer"):
+            return method(*args, **kwargs)
+    return wrapper
 
 class TickIndexer:
     """
@@ -11,27 +36,121 @@ class TickIndexer:
     
     def __init__(self):
         self._tick_cache: Dict[str, int] = {}  # Cache for total ticks per symbol
+        # Tick <-> date per series with the data version it was built from; no DataFrame
+        # references, and entries leave with their frame when the OHLCV cache drops it
+        self._date_indexes: Dict[str, Tuple[str, TickDateIndex]] = {}
+        ohlcv_cache.on_evict(self._drop_date_index)
     
+    def _drop_date_index(self, cache_key: str) -> None:
+        self._date_indexes.pop(cache_key, None)
+    
+    @_counted
     def get_total_ticks(self, symbol: str, interval: str = '30s') -> int:
         """Get total number of ticks for a symbol with caching."""
         cache_key = f"{symbol}:{interval}"
         
         if cache_key not in self._tick_cache:
-            # Try to get from cache first
-            df = ohlcv_cache.get(symbol, interval)
-            if df is not None:
-                self._tick_cache[cache_key] = len(df)
-            else:
-                # Load from S3 and cache
-                df = s3_adapter.get_dataframe(symbol, interval)
-                if df is not None:
-                    ohlcv_cache.set(symbol, df, interval)
-                    self._tick_cache[cache_key] = len(df)
-                else:
-                    self._tick_cache[cache_key] = 0
+            df = self.get_dataframe(symbol, interval)
+            self._tick_cache[cache_key] = len(df) if df is not None else 0
         
         return self._tick_cache[cache_key]
     
+    @_counted
+    def get_dataframe(self, symbol: str, interval: str = '30s') -> Optional[pd.DataFrame]:
+        """
+        Get the OHLCV DataFrame for a symbol. The 30s base series is loaded from S3
+        on a cache miss; coarser intervals are resampled from it.
+        """
+        df = ohlcv_cache.get(symbol, interval)
+        if df is None:
+            df = self._load_dataframe(symbol, interval)
+            if df is None:
+                return None
+            # Indicators are computed once per load and cached alongside the OHLCV columns
+            df = add_indicator_columns(df)
+            ohlcv_cache.set(symbol, df, interval)
+        return df
+    
+    def _load_dataframe(self, symbol: str, interval: str) -> Optional[pd.DataFrame]:
+        if interval != BASE_INTERVAL and is_derived_interval(interval):
+            base_df = self.get_dataframe(symbol, BASE_INTERVAL)
+            if base_df is not None:
+                return resample_ohlcv(base_df, interval_seconds(interval))
+        return s3_adapter.get_dataframe(symbol, interval)
+    
+    def is_supported_interval(self, interval: str) -> bool:
+        """Whether chart data can be served for an interval (any multiple of 30s)."""
+        return is_derived_interval(interval)
+    
+    def to_interval_tick(self, symbol: str, base_tick: int, interval: str = '30s') -> Optional[int]:
+        """Map a 30s base tick (the simulation clock) to the bar containing it in another interval."""
+        if interval == BASE_INTERVAL:
+            return base_tick
+        df = self.get_dataframe(symbol, interval)
+        if df is None or len(df) == 0 or "base_tick" not in df.columns:
+            return None
+        base_ticks = df["base_tick"].to_numpy()
+        return max(0, int(np.searchsorted(base_ticks, base_tick, side="right")) - 1)
+    
+    @_counted
+    def get_session_columns(self, symbol: str, base_tick: int, interval: str = '30s',
+                            start_tick: int = 0) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Get bars from start_tick (in the interval's ticks) up to a base tick. For coarser
+        intervals the last bar is rebuilt from the base ticks seen so far, so it never
+        includes prices the session has not reached yet.
+        """
+        end_tick = self.to_interval_tick(symbol, base_tick, interval)
+        if end_tick is None:
+            return None
+        columns = self.get_tick_columns(symbol, start_tick, end_tick, interval)
+        if columns is None or interval == BASE_INTERVAL or columns["tick"][-1] != end_tick:
+            return columns
+        
+        df = self.get_dataframe(symbol, interval)
+        partial = self.get_tick_columns(symbol, int(df["base_tick"].iat[end_tick]), base_tick, BASE_INTERVAL)
+        if partial is not None:
+            # The slices are views into the cached frame, so copy before patching
+            for name in ("high", "low", "close", "volume"):
+                columns[name] = columns[name].copy()
+            columns["high"][-1] = partial["high"].max()
+            columns["low"][-1] = partial["low"].min()
+            columns["close"][-1] = partial["close"][-1]
+            columns["volume"][-1] = partial["volume"].sum()
+        return columns
+    
+    def get_data_version(self, symbol: str, interval: str = '30s') -> Optional[str]:
+        """Version of the data behind a series: the source file's ETag, or its length and last timestamp."""
+        df = self.get_dataframe(symbol, interval)
+        if df is None:
+            return None
+        return self._frame_version(df)
+    
+    @staticmethod
+    def _frame_version(df: pd.DataFrame) -> str:
+        version = df.attrs.get("data_version")
+        if version:
+            return version
+        last = df["timestamp"].iat[-1].isoformat() if len(df) else ""
+        return f"{len(df)}-{last}"
+    
+    def get_date_index(self, symbol: str, interval: str = '30s') -> Optional[TickDateIndex]:
+        """Get the tick <-> trading date index for a symbol, rebuilt whenever its data is reloaded."""
+        df = self.get_dataframe(symbol, interval)
+        if df is None:
+            return None
+        
+        cache_key = f"{symbol}:{interval}"
+        version = self._frame_version(df)
+        cached = self._date_indexes.get(cache_key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        date_index = TickDateIndex(df["timestamp"])
+        self._date_indexes[cache_key] = (version, date_index)
+        return date_index
+    
+    @_counted
     def get_tick_data(self, symbol: str, tick: int, interval: str = '30s') -> Optional[Dict]:
         """Get OHLCV data for a specific tick."""
         # Validate tick index
@@ -39,14 +158,9 @@ class TickIndexer:
         if tick < 0 or tick >= total_ticks:
             return None
         
-        # Try to get from cache first
-        df = ohlcv_cache.get(symbol, interval)
+        df = self.get_dataframe(symbol, interval)
         if df is None:
-            # Load from S3 and cache
-            df = s3_adapter.get_dataframe(symbol, interval)
-            if df is None:
-                return None
-            ohlcv_cache.set(symbol, df, interval)
+            return None
         
         # Get the specific tick data
         row = df.iloc[tick]
@@ -61,48 +175,53 @@ class TickIndexer:
             "volume": int(row["volume"])
         }
     
-    def get_tick_range(self, symbol: str, start_tick: int, end_tick: int, 
-                      interval: str = '30s') -> List[Dict]:
-        """Get OHLCV data for a range of ticks."""
-        # Validate tick range
+    @_counted
+    def get_tick_columns(self, symbol: str, start_tick: int, end_tick: int,
+                         interval: str = '30s') -> Optional[Dict[str, np.ndarray]]:
+        """Get OHLCV arrays (tick, timestamp, open, high, low, close, volume) for a tick range."""
         total_ticks = self.get_total_ticks(symbol, interval)
         start_tick = max(0, start_tick)
         end_tick = min(end_tick, total_ticks - 1)
         
         if start_tick > end_tick:
-            return []
+            return None
         
-        # Try to get from cache first
-        df = ohlcv_cache.get(symbol, interval)
+        df = self.get_dataframe(symbol, interval)
         if df is None:
-            # Load from S3 and cache
-            df = s3_adapter.get_dataframe(symbol, interval)
-            if df is None:
-                return []
-            ohlcv_cache.set(symbol, df, interval)
+            return None
         
-        # Get the range of tick data
-        data = []
-        for tick in range(start_tick, end_tick + 1):
-            row = df.iloc[tick]
-            data.append({
-                "symbol": symbol,
-                "tick": tick,
-                "timestamp": row["timestamp"].isoformat(),
-                "open": float(row["open"]),
-                "high": float(row["high"]),
-                "low": float(row["low"]),
-                "close": float(row["close"]),
-                "volume": int(row["volume"])
-            })
-        
-        return data
+        return frame_columns(df, start_tick, end_tick)
+    
+    @_counted
+    def get_day_columns(self, symbol: str, days: int, interval: str = '30s') -> Optional[Dict[str, np.ndarray]]:
+        """Get OHLCV arrays for the last N calendar days of the series."""
+        date_index = self.get_date_index(symbol, interval)
+        if date_index is None or len(date_index) == 0:
+            return None
+        start_tick = date_index.calendar_window_start_tick(days)
+        return self.get_tick_columns(symbol, start_tick, len(date_index) - 1, interval)
     
+    def columns_to_rows(self, symbol: str, columns: Optional[Dict[str, np.ndarray]]) -> List[Dict]:
+        """Turn OHLCV arrays into the per-tick dicts the chart endpoints return."""
+        return to_rows(symbol, columns)
+    
+    @_counted
+    def get_tick_range(self, symbol: str, start_tick: int, end_tick: int, 
+                      interval: str = '30s', max_points: Optional[int] = None,
+                      downsample: str = 'ohlc') -> List[Dict]:
+        """Get OHLCV data for a range of ticks, optionally downsampled to max_points rows."""
+        columns = self.get_tick_columns(symbol, start_tick, end_tick, interval)
+        if columns is not None and max_points:
+            columns = downsample_columns(columns, max_points, downsample)
+        return self.columns_to_rows(symbol, columns)
+    
+    @_counted
     def get_current_price(self, symbol: str, tick: int, interval: str = '30s') -> Optional[float]:
         """Get current price (close) for a symbol at a specific tick."""
         tick_data = self.get_tick_data(symbol, tick, interval)
         return tick_data["close"] if tick_data else None
     
+    @_counted
     def get_price_change(self, symbol: str, current_tick: int, interval: str = '30s') -> Optional[Dict]:
         """Get price change information between current and previous tick."""
         if current_tick <= 0:
@@ -126,6 +245,7 @@ class TickIndexer:
             "pct_change": pct_change
         }
     
+    @_counted
     def get_quote(self, symbol: str, tick: int, interval: str = '30s') -> Optional[Dict]:
         """Get quote information for a symbol at a specific tick."""
         # Get current tick data
@@ -155,6 +275,34 @@ class TickIndexer:
                 "pct_change": 0.0
             }
     
+    @_counted
+    def get_quotes(self, symbols: List[str], tick: int, interval: str = '30s') -> Dict[str, Optional[Dict]]:
+        """
+        Get quotes for several symbols at the same tick, read straight from each
+        symbol's cached close array. Values match get_quote; symbols without data
+        at the tick map to None.
+        """
+        quotes = {}
+        for symbol in symbols:
+            df = self.get_dataframe(symbol, interval)
+            if df is None or tick < 0 or tick >= len(df):
+                quotes[symbol] = None
+                continue
+            
+            closes = df["close"].to_numpy(dtype=np.float64)
+            current_price = float(closes[tick])
+            # At the first tick there is no previous close, so the change is zero
+            prev_price = float(closes[tick - 1]) if tick > 0 else current_price
+            abs_change = current_price - prev_price
+            quotes[symbol] = {
+                "last_price": current_price,
+                "prev_close": prev_price,
+                "abs_change": abs_change,
+                "pct_change": (abs_change / prev_price) * 100 if prev_price != 0 else 0
+            }
+        return quotes
+    
+    @_counted
     def get_ohlc_for_tick(self, symbol: str, tick: int, interval: str = '30s') -> Optional[Dict]:
         """Get OHLC data for a specific tick."""
         tick_data = self.get_tick_data(symbol, tick, interval)
@@ -175,6 +323,7 @@ class TickIndexer:
     def clear_cache(self) -> None:
         """Clear all cached data."""
         self._tick_cache.clear()
+        self._date_indexes.clear()
         ohlcv_cache.clear()
     
     def invalidate_symbol(self, symbol: str, interval: str = '30s') -> None:
@@ -182,29 +331,24 @@ class TickIndexer:
         cache_key = f"{symbol}:{interval}"
         if cache_key in self._tick_cache:
             del self._tick_cache[cache_key]
+        self._date_indexes.pop(cache_key, None)
         ohlcv_cache.invalidate(symbol, interval)
 
+    @_counted
     def get_date_from_tick(self, symbol: str, tick: int, interval: str = '30s') -> Optional[str]:
-        """Get the date (YYYY-MM-DD) for a specific tick."""
-        tick_data = self.get_tick_data(symbol, tick, interval)
-        if not tick_data:
-            print(f"Tick Indexer: Could not get tick data for {symbol} at tick {tick}")
+        """Get the trading date (YYYY-MM-DD) for a specific tick."""
+        date_index = self.get_date_index(symbol, interval)
+        if date_index is None:
             return None
-        
-        # Convert timestamp string to datetime object and then to date string
-        timestamp = datetime.fromisoformat(tick_data["timestamp"])
-        
-        # Handle timezone-aware timestamps by converting to UTC and then extracting date
-        if timestamp.tzinfo is not None:
-            # Convert to UTC to normalize timezone
-            timestamp = timestamp.astimezone(timezone.utc)
-        
-        # Extract just the date part (YYYY-MM-DD)
-        date_str = timestamp.strftime('%Y-%m-%d')
-        print(f"Tick Indexer: Converted tick {tick} to date {date_str} for {symbol}")
-        print(f"Tick Indexer: Original timestamp: {tick_data['timestamp']}")
-        print(f"Tick Indexer: Parsed timestamp: {timestamp}")
-        return date_str
+        return date_index.date_from_tick(tick)
+    
+    @_counted
+    def get_tick_range_for_date(self, symbol: str, date: str, interval: str = '30s') -> Optional[Tuple[int, int]]:
+        """Get the first and last tick of a trading date."""
+        date_index = self.get_date_index(symbol, interval)
+        if date_index is None:
+            return None
+        return date_index.tick_range_for_date(date)
 
 # Global tick indexer instance
 tick_indexer = TickIndexer() 
\ No newline at end of file
@@ -0,0 +1,84 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+
+from sim_services.backtester import VectorizedBacktester, strategy_grid
+
+"""run this with pytest -v tests/test_backtester.py"""
+
+def make_closes(n_symbols=3, n_ticks=600, seed=7):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.004, (n_symbols, n_ticks)), axis=1))
+
+def naive_backtest(closes, strategy, starting_cash=100000.0):
+    # one strategy, one symbol at a time, straight python loops
+    n_symbols, n_ticks = closes.shape
+    final, trades = 0.0, 0
+    for s in range(n_symbols):
+        prices = closes[s]
+        cash, shares, long = starting_cash / n_symbols, 0.0, False
+        avg_gain = avg_loss = 0.0
+        for t in range(n_ticks):
+            if strategy["type"] == "sma_cross":
+                fast, slow = strategy["fast"], strategy["slow"]
+                want = t + 1 >= slow and prices[t + 1 - fast:t + 1].mean() > prices[t + 1 - slow:t + 1].mean()
+            else:
+                want = long
+                if t > 0:
+                    n = min(t, strategy["length"])
+                    delta = prices[t] - prices[t - 1]
+                    avg_gain += (max(delta, 0.0) - avg_gain) / n
+                    avg_loss += (max(-delta, 0.0) - avg_loss) / n
+                    if t >= strategy["length"]:
+                        total = avg_gain + avg_loss
+                        rsi = 100 * avg_gain / total if total > 0 else 50.0
+                        if rsi < strategy["lower"]:
+                            want = True
+                        elif rsi > strategy["upper"]:
+                            want = False
+            if long and not want:
+                cash += shares * prices[t]
+                shares, long = 0.0, False
+                trades += 1
+            elif want and not long:
+                quantity = np.floor(cash / prices[t])
+                if quantity > 0:
+                    cash -= quantity * prices[t]
+                    shares, long = quantity, True
+                    trades += 1
+        final += cash + shares * prices[-1]
+    return final, trades
+
+def test_matches_naive_loop_for_each_strategy():
+    closes = make_closes()
+    strategies = strategy_grid(sma_fast=[3, 8], sma_slow=[20, 40], rsi_lengths=[7, 14],
+                               rsi_lower=[30, 40], rsi_upper=[60])
+    results = VectorizedBacktester(closes).run(strategies)
+
+    for i, strategy in enumerate(strategies):
+        final, trades = naive_backtest(closes, strategy)
+        assert results["final_equity"][i] == pytest.approx(final, rel=1e-9)
+        assert results["trades"][i] == trades
+
+def test_flat_market_never_trades_sma():
+    closes = np.full((2, 200), 50.0)
+    results = VectorizedBacktester(closes).run([{"type": "sma_cross", "fast": 5, "slow": 20}])
+    assert results["trades"][0] == 0
+    assert results["final_equity"][0] == pytest.approx(100000.0)
+    assert results["max_drawdown"][0] == 0
+
+def test_leaderboard_is_sorted_by_return():
+    closes = make_closes(n_symbols=2, n_ticks=400)
+    backtester = VectorizedBacktester(closes)
+    results = backtester.run(strategy_grid())
+    board = backtester.leaderboard(results, top=5)
+    returns = [entry["total_return_pct"] for entry in board]
+    assert returns == sorted(returns, reverse=True)
+    assert board[0]["rank"] == 1
+
+def test_rejects_unknown_strategy_type():
+    with pytest.raises(ValueError):
+        VectorizedBacktester(make_closes()).run([{"type": "moon_phase"}])
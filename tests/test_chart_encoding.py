@@ -0,0 +1,62 @@
+import sys
+import os
+import json
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+
+from sim_services import chart_encoding
+from sim_services.chart_encoding import encode_json, to_columnar, to_rows
+
+"""run this with pytest -v tests/test_chart_encoding.py"""
+
+def make_columns(n=50):
+    close = np.linspace(100, 101, n)
+    return {
+        "tick": np.arange(10, 10 + n),
+        "timestamp": pd.date_range("2024-03-04 09:30", periods=n, freq="30s", tz="America/New_York").array,
+        "open": close - 0.1,
+        "high": close + 0.2,
+        "low": close - 0.2,
+        "close": close,
+        "volume": np.arange(n) * 10,
+    }
+
+def test_columnar_matches_rows():
+    columns = make_columns()
+    rows = to_rows("AAPL", columns)
+    payload = json.loads(encode_json(to_columnar("AAPL", "30s", columns, next_cursor=60)))
+    assert payload["count"] == len(rows) == 50
+    assert payload["next_cursor"] == 60
+    assert payload["tick"] == [row["tick"] for row in rows]
+    assert payload["c"] == [row["close"] for row in rows]
+    assert payload["v"] == [row["volume"] for row in rows]
+    assert payload["t"] == [int(pd.Timestamp(row["timestamp"]).timestamp()) for row in rows]
+    assert payload["t"][0] == 1709562600  # 2024-03-04 09:30 EST
+
+def test_empty_payload():
+    payload = json.loads(encode_json(to_columnar("AAPL", "30s", None)))
+    assert payload["count"] == 0 and payload["t"] == [] and payload["next_cursor"] is None
+
+def test_stdlib_fallback_matches(monkeypatch):
+    payload = to_columnar("AAPL", "30s", make_columns())
+    fast = json.loads(encode_json(payload))
+    monkeypatch.setattr(chart_encoding, "orjson", None)
+    assert json.loads(encode_json(payload)) == fast
+
+def test_nan_becomes_null_and_volume_zero(monkeypatch):
+    columns = make_columns(3)
+    columns["close"] = np.array([100.0, np.nan, 101.0])
+    columns["volume"] = np.array([10.0, np.nan, 30.0])
+    payload = to_columnar("AAPL", "30s", columns)
+    rows = to_rows("AAPL", columns)
+    assert [row["volume"] for row in rows] == [10, 0, 30]
+    for encoder in (chart_encoding.orjson, None):
+        monkeypatch.setattr(chart_encoding, "orjson", encoder)
+        body = encode_json({"columns": payload, "rows": rows, "nan": float("nan")})
+        assert b"NaN" not in body
+        decoded = json.loads(body)
+        assert decoded["columns"]["c"] == [100.0, None, 101.0]
+        assert decoded["columns"]["v"] == [10, 0, 30]
+        assert decoded["rows"][1]["close"] is None and decoded["nan"] is None
@@ -0,0 +1,75 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# The tick indexer builds its storage adapter at import; keep it off S3
+os.environ.setdefault("MARKET_DATA_BACKEND", "local")
+
+import gc
+import weakref
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from sim_services.date_index import TickDateIndex
+from sim_services.ohlcv_cache import ohlcv_cache
+from sim_services.tick_indexer import TickIndexer
+
+"""run this with pytest -v tests/test_date_index.py"""
+
+def make_timestamps(n_days=3, ticks_per_day=780):
+    days = pd.bdate_range("2024-03-07", periods=n_days, tz="America/New_York")
+    return pd.Series(days.repeat(ticks_per_day) + pd.Timedelta(hours=9, minutes=30)
+                     + pd.to_timedelta(np.tile(np.arange(ticks_per_day) * 30, n_days), unit="s"))
+
+def parsed_date(timestamps, tick):
+    # what get_date_from_tick used to do: isoformat, parse, convert to UTC, format
+    timestamp = datetime.fromisoformat(timestamps.iloc[tick].isoformat()).astimezone(timezone.utc)
+    return timestamp.strftime('%Y-%m-%d')
+
+def test_date_from_tick_matches_parsed_timestamps():
+    timestamps = make_timestamps()
+    index = TickDateIndex(timestamps)
+    for tick in range(0, len(timestamps), 97):
+        assert index.date_from_tick(tick) == parsed_date(timestamps, tick)
+    assert index.dates() == ["2024-03-07", "2024-03-08", "2024-03-11"]
+
+def test_out_of_range_tick():
+    index = TickDateIndex(make_timestamps(n_days=1))
+    assert index.date_from_tick(-1) is None
+    assert index.date_from_tick(780) is None
+
+def test_tick_range_for_date():
+    index = TickDateIndex(make_timestamps())
+    assert index.tick_range_for_date("2024-03-07") == (0, 779)
+    assert index.tick_range_for_date("2024-03-11") == (1560, 2339)
+    assert index.tick_range_for_date("2024-03-09") is None
+
+def test_last_days_window():
+    index = TickDateIndex(make_timestamps())
+    assert index.last_days_start_tick(1) == 1560
+    assert index.last_days_start_tick(2, end_tick=1000) == 0
+    assert index.last_days_start_tick(10) == 0
+
+def test_calendar_window_matches_timestamp_mask():
+    timestamps = make_timestamps(n_days=5)
+    index = TickDateIndex(timestamps)
+    for days in (0, 1, 3, 30):
+        mask = timestamps >= timestamps.max() - pd.Timedelta(days=days)
+        assert index.calendar_window_start_tick(days) == int(np.flatnonzero(mask.to_numpy())[0])
+
+def test_indexer_cache_follows_ohlcv_cache():
+    indexer = TickIndexer()
+    df = pd.DataFrame({"timestamp": make_timestamps(n_days=2), "close": 1.0})
+    ohlcv_cache.set("DIDX", df)
+    index = indexer.get_date_index("DIDX")
+    assert index.dates() == ["2024-03-07", "2024-03-08"]
+    assert indexer.get_date_index("DIDX") is index
+
+    # The index keeps no reference to the frame, and goes when the cache drops it
+    frame = weakref.ref(df)
+    del df
+    ohlcv_cache.invalidate("DIDX")
+    gc.collect()
+    assert frame() is None
+    assert "DIDX:30s" not in indexer._date_indexes
@@ -0,0 +1,81 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sim_services.downsampling import lttb_indices, downsample_columns
+
+"""run this with pytest -v tests/test_downsampling.py"""
+
+def make_columns(n=10000, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    return {
+        "tick": np.arange(n),
+        "timestamp": pd.date_range("2024-03-04 09:30", periods=n, freq="30s", tz="America/New_York").array,
+        "open": open_,
+        "high": np.maximum(open_, close) + 0.05,
+        "low": np.minimum(open_, close) - 0.05,
+        "close": close,
+        "volume": rng.integers(100, 1000, n),
+    }
+
+def reference_lttb(x, y, n_out):
+    # straightforward textbook version
+    n = len(y)
+    every = (n - 2) / (n_out - 2)
+    picked = [0]
+    a = 0
+    for i in range(n_out - 2):
+        lo = int(np.floor(i * every)) + 1
+        hi = int(np.floor((i + 1) * every)) + 1
+        nxt_lo, nxt_hi = hi, min(int(np.floor((i + 2) * every)) + 1, n - 1)
+        if i == n_out - 3:
+            nxt_lo, nxt_hi = n - 1, n
+        cx, cy = x[nxt_lo:nxt_hi].mean(), y[nxt_lo:nxt_hi].mean()
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((x[a] - cx) * (y[j] - y[a]) - (x[a] - x[j]) * (cy - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        picked.append(best)
+        a = best
+    picked.append(n - 1)
+    return np.array(picked)
+
+def test_lttb_matches_reference():
+    columns = make_columns(n=2003)
+    x, y = columns["tick"].astype(float), columns["close"]
+    np.testing.assert_array_equal(lttb_indices(x, y, 200), reference_lttb(x, y, 200))
+
+def test_lttb_keeps_endpoints_and_extremes():
+    columns = make_columns()
+    keep = lttb_indices(columns["tick"], columns["close"], 500)
+    assert len(keep) == 500
+    assert keep[0] == 0 and keep[-1] == 9999
+    assert np.all(np.diff(keep) > 0)
+    assert np.argmax(columns["close"]) in keep
+
+def test_ohlc_aggregation_preserves_range_and_volume():
+    columns = make_columns()
+    reduced = downsample_columns(columns, 777, "ohlc")
+    assert len(reduced["close"]) == 777
+    assert reduced["high"].max() == columns["high"].max()
+    assert reduced["low"].min() == columns["low"].min()
+    assert reduced["volume"].sum() == columns["volume"].sum()
+    assert reduced["open"][0] == columns["open"][0]
+    assert reduced["close"][-1] == columns["close"][-1]
+    assert reduced["tick"][0] == 0
+
+def test_short_series_untouched():
+    columns = make_columns(n=50)
+    assert downsample_columns(columns, 100, "lttb") is columns
+    assert downsample_columns(columns, None) is columns
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        downsample_columns(make_columns(n=50), 10, "median")
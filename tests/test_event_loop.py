@@ -0,0 +1,75 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+
+from sim_services.event_loop import LoopStallDetector, run_blocking
+
+"""run this with pytest -v tests/test_event_loop.py"""
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+def blocking_call(value):
+    time.sleep(0.05)
+    return value, request_id.get(), threading.current_thread().name
+
+def test_run_blocking_keeps_loop_free():
+    async def main():
+        request_id.set("req-1")
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        result = await run_blocking(blocking_call, 7)
+        task.cancel()
+        return result, ticks
+
+    (value, seen_request, thread_name), ticks = asyncio.run(main())
+    assert value == 7
+    assert seen_request == "req-1"
+    assert thread_name.startswith("blocking")
+    # The loop kept running while the call slept
+    assert ticks >= 3
+
+def sleepy_handler():
+    time.sleep(0.15)
+
+def test_stall_detector_reports_stack(caplog):
+    async def main():
+        detector = LoopStallDetector(threshold=0.05)
+        detector.start()
+        await asyncio.sleep(0.05)
+        sleepy_handler()
+        await asyncio.sleep(0.05)
+        detector.stop()
+        return detector
+
+    with caplog.at_level(logging.WARNING, logger="sim.loop"):
+        detector = asyncio.run(main())
+
+    assert detector.stalls == 1
+    blocked = [record for record in caplog.records if "blocked" in record.getMessage()]
+    assert len(blocked) == 1
+    assert "sleepy_handler" in blocked[0].getMessage()
+    assert any(line.startswith("File") and "sleepy_handler" in line for line in blocked[0].stack)
+    assert any("was stalled" in record.getMessage() for record in caplog.records)
+
+def test_no_stall_reported_for_idle_loop():
+    async def main():
+        detector = LoopStallDetector(threshold=0.05)
+        detector.start()
+        await asyncio.sleep(0.2)
+        detector.stop()
+        return detector
+
+    assert asyncio.run(main()).stalls == 0
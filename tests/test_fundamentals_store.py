@@ -0,0 +1,75 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+
+from sim_services.fundamentals_store import FundamentalsStore
+
+"""run this with pytest -v tests/test_fundamentals_store.py"""
+
+def make_loader(calls):
+    def loader(symbol):
+        calls.append(symbol)
+        # deliberately unsorted, Eastern-time stamps like the S3 CSVs
+        return pd.DataFrame({
+            "Date": ["2024-03-06 00:00:00-04:00", "2024-03-04 00:00:00-04:00",
+                     "2024-03-05 00:00:00-04:00", "2024-03-11 00:00:00-04:00"],
+            "PE": [30.1, 29.5, None, 31.0],
+        })
+    return loader
+
+def test_exact_match_and_single_load():
+    calls = []
+    store = FundamentalsStore(loader=make_loader(calls))
+    for _ in range(5):
+        row = store.get_indicators("AAPL", "2024-03-04")
+        assert row["PE"] == 29.5
+    assert calls == ["AAPL"]
+
+def test_missing_values_become_none():
+    store = FundamentalsStore(loader=make_loader([]))
+    assert store.get_indicators("AAPL", "2024-03-05")["PE"] is None
+
+def test_nearest_within_one_day():
+    store = FundamentalsStore(loader=make_loader([]))
+    # Saturday after the Friday 03-06... row is 1 day away
+    assert store.get_indicators("AAPL", "2024-03-07")["PE"] == 30.1
+    assert store.get_indicators("AAPL", "2024-03-10")["PE"] == 31.0
+
+def test_too_far_returns_none():
+    store = FundamentalsStore(loader=make_loader([]))
+    assert store.get_indicators("AAPL", "2024-03-08") is None
+    assert store.get_indicators("AAPL", "2023-01-01") is None
+
+def test_results_are_copies():
+    store = FundamentalsStore(loader=make_loader([]))
+    row = store.get_indicators("AAPL", "2024-03-04")
+    row["SMA_20"] = 1.0
+    assert "SMA_20" not in store.get_indicators("AAPL", "2024-03-04")
+
+def test_failed_load_is_retried():
+    results = [None, pd.DataFrame({"Date": ["2024-03-04 00:00:00-04:00"], "PE": [1.0]})]
+    # Retried once the negative entry expires, immediately here
+    store = FundamentalsStore(loader=lambda symbol: results.pop(0), negative_ttl_seconds=0)
+    assert store.get_indicators("AAPL", "2024-03-04") is None
+    assert store.get_indicators("AAPL", "2024-03-04")["PE"] == 1.0
+
+def test_missing_symbol_is_loaded_once():
+    calls = []
+
+    def loader(symbol):
+        calls.append(symbol)
+        if symbol == "NODATE":
+            return pd.DataFrame({"PE": [30.1]})
+        return None
+
+    store = FundamentalsStore(loader=loader)
+    for _ in range(5):
+        assert store.get_indicators("MISSING", "2024-03-04") is None
+        assert store.get_indicators("NODATE", "2024-03-04") is None
+    assert calls == ["MISSING", "NODATE"]
+
+    store.invalidate("MISSING")
+    assert store.get_indicators("MISSING", "2024-03-04") is None
+    assert calls == ["MISSING", "NODATE", "MISSING"]
@@ -0,0 +1,50 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sim_services.http_cache import accepts_gzip, cache_headers, etag_matches, gzip_etag, make_etag, matched_etag
+
+"""run this with pytest -v tests/test_http_cache.py"""
+
+def test_etag_depends_on_every_part():
+    etag = make_etag("AAPL", "30s", 0, 100, "v1")
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag("AAPL", "30s", 0, 100, "v1")
+    assert etag != make_etag("AAPL", "30s", 0, 100, "v2")
+    assert etag != make_etag("AAPL", "30s", 0, 101, "v1")
+
+def test_if_none_match():
+    etag = make_etag("AAPL", 1)
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+def test_cache_control():
+    assert "immutable" in cache_headers('"x"', True)["Cache-Control"]
+    assert cache_headers('"x"', False) == {"ETag": '"x"', "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+def test_gzip_representation_has_its_own_etag():
+    etag = make_etag("AAPL", 1)
+    gzipped = gzip_etag(etag)
+    assert gzipped != etag and gzipped.startswith('"') and gzipped.endswith('-gzip"')
+    assert matched_etag(etag, etag) == etag
+    assert matched_etag(gzipped, etag) == gzipped
+    assert matched_etag(f'"other", W/{gzipped}', etag) == gzipped
+    assert matched_etag("*", etag) == etag
+    assert matched_etag('"other"', etag) is None
+    assert not etag_matches(gzip_etag('"other"'), etag)
+
+def test_accepts_gzip():
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, GZIP;q=0.5")
+    assert accepts_gzip("x-gzip")
+    assert accepts_gzip("*")
+    assert not accepts_gzip(None)
+    assert not accepts_gzip("identity")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("gzip;q=0.0, *")
+    assert not accepts_gzip("x-gzip-foo, br")
+    assert not accepts_gzip("*;q=0")
@@ -0,0 +1,154 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# The engine reads series through the tick indexer, which builds its storage adapter at import
+os.environ.setdefault("MARKET_DATA_BACKEND", "local")
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sim_services.indicator_engine import IndicatorEngine, IndicatorStream, INDICATOR_NAMES, add_indicator_columns
+from sim_services.ohlcv_cache import ohlcv_cache
+
+"""run this with pytest -v tests/test_indicator_engine.py"""
+
+PANDAS_TA_REFERENCE = os.path.join(os.path.dirname(__file__), "data", "pandas_ta_reference.csv")
+PANDAS_TA_SERIES = {"n_days": 2, "ticks_per_day": 300}
+# pandas_ta 0.4 seeds Wilder's RMA at the first bar (ewm adjust=False); the engine follows
+# 0.3 (adjust=True, see reference_indicators), so RSI and ATR agree once that seed has decayed
+RMA_SETTLED_TICK = 300
+
+def make_ohlcv(n_days=3, ticks_per_day=780, seed=3):
+    # 30s bars over regular sessions, Eastern time like the S3 files
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range("2024-03-04", periods=n_days, tz="America/New_York")
+    timestamps = (days.repeat(ticks_per_day) + pd.Timedelta(hours=9, minutes=30)
+                  + pd.to_timedelta(np.tile(np.arange(ticks_per_day) * 30, n_days), unit="s"))
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, len(timestamps))))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.05, len(close)))
+    return pd.DataFrame({
+        "timestamp": timestamps,
+        "open": open_,
+        "high": np.maximum(open_, close) + spread,
+        "low": np.minimum(open_, close) - spread,
+        "close": close,
+        "volume": rng.integers(100, 5000, len(close)),
+    })
+
+def reference_indicators(df):
+    # the pandas_ta default formulas, written out with plain pandas
+    close, high, low = df["close"], df["high"], df["low"]
+    rma = lambda s, n: s.ewm(alpha=1.0 / n, min_periods=n).mean()
+
+    change = close.diff()
+    gains, losses = change.clip(lower=0), (-change).clip(lower=0)
+    gains[change.isna()] = np.nan
+    losses[change.isna()] = np.nan
+    avg_gain, avg_loss = rma(gains, 14), rma(losses, 14)
+    rsi = 100 * avg_gain / (avg_gain + avg_loss)
+
+    prev_close = close.shift(1)
+    true_range = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+    true_range.iloc[0] = np.nan
+
+    def ema(s, n):
+        s = s.copy()
+        seed = s.iloc[:n].mean()
+        s.iloc[:n - 1] = np.nan
+        s.iloc[n - 1] = seed
+        return s.ewm(span=n, adjust=False).mean()
+
+    typical = (high + low + close) / 3
+    day = df["timestamp"].dt.tz_localize(None).dt.date
+    vwap = (typical * df["volume"]).groupby(day).cumsum() / df["volume"].groupby(day).cumsum()
+
+    return pd.DataFrame({
+        "SMA_20": close.rolling(20).mean(),
+        "RSI_14": rsi,
+        "ATR_14": rma(true_range, 14),
+        "MACD": ema(close, 12) - ema(close, 26),
+        "VWAP": vwap,
+    })
+
+def streamed(df):
+    stream = IndicatorStream(df)
+    rows = [stream.get(t) for t in range(len(df))]
+    return pd.DataFrame(rows, columns=INDICATOR_NAMES).astype(float)
+
+def assert_frames_close(actual, expected, names=INDICATOR_NAMES):
+    for name in names:
+        a, e = actual[name].to_numpy(), expected[name].to_numpy()
+        assert np.array_equal(np.isnan(a), np.isnan(e)), f"{name}: warm-up mismatch"
+        np.testing.assert_allclose(a[~np.isnan(a)], e[~np.isnan(e)], rtol=1e-8, err_msg=name)
+
+def test_stream_matches_reference_formulas():
+    df = make_ohlcv()
+    assert_frames_close(streamed(df), reference_indicators(df))
+
+def pandas_ta_indicators(df):
+    import pandas_ta  # noqa: F401  registers the DataFrame.ta accessor
+    frame = df.set_index("timestamp").rename(columns=str.capitalize)
+    return pd.DataFrame({
+        "SMA_20": frame.ta.sma(length=20),
+        "RSI_14": frame.ta.rsi(length=14),
+        "ATR_14": frame.ta.atr(length=14),
+        "MACD": frame.ta.macd()["MACD_12_26_9"],
+        "VWAP": frame.ta.vwap(),
+    }).reset_index(drop=True)
+
+def test_stream_matches_pandas_ta():
+    # pandas_ta 0.4.71b0 output for PANDAS_TA_SERIES, committed because pandas_ta needs
+    # Python 3.12; regenerate with `python tests/test_indicator_engine.py` where it is installed
+    expected = pd.read_csv(PANDAS_TA_REFERENCE)
+    assert list(expected.columns) == list(INDICATOR_NAMES)
+    actual = streamed(make_ohlcv(**PANDAS_TA_SERIES))
+    assert_frames_close(actual, expected, names=("SMA_20", "MACD", "VWAP"))
+    settled = slice(RMA_SETTLED_TICK, None)
+    assert_frames_close(actual[settled], expected[settled], names=("RSI_14", "ATR_14"))
+
+def test_precomputed_columns_match_stream():
+    df = make_ohlcv()
+    precomputed = add_indicator_columns(df.copy())
+    assert_frames_close(precomputed[list(INDICATOR_NAMES)], streamed(df))
+
+def test_lookup_behind_stream_position_is_stable():
+    df = make_ohlcv(n_days=1)
+    stream = IndicatorStream(df)
+    late = stream.get(700)
+    early = stream.get(100)
+    assert stream.get(700) == late
+    assert early == IndicatorStream(df).get(100)
+    assert stream.next_tick == 701
+
+def test_vwap_resets_each_day():
+    df = make_ohlcv(n_days=2)
+    stream = IndicatorStream(df)
+    first_bar = df.iloc[780]
+    typical = (first_bar["high"] + first_bar["low"] + first_bar["close"]) / 3
+    assert stream.get(780)["VWAP"] == pytest.approx(typical)
+
+def test_out_of_range_tick():
+    stream = IndicatorStream(make_ohlcv(n_days=1))
+    assert stream.get(-1) is None
+    assert stream.get(780) is None
+
+def test_engine_reads_the_cached_columns():
+    precomputed = add_indicator_columns(make_ohlcv(n_days=1))
+    ohlcv_cache.set("IENGINE", precomputed)
+    engine = IndicatorEngine()
+    values = engine.get_indicators("IENGINE", 500)
+    assert values == {name: float(precomputed[name].iloc[500]) for name in INDICATOR_NAMES}
+    assert engine.get_indicators("IENGINE", 0)["SMA_20"] is None
+    assert engine.get_indicators("IENGINE", 780) is None
+
+    # Nothing is held beside the frame, so replacing it changes the answer
+    shifted = add_indicator_columns(make_ohlcv(n_days=1, seed=4))
+    ohlcv_cache.set("IENGINE", shifted)
+    assert engine.get_indicators("IENGINE", 500)["SMA_20"] == shifted["SMA_20"].iloc[500]
+    ohlcv_cache.invalidate("IENGINE")
+
+if __name__ == "__main__":
+    os.makedirs(os.path.dirname(PANDAS_TA_REFERENCE), exist_ok=True)
+    pandas_ta_indicators(make_ohlcv(**PANDAS_TA_SERIES)).to_csv(PANDAS_TA_REFERENCE, index=False, float_format="%.17g")
@@ -0,0 +1,121 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import itertools
+
+from sim_services import request_timing
+from sim_services.metrics import FIRESTORE_OPERATION_SECONDS, FIRESTORE_OPERATIONS
+from unified_app.firebase_setup.instrumented_firestore import InstrumentedFirestoreClient
+
+"""run this with pytest -v tests/test_instrumented_firestore.py"""
+
+# Minimal google-cloud-firestore shaped client: references, lazy streams and snapshots
+class FakeSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+class FakeDocument:
+    def __init__(self, store, document_id):
+        self._store = store
+        self.id = document_id
+
+    def get(self, field_paths=None, transaction=None, retry=None, timeout=None):
+        return FakeSnapshot(self, self._store.get(self.id))
+
+    def set(self, document_data, merge=False, retry=None, timeout=None):
+        self._store[self.id] = dict(document_data)
+
+    def update(self, field_updates, option=None, retry=None, timeout=None):
+        self._store[self.id].update(field_updates)
+
+    def delete(self, option=None, retry=None, timeout=None):
+        self._store.pop(self.id, None)
+
+class FakeQuery:
+    def __init__(self, store, filters=()):
+        self._store = store
+        self._filters = filters
+
+    def where(self, field_path, op_string, value):
+        assert op_string == "=="
+        return FakeQuery(self._store, self._filters + ((field_path, value),))
+
+    def limit(self, count):
+        return self
+
+    def stream(self, transaction=None, retry=None, timeout=None):
+        for document_id, data in sorted(self._store.items()):
+            if all(data.get(field) == value for field, value in self._filters):
+                yield FakeSnapshot(FakeDocument(self._store, document_id), data)
+
+class FakeCollection(FakeQuery):
+    _ids = itertools.count(1)
+
+    def document(self, document_id=None):
+        return FakeDocument(self._store, document_id or f"auto{next(self._ids)}")
+
+    def add(self, document_data, document_id=None, retry=None, timeout=None):
+        reference = self.document(document_id)
+        reference.set(document_data)
+        return "update-time", reference
+
+class FakeClient:
+    project = "fake-project"
+
+    def __init__(self):
+        self.collections = {}
+
+    def collection(self, name):
+        return FakeCollection(self.collections.setdefault(name, {}))
+
+def operations(collection, kind):
+    return FIRESTORE_OPERATIONS.labels(collection, kind).get()
+
+def observed(operation):
+    counts, _ = FIRESTORE_OPERATION_SECONDS.labels(operation).snapshot()
+    return sum(counts)
+
+def test_wrapped_calls_feed_firestore_metrics():
+    db = InstrumentedFirestoreClient(FakeClient())
+    reads, writes = operations("fake_entries", "read"), operations("fake_entries", "write")
+    queries, updates = observed("query"), observed("update")
+
+    entries = db.collection("fake_entries")
+    _, reference = entries.add({"user_id": "u1", "qty": 1})
+    entries.document("e2").set({"user_id": "u2", "qty": 5})
+    assert reference.get().to_dict() == {"user_id": "u1", "qty": 1}
+
+    # Snapshots from a query hand back references that are still instrumented
+    found = list(entries.where("user_id", "==", "u1").limit(1).stream())
+    assert [snapshot.id for snapshot in found] == [reference.id]
+    found[0].reference.update({"qty": 2})
+    assert entries.document(reference.id).get().to_dict()["qty"] == 2
+    entries.document("e2").delete()
+    assert not entries.document("e2").get().exists
+
+    assert operations("fake_entries", "read") - reads == 4
+    assert operations("fake_entries", "write") - writes == 4
+    assert observed("query") - queries == 1
+    assert observed("update") - updates == 1
+    # Anything not wrapped falls through to the real client
+    assert db.project == "fake-project"
+
+def test_wrapped_calls_are_the_firestore_stage():
+    db = InstrumentedFirestoreClient(FakeClient())
+    timings = request_timing.RequestTimings()
+    token = request_timing._current.set(timings)
+    try:
+        sessions = db.collection("fake_sessions")
+        sessions.document("s1").set({"is_active": True})
+        sessions.document("s1").get()
+        list(sessions.where("is_active", "==", True).stream())
+    finally:
+        request_timing._current.reset(token)
+    assert timings.calls == {"firestore": 3}
@@ -0,0 +1,71 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import io
+import json
+import logging
+
+import pytest
+
+from sim_services import logging_setup
+from sim_services.logging_setup import (JsonFormatter, Sampler, configure_logging, flush_logging,
+                                        get_logger, log_sampled, parse_levels)
+
+"""run this with pytest -v tests/test_logging_setup.py"""
+
+@pytest.fixture
+def output(monkeypatch):
+    monkeypatch.delenv("LOG_LEVELS", raising=False)
+    stream = io.StringIO()
+    configure_logging(level="INFO", fmt="json", stream=stream, force=True)
+    yield stream
+    configure_logging(force=True)
+
+def records(stream):
+    flush_logging()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+def test_json_formatter_extra_fields():
+    record = logging.LogRecord("sim.trade", logging.INFO, __file__, 1, "filled %s", ("AAPL",), None)
+    record.session_id = "s1"
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "filled AAPL"
+    assert entry["level"] == "INFO" and entry["logger"] == "sim.trade"
+    assert entry["session_id"] == "s1"
+
+def test_sampler_every_n():
+    sample = Sampler(3)
+    assert [sample("a") for _ in range(7)] == [True, False, False, True, False, False, True]
+    assert sample("b")
+
+def test_sampler_keeps_recent_keys_only():
+    sample = Sampler(3, max_keys=2)
+    assert [sample("a"), sample("b"), sample("a")] == [True, True, False]
+    # "b" is the least recently sampled, so "c" pushes it out and it starts over
+    assert sample("c")
+    assert list(sample._counts) == ["a", "c"]
+    assert sample("b") and not sample("c")
+
+def test_parse_levels():
+    assert parse_levels("sim.stream=debug, sim.engine=WARNING,bad,x=NOPE") == {
+        "sim.stream": logging.DEBUG, "sim.engine": logging.WARNING}
+
+def test_queued_json_output_and_level(output):
+    logger = get_logger("trade")
+    assert logger.name == "sim.trade"
+    logger.debug("hidden")
+    logger.info("Trade filled for %s", "s1", extra={"symbol": "AAPL"})
+    entries = records(output)
+    assert len(entries) == 1
+    assert entries[0]["message"] == "Trade filled for s1"
+    assert entries[0]["symbol"] == "AAPL"
+
+def test_log_sampled(output, monkeypatch):
+    monkeypatch.setattr(logging_setup, "sampler", Sampler(5))
+    logger = get_logger("sim.stream")
+    for tick in range(12):
+        log_sampled(logger, logging.INFO, "frame:s1", "tick %d", tick)
+        # Below the configured level nothing is counted or written
+        log_sampled(logger, logging.DEBUG, "frame:s1", "debug tick %d", tick)
+    assert [entry["message"] for entry in records(output)] == ["tick 0", "tick 5", "tick 10"]
@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import time
+
+import pytest
+from google.cloud.firestore import FieldFilter
+
+from unified_app.firebase_setup.memory_firestore import DESCENDING, MemoryFirestoreClient
+
+"""run this with pytest -v tests/test_memory_firestore.py"""
+
+LEVELS = {
+    "1": {"id": 1, "unit_id": 1, "order": 1, "title": "Stocks"},
+    "2": {"id": 2, "unit_id": 1, "order": 2, "title": "Bonds"},
+    "3": {"id": 3, "unit_id": 1, "order": 3, "title": "Funds"},
+    "4": {"id": 4, "unit_id": 2, "order": 1, "title": "Options"},
+}
+
+@pytest.fixture
+def db():
+    client = MemoryFirestoreClient()
+    client.load({"levels": LEVELS})
+    return client
+
+def test_document_round_trip(db):
+    doc = db.collection("levels").document("2").get()
+    assert doc.exists and doc.id == "2"
+    assert doc.to_dict()["title"] == "Bonds"
+    assert not db.collection("levels").document("99").get().exists
+
+    ref = db.collection("simulation_sessions").document("s1")
+    ref.set({"user_id": "u1", "is_active": True, "stats": {"trades": 0}})
+    ref.update({"is_active": False, "stats.trades": 3})
+    assert ref.get().to_dict() == {"user_id": "u1", "is_active": False, "stats": {"trades": 3}}
+    ref.delete()
+    assert not ref.get().exists
+
+def test_snapshots_are_copies(db):
+    data = db.collection("levels").document("1").get().to_dict()
+    data["title"] = "changed"
+    assert db.collection("levels").document("1").get().to_dict()["title"] == "Stocks"
+
+def test_add_returns_reference(db):
+    _, ref = db.collection("trades").add({"session_id": "s1", "symbol": "AAPL", "quantity": 5})
+    assert len(ref.id) == 20
+    assert ref.get().to_dict()["symbol"] == "AAPL"
+
+def test_where_order_by_limit(db):
+    levels = db.collection("levels")
+    next_level = list(levels.where("unit_id", "==", 1).where("id", ">", 1).order_by("id").limit(1).stream())
+    assert [doc.id for doc in next_level] == ["2"]
+    newest_first = levels.order_by("order", direction=DESCENDING).order_by("id").stream()
+    assert [doc.id for doc in newest_first] == ["3", "2", "1", "4"]
+    assert [doc.id for doc in levels.where("id", "in", [1, 4]).stream()] == ["1", "4"]
+    assert [doc.id for doc in levels.where("id", "not-in", [1, 4]).stream()] == ["2", "3"]
+    assert list(levels.where("unit_id", "==", "1").stream()) == []
+
+def test_field_filter_and_missing_fields(db):
+    db.collection("levels").document("5").set({"unit_id": 2})
+    by_filter = db.collection("levels").where(filter=FieldFilter("unit_id", "==", 2)).stream()
+    assert [doc.id for doc in by_filter] == ["4", "5"]
+    # order_by drops documents without the field, as Firestore does
+    assert [doc.id for doc in db.collection("levels").where("unit_id", "==", 2).order_by("order").stream()] == ["4"]
+
+def test_unknown_operator(db):
+    with pytest.raises(ValueError):
+        db.collection("levels").where("id", "~", 1)
+
+def test_update_missing_document(db):
+    with pytest.raises(KeyError):
+        db.collection("levels").document("99").update({"title": "x"})
+
+def test_latency_and_stats():
+    client = MemoryFirestoreClient(latency=0.01)
+    start = time.perf_counter()
+    client.collection("trades").add({"symbol": "AAPL"})
+    list(client.collection("trades").stream())
+    assert time.perf_counter() - start >= 0.02
+    stats = client.stats()
+    assert (stats["reads"], stats["writes"]) == (1, 1)
+    assert stats["collections"] == {"trades": 1}
+    assert set(stats["operations"]) == {"trades.set", "trades.query"}
+    assert stats["operations"]["trades.query"]["mean_seconds"] >= 0.01
+    client.reset_stats()
+    assert client.stats()["operations"] == {}
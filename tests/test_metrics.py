@@ -0,0 +1,92 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+import pytest
+
+from sim_services.metrics import OHLCV_CACHE_EVICTIONS, OHLCV_CACHE_REQUESTS, Registry, _Metric
+from sim_services.ohlcv_cache import OHLCVCache
+
+"""run this with pytest -v tests/test_metrics.py"""
+
+def test_counter_and_gauge_render():
+    registry = Registry()
+    calls = registry.counter("calls_total", "Calls.", ("method",))
+    calls.labels("get_quote").inc()
+    calls.labels("get_quote").inc(2)
+    calls.labels('odd"name').inc()
+    connections = registry.gauge("connections", "Open connections.")
+    connections.inc()
+    connections.inc()
+    connections.dec()
+    lines = registry.render().splitlines()
+    assert "# TYPE calls_total counter" in lines
+    assert 'calls_total{method="get_quote"} 3' in lines
+    assert 'calls_total{method="odd\\"name"} 1' in lines
+    assert "connections 1" in lines
+
+def test_gauge_function():
+    registry = Registry()
+    size = registry.gauge("size", "Size.")
+    items = [1, 2, 3]
+    size.set_function(lambda: len(items))
+    items.append(4)
+    assert "size 4" in registry.render().splitlines()
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("op",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.labels("get").observe(value)
+    lines = registry.render().splitlines()
+    assert 'latency_seconds_bucket{op="get",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{op="get",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{op="get",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{op="get"} 4' in lines
+    assert 'latency_seconds_sum{op="get"} 3.65' in lines
+
+def test_histogram_timer():
+    registry = Registry()
+    latency = registry.histogram("trade_seconds", "Trades.")
+
+    @latency.time()
+    def trade(quantity):
+        return quantity * 2
+
+    assert trade(3) == 6
+    with latency.time():
+        pass
+    assert "trade_seconds_count 2" in registry.render().splitlines()
+
+def test_registry_reuses_and_checks_names():
+    registry = Registry()
+    assert registry.counter("a_total", "A.") is registry.counter("a_total", "A.")
+    with pytest.raises(ValueError):
+        registry.gauge("a_total", "A.")
+    with pytest.raises(ValueError):
+        registry.counter("b_total", "B.", ("x",)).inc()
+
+def test_metric_must_implement_series_and_samples():
+    class SeriesOnly(_Metric):
+        def _new_series(self):
+            return None
+
+    with pytest.raises(TypeError, match="samples"):
+        SeriesOnly("partial", "Partial.")
+
+def test_ohlcv_cache_counters():
+    hits, misses = OHLCV_CACHE_REQUESTS.labels("hit"), OHLCV_CACHE_REQUESTS.labels("miss")
+    evictions = OHLCV_CACHE_EVICTIONS.labels("capacity")
+    before = (hits.get(), misses.get(), evictions.get())
+
+    cache = OHLCVCache(max_size=1)
+    df = pd.DataFrame({"close": [1.0, 2.0, 3.0]})
+    assert cache.get("AAPL") is None
+    cache.set("AAPL", df)
+    assert cache.get("AAPL") is df
+    cache.set("MSFT", df)
+    assert cache.get_stats()["bytes"] == df.memory_usage(index=True).sum()
+
+    after = (hits.get(), misses.get(), evictions.get())
+    assert [a - b for a, b in zip(after, before)] == [1, 1, 1]
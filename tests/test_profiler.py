@@ -0,0 +1,70 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# Importing the routers package builds the whole app; keep it off Firestore, S3 and OpenAI
+os.environ.setdefault("FIRESTORE_BACKEND", "memory")
+os.environ.setdefault("MARKET_DATA_BACKEND", "local")
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers.debug import router as debug_router
+from sim_services import profiler
+
+"""run this with pytest -v tests/test_profiler.py"""
+
+def busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+@pytest.fixture
+def busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_loop, args=(stop,), name="busy-worker")
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+def test_profile_collapsed_stacks(busy_thread):
+    stacks, rounds = profiler.profile(0.3, hz=200)
+    assert rounds > 20
+    lines = stacks.splitlines()
+    busy = [line for line in lines if line.startswith("busy-worker;")]
+    assert busy and all("busy_loop (test_profiler.py:" in line for line in busy)
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0 and stack
+    # The sampling thread leaves itself out
+    assert "sample_stacks" not in stacks
+
+def test_thread_filter_and_busy(busy_thread):
+    stacks, _ = profiler.profile(0.1, hz=200, thread_filter="busy")
+    assert {line.split(";")[0] for line in stacks.splitlines()} == {"busy-worker"}
+    assert profiler._running.acquire(blocking=False)
+    try:
+        with pytest.raises(profiler.ProfilerBusy):
+            profiler.profile(0.1)
+    finally:
+        profiler._running.release()
+
+def test_endpoint_needs_admin_token(monkeypatch):
+    app = FastAPI()
+    app.include_router(debug_router)
+    client = TestClient(app)
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    assert client.get("/debug/profile", params={"seconds": 0.1}).status_code == 404
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    assert client.get("/debug/profile", params={"seconds": 0.1}).status_code == 403
+    assert client.get("/debug/profile", params={"seconds": 0.1},
+                      headers={"X-Admin-Token": "wrong"}).status_code == 403
+    response = client.get("/debug/profile", params={"seconds": 0.1, "hz": 50},
+                          headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert int(response.headers["X-Profile-Samples"]) > 0
+    assert client.get("/debug/profile", params={"seconds": 3600},
+                      headers={"X-Admin-Token": "secret"}).status_code == 422
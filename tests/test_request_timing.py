@@ -0,0 +1,52 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from sim_services.request_timing import (ServerTimingMiddleware, TimedJSONResponse, current_timings,
+                                         instrument_engine, stage)
+
+"""run this with pytest -v tests/test_request_timing.py"""
+
+engine = create_engine("sqlite://")
+instrument_engine(engine)
+
+@stage("tick_indexer")
+def quote():
+    # Nested blocks of the same stage count once
+    with stage("tick_indexer"):
+        return 101.5
+
+def make_app() -> FastAPI:
+    app = FastAPI(default_response_class=TimedJSONResponse)
+    app.add_middleware(ServerTimingMiddleware)
+
+    @app.get("/portfolio")
+    def portfolio():
+        with stage("firestore"):
+            pass
+        with engine.connect() as conn:
+            conn.execute(text("select 1"))
+        return {"price": quote(), "other": quote()}
+
+    return app
+
+def test_stage_outside_request_is_noop():
+    assert current_timings() is None
+    with stage("storage"):
+        pass
+    assert quote() == 101.5
+
+def test_server_timing_header():
+    client = TestClient(make_app())
+    response = client.get("/portfolio", headers={"Origin": "http://localhost:5173"})
+    assert response.json() == {"price": 101.5, "other": 101.5}
+    entries = {entry.split(";")[0]: entry for entry in response.headers["server-timing"].split(", ")}
+    assert set(entries) == {"firestore", "sqlite", "tick_indexer", "serialize", "total"}
+    assert 'desc="2 calls"' in entries["tick_indexer"]
+    assert 'desc="1 calls"' in entries["sqlite"]
+    assert response.headers["timing-allow-origin"] == "http://localhost:5173"
+    assert current_timings() is None
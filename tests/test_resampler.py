@@ -0,0 +1,56 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sim_services.resampler import interval_seconds, is_derived_interval, resample_ohlcv
+from test_indicator_engine import make_ohlcv
+
+"""run this with pytest -v tests/test_resampler.py"""
+
+def pandas_resample(df, rule):
+    # pandas' own resampler, with bins anchored at the 9:30 open
+    frame = df.set_index("timestamp")
+    bars = frame.resample(rule, offset="30min").agg(
+        {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+    )
+    return bars.dropna(subset=["open"]).reset_index()
+
+@pytest.mark.parametrize("interval,rule", [("1min", "1min"), ("2min", "2min"), ("5min", "5min"),
+                                            ("15min", "15min"), ("30min", "30min")])
+def test_matches_pandas_resample(interval, rule):
+    df = make_ohlcv(n_days=3)
+    ours = resample_ohlcv(df, interval_seconds(interval))
+    expected = pandas_resample(df, rule)
+    assert len(ours) == len(expected)
+    assert (ours["timestamp"].to_numpy() == expected["timestamp"].to_numpy()).all()
+    for name in ("open", "high", "low", "close", "volume"):
+        np.testing.assert_allclose(ours[name].to_numpy(dtype=float), expected[name].to_numpy(dtype=float))
+
+def test_bars_never_span_sessions():
+    df = make_ohlcv(n_days=2)
+    hourly = resample_ohlcv(df, 3600)
+    # 6.5 hour session: six full hours from 9:30 plus a half-hour bar
+    assert len(hourly) == 14
+    assert hourly["base_tick"].tolist()[:8] == [0, 120, 240, 360, 480, 600, 720, 780]
+    assert hourly["timestamp"].iloc[7] == df["timestamp"].iloc[780]
+
+def test_base_tick_maps_back_to_base_series():
+    df = make_ohlcv(n_days=1)
+    bars = resample_ohlcv(df, 300)
+    base_ticks = bars["base_tick"].to_numpy()
+    assert (df["timestamp"].iloc[base_ticks].to_numpy() == bars["timestamp"].to_numpy()).all()
+    # the bar holding base tick 37 starts at base tick 30
+    assert base_ticks[np.searchsorted(base_ticks, 37, side="right") - 1] == 30
+
+def test_interval_parsing():
+    assert interval_seconds("30s") == 30
+    assert interval_seconds("15min") == 900
+    assert interval_seconds("1h") == 3600
+    assert interval_seconds("5m") is None
+    assert is_derived_interval("2min")
+    assert not is_derived_interval("45s")
+    assert not is_derived_interval("0min")
@@ -0,0 +1,63 @@
+import sys
+import os
+import gzip
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sim_services.response_cache import ResponseCache
+
+"""run this with pytest -v tests/test_response_cache.py"""
+
+def test_hits_misses_and_hit_rate():
+    cache = ResponseCache()
+    assert cache.get("a") is None
+    cache.set("a", b"{}")
+    assert cache.get("a").body == b"{}"
+    assert cache.get("a").body == b"{}"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 1)
+    assert stats["hit_rate"] == 2 / 3
+
+def test_large_bodies_are_pregzipped():
+    cache = ResponseCache(min_gzip_bytes=100)
+    body = b'{"c": [' + b"100.25," * 500 + b"1]}"
+    entry = cache.set("big", body)
+    assert gzip.decompress(entry.gzipped) == body
+    assert len(entry.gzipped) < len(body)
+    assert cache.set("small", b"{}").gzipped is None
+
+def test_lazy_gzip_on_first_use():
+    cache = ResponseCache(min_gzip_bytes=100)
+    body = b'{"c": [' + b"100.25," * 500 + b"1]}"
+    entry = cache.set("session", body, compress=False)
+    assert entry.gzipped is None and cache.stats()["bytes"] == len(body)
+    gzipped = cache.gzipped("session", entry)
+    assert gzip.decompress(gzipped) == body
+    assert cache.gzipped("session", cache.get("session")) is gzipped
+    assert cache.stats()["bytes"] == len(body) + len(gzipped)
+    small = cache.set("small", b"{}", compress=False)
+    assert cache.gzipped("small", small) is None
+
+def test_lru_eviction_by_bytes():
+    cache = ResponseCache(max_bytes=300, min_gzip_bytes=10**6)
+    for key in "abc":
+        cache.set(key, b"x" * 100)
+    cache.get("a")  # a is now the most recently used
+    cache.set("d", b"x" * 100)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("d") is not None
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["bytes"] == 300
+
+def test_oversized_body_not_stored():
+    cache = ResponseCache(max_bytes=10, min_gzip_bytes=10**6)
+    assert cache.set("a", b"x" * 50).body == b"x" * 50
+    assert cache.stats()["entries"] == 0
+
+def test_replace_and_invalidate():
+    cache = ResponseCache(min_gzip_bytes=10**6)
+    cache.set(("range", "AAPL"), b"1")
+    cache.set(("range", "AAPL"), b"22")
+    cache.set(("range", "MSFT"), b"3")
+    assert cache.stats()["bytes"] == 3
+    assert cache.invalidate(lambda key: key[1] == "AAPL") == 1
+    assert cache.stats()["entries"] == 1
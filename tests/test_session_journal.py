@@ -0,0 +1,114 @@
+import sys
+import os
+import json
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sim_services.session_journal import SessionJournal
+
+"""run this with pytest -v tests/test_session_journal.py"""
+
+def play_session(journal, session_id, trades=25):
+    journal.record(session_id, "activated", user_id="u1", label="Test", cash=1000.0,
+                   duration_seconds=600, start_time="2025-01-01T00:00:00+00:00")
+    cash, holdings = 1000.0, 0
+    for i in range(trades):
+        journal.record_tick(session_id, i)
+        holdings += 1
+        cash -= 10.0
+        journal.record(session_id, "trade", symbol="AAPL", action="buy", quantity=1, price=10.0,
+                       new_holdings=holdings, new_avg_price=10.0, new_cash=cash)
+    journal.record(session_id, "exit_conditions", symbol="AAPL", stop_loss=8.0, take_profit=12.0)
+
+def test_restore_matches_live_state(tmp_path):
+    journal = SessionJournal(directory=str(tmp_path), snapshot_every=10)
+    play_session(journal, "s1")
+    live = journal.get_state("s1")
+
+    restored = SessionJournal(directory=str(tmp_path)).restore_all()
+    assert restored["s1"] == live
+    assert restored["s1"]["positions"]["AAPL"] == {
+        "holdings": 25, "avg_price": 10.0, "stop_loss_price": 8.0, "take_profit_price": 12.0
+    }
+    assert restored["s1"]["cash"] == 750.0
+    assert restored["s1"]["is_active"] is True
+
+def test_snapshot_truncates_log(tmp_path):
+    journal = SessionJournal(directory=str(tmp_path), snapshot_every=10)
+    play_session(journal, "s1")
+    live = journal.get_state("s1")
+
+    # 51 events, snapshots every 10: only the one written after the last snapshot remains
+    events = [json.loads(line) for line in (tmp_path / "s1.log").read_text().splitlines()]
+    assert [event["seq"] for event in events] == [51]
+    assert SessionJournal(directory=str(tmp_path)).restore("s1") == live
+
+def test_restore_skips_events_the_snapshot_covers(tmp_path):
+    journal = SessionJournal(directory=str(tmp_path), snapshot_every=1000)
+    play_session(journal, "s1", trades=3)
+    full_log = (tmp_path / "s1.log").read_bytes()
+    journal.snapshot("s1")
+    live = journal.get_state("s1")
+
+    # A crash between writing the snapshot and truncating the log leaves both behind
+    (tmp_path / "s1.log").write_bytes(full_log)
+    assert SessionJournal(directory=str(tmp_path)).restore("s1") == live
+
+def test_torn_last_line_is_dropped(tmp_path):
+    journal = SessionJournal(directory=str(tmp_path), snapshot_every=1000)
+    play_session(journal, "s1", trades=3)
+    live = journal.get_state("s1")
+    with open(tmp_path / "s1.log", "ab") as log:
+        log.write(b'{"seq": 99, "type": "tra')
+
+    fresh = SessionJournal(directory=str(tmp_path))
+    assert fresh.get_state("s1") == live
+
+    # new events append cleanly after the repaired tail
+    fresh.record("s1", "trade", symbol="AAPL", action="buy", quantity=1, price=10.0,
+                 new_holdings=4, new_avg_price=10.0, new_cash=960.0)
+    again = SessionJournal(directory=str(tmp_path)).get_state("s1")
+    assert again["positions"]["AAPL"]["holdings"] == 4
+    assert again["seq"] == live["seq"] + 1
+
+def test_active_sessions_exclude_deactivated(tmp_path):
+    journal = SessionJournal(directory=str(tmp_path))
+    play_session(journal, "live", trades=1)
+    play_session(journal, "done", trades=1)
+    journal.record("done", "deactivated", pnl=0.0)
+
+    fresh = SessionJournal(directory=str(tmp_path))
+    assert list(fresh.restore_all()) == ["live"]
+    assert [state["id"] for state in fresh.get_active_sessions()] == ["live"]
+
+def test_ended_session_is_archived(tmp_path):
+    journal = SessionJournal(directory=str(tmp_path))
+    play_session(journal, "s1", trades=2)
+    journal.record("s1", "deactivated", pnl=5.0)
+
+    assert sorted(os.listdir(tmp_path)) == ["archive"]
+    with open(tmp_path / "archive" / "s1.snapshot.json") as f:
+        final = json.load(f)["state"]
+    assert final["is_active"] is False and final["pnl"] == 5.0
+    # A late tick from the price loop does not start a new log
+    journal.record_tick("s1", 99)
+    assert sorted(os.listdir(tmp_path)) == ["archive"]
+    assert SessionJournal(directory=str(tmp_path)).restore_all() == {}
+
+def test_restore_all_archives_inactive_journals(tmp_path):
+    # A log left by an older build that never archived ended sessions
+    with open(tmp_path / "old.log", "w") as log:
+        log.write(json.dumps({"seq": 1, "type": "activated", "user_id": "u1", "cash": 10.0}) + "\n")
+        log.write(json.dumps({"seq": 2, "type": "deactivated", "pnl": 1.0}) + "\n")
+
+    journal = SessionJournal(directory=str(tmp_path))
+    assert journal.restore_all() == {}
+    assert journal.get_active_sessions() == []
+    assert sorted(os.listdir(tmp_path)) == ["archive"]
+    assert os.path.exists(tmp_path / "archive" / "old.snapshot.json")
+
+def test_default_directory_is_next_to_package(monkeypatch, tmp_path):
+    monkeypatch.delenv("SESSION_JOURNAL_DIR", raising=False)
+    monkeypatch.chdir(tmp_path)
+    journal = SessionJournal()
+    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    assert journal._directory == os.path.join(repo_root, "session_journal")
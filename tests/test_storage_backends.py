@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Read market data from a local directory so importing the adapter needs no AWS setup
+os.environ.setdefault("MARKET_DATA_BACKEND", "local")
+
+import pytest
+
+from sim_services.storage_backends import LocalStorageBackend, StorageBackend, create_storage_backend
+from sim_services.s3_data_adapter import S3DataAdapter
+
+"""run this with pytest -v tests/test_storage_backends.py"""
+
+CSV = (
+    "timestamp,open,high,low,close,volume\n"
+    "2024-03-04 09:30:00-05:00,100.0,100.5,99.5,100.2,1200\n"
+    "2024-03-04 09:30:30-05:00,100.2,100.4,100.0,100.1,800\n"
+)
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for interval in ("30s", "5min"):
+        (tmp_path / interval).mkdir()
+        for symbol in ("AAPL", "MSFT"):
+            (tmp_path / interval / f"{symbol}-{interval}.csv").write_text(CSV)
+    (tmp_path / "fundamental-measures").mkdir()
+    (tmp_path / "fundamental-measures" / "AAPL_indicators_1d.csv").write_text("Date,PE\n2024-03-04,30.5\n")
+    return tmp_path
+
+def test_adapter_reads_local_layout(data_dir):
+    adapter = S3DataAdapter(backend=LocalStorageBackend(str(data_dir)))
+    df = adapter.get_dataframe("AAPL", "30s")
+    assert len(df) == 2
+    assert df["close"].tolist() == [100.2, 100.1]
+    assert df.attrs["data_version"]
+    assert adapter.get_available_symbols("5min") == ["AAPL", "MSFT"]
+    assert adapter.get_available_intervals() == ["30s", "5min", "fundamental-measures"]
+    assert adapter.get_fundamentals_dataframe("AAPL")["PE"].tolist() == [30.5]
+
+def test_missing_file_returns_none(data_dir):
+    adapter = S3DataAdapter(backend=LocalStorageBackend(str(data_dir)))
+    assert adapter.get_dataframe("NOPE", "30s") is None
+    assert adapter.backend.stats()["operations"]["get_object"]["errors"] == 1
+
+def test_call_statistics(data_dir):
+    backend = LocalStorageBackend(str(data_dir))
+    for _ in range(3):
+        backend.get_object("30s/AAPL-30s.csv")
+    backend.list_keys("30s/")
+    stats = backend.stats()
+    assert stats["backend"] == "local"
+    get = stats["operations"]["get_object"]
+    assert get["calls"] == 3
+    assert get["bytes"] == 3 * len(CSV)
+    assert get["max_seconds"] >= get["mean_seconds"] > 0
+    assert stats["operations"]["list_keys"]["calls"] == 1
+    backend.reset_stats()
+    assert backend.stats()["operations"] == {}
+
+def test_version_changes_when_file_is_rewritten(data_dir):
+    backend = LocalStorageBackend(str(data_dir))
+    _, before = backend.get_object("30s/AAPL-30s.csv")
+    (data_dir / "30s" / "AAPL-30s.csv").write_text(CSV + "2024-03-04 09:31:00-05:00,1,1,1,1,1\n")
+    _, after = backend.get_object("30s/AAPL-30s.csv")
+    assert before != after
+
+def test_keys_cannot_escape_root(data_dir):
+    with pytest.raises(ValueError):
+        LocalStorageBackend(str(data_dir / "30s")).get_object("../fundamental-measures/AAPL_indicators_1d.csv")
+
+def test_backend_selection(monkeypatch, tmp_path):
+    monkeypatch.setenv("MARKET_DATA_BACKEND", "local")
+    monkeypatch.setenv("MARKET_DATA_DIR", str(tmp_path))
+    backend = create_storage_backend()
+    assert isinstance(backend, LocalStorageBackend) and backend.root == str(tmp_path)
+    monkeypatch.setenv("MARKET_DATA_BACKEND", "ftp")
+    with pytest.raises(ValueError):
+        create_storage_backend()
+
+def test_backend_must_implement_storage_calls():
+    class ListOnly(StorageBackend):
+        def _list_keys(self, prefix):
+            return []
+
+    with pytest.raises(TypeError, match="_get_object"):
+        ListOnly()
@@ -0,0 +1,79 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Read market data from a local directory so importing the adapter needs no AWS setup
+os.environ.setdefault("MARKET_DATA_BACKEND", "local")
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sim_services.date_index import TickDateIndex
+from sim_services.s3_data_adapter import S3DataAdapter
+from sim_services.storage_backends import LocalStorageBackend
+from sim_services.synthetic_data import TICKS_PER_DAY, generate_ohlcv, main, write_dataset
+
+"""run this with pytest -v tests/test_synthetic_data.py"""
+
+def test_same_seed_same_series():
+    pd.testing.assert_frame_equal(generate_ohlcv(3, seed=7), generate_ohlcv(3, seed=7))
+    assert not generate_ohlcv(3, seed=7)["close"].equals(generate_ohlcv(3, seed=8)["close"])
+
+def test_bars_are_consistent():
+    df = generate_ohlcv(5, seed=1)
+    assert len(df) == 5 * TICKS_PER_DAY
+    assert (df["high"] >= df[["open", "close"]].max(axis=1)).all()
+    assert (df["low"] <= df[["open", "close"]].min(axis=1)).all()
+    assert (df["low"] > 0).all() and (df["volume"] > 0).all()
+    # Within a session each bar opens at the previous close; gaps only at the open
+    opens, previous_closes = df["open"].to_numpy()[1:], df["close"].to_numpy()[:-1]
+    session_open = np.zeros(len(df), dtype=bool)
+    session_open[::TICKS_PER_DAY] = True
+    np.testing.assert_array_equal(opens[~session_open[1:]], previous_closes[~session_open[1:]])
+    assert (opens[session_open[1:]] != previous_closes[session_open[1:]]).all()
+
+def test_sessions_skip_weekends():
+    df = generate_ohlcv(6, seed=2, start="2024-03-07")
+    index = TickDateIndex(df["timestamp"])
+    assert index.dates() == ["2024-03-07", "2024-03-08", "2024-03-11", "2024-03-12", "2024-03-13", "2024-03-14"]
+    assert index.tick_range_for_date("2024-03-11") == (2 * TICKS_PER_DAY, 3 * TICKS_PER_DAY - 1)
+
+def test_volume_is_heavier_at_open_and_close():
+    df = generate_ohlcv(40, seed=3)
+    by_bar = df["volume"].to_numpy().reshape(40, TICKS_PER_DAY).mean(axis=0)
+    midday = by_bar[300:480].mean()
+    assert by_bar[:30].mean() > 2 * midday
+    assert by_bar[-30:].mean() > 2 * midday
+
+def test_dataset_round_trips_through_adapter(tmp_path):
+    written = write_dataset(str(tmp_path), ["AAA", "BBB"], days=3, intervals=["30s", "5min"], seed=11)
+    assert len(written) == 6
+
+    adapter = S3DataAdapter(backend=LocalStorageBackend(str(tmp_path)))
+    assert adapter.get_available_symbols("5min") == ["AAA", "BBB"]
+    base = adapter.get_dataframe("AAA", "30s")
+    five = adapter.get_dataframe("AAA", "5min")
+    assert len(base) == 3 * TICKS_PER_DAY
+    assert len(five) == 3 * TICKS_PER_DAY // 10
+    assert five["volume"].sum() == base["volume"].sum()
+    assert five["high"].iloc[0] == base["high"].iloc[:10].max()
+
+    fundamentals = adapter.get_fundamentals_dataframe("BBB")
+    assert len(fundamentals) == 3
+    assert {"PE_Ratio", "MarketCap", "52W_High", "Beta"} <= set(fundamentals.columns)
+
+def test_symbols_do_not_depend_on_each_other(tmp_path):
+    write_dataset(str(tmp_path / "one"), ["AAA"], days=1, intervals=["30s"], seed=5)
+    write_dataset(str(tmp_path / "two"), ["AAA", "BBB"], days=1, intervals=["30s"], seed=5)
+    assert (tmp_path / "one" / "30s" / "AAA-30s.csv").read_text() == (tmp_path / "two" / "30s" / "AAA-30s.csv").read_text()
+
+def test_cli(tmp_path, capsys):
+    main(["--out", str(tmp_path), "--symbols", "2", "--days", "1", "--intervals", "30s,1min", "--no-fundamentals"])
+    assert sorted(os.listdir(tmp_path / "1min")) == ["SYN000-1min.csv", "SYN001-1min.csv"]
+    assert not (tmp_path / "fundamental-measures").exists()
+    assert "Wrote 4 files" in capsys.readouterr().out
+
+def test_unknown_interval(tmp_path):
+    with pytest.raises(ValueError):
+        write_dataset(str(tmp_path), ["AAA"], days=1, intervals=["1w"])
@@ -12,20 +12,34 @@ THIS IS WRITTEN FOR RENDER LOCAL ENV
 
 firebase_cert = None
 
-# using Secret File on that hoe
-secret_file_path = "/etc/secrets/FIREBASE_CERTIFICATE"
-if os.path.exists(secret_file_path):
-    with open(secret_file_path, "r") as f:
-        firebase_cert = json.load(f)
-    cred = credentials.Certificate(firebase_cert)
-
-# using local Dev – use FIREBASE_CRED_PATH from .env
+# FIRESTORE_BACKEND=memory runs against an in-process store (no credentials),
+# optionally seeded from FIRESTORE_SEED_PATH and slowed by FIRESTORE_LATENCY_MS
+if os.getenv("FIRESTORE_BACKEND", "firestore").lower() == "memory":
+    from unified_app.firebase_setup.memory_firestore import MemoryFirestoreClient
+
+    db = MemoryFirestoreClient(latency=float(os.getenv("FIRESTORE_LATENCY_MS", "0")) / 1000)
+    seed_path = os.getenv("FIRESTORE_SEED_PATH")
+    if seed_path:
+        with open(seed_path, "r") as f:
+            db.load(json.load(f))
+
 else:
-    cred_path = os.getenv("FIREBASE_CRED_PATH")
-    if not cred_path or not os.path.exists(cred_path):
-        raise FileNotFoundError("Firebase credentials not found in /etc/secrets/ or local path.")
-    cred = credentials.Certificate(cred_path)
-
-# Initialize Firebase
-initialize_app(cred)
-db = firestore.client()
+    # using Secret File on that hoe
+    secret_file_path = "/etc/secrets/FIREBASE_CERTIFICATE"
+    if os.path.exists(secret_file_path):
+        with open(secret_file_path, "r") as f:
+            firebase_cert = json.load(f)
+        cred = credentials.Certificate(firebase_cert)
+
+    # using local Dev – use FIREBASE_CRED_PATH from .env
+    else:
+        cred_path = os.getenv("FIREBASE_CRED_PATH")
+        if not cred_path or not os.path.exists(cred_path):
+            raise FileNotFoundError("Firebase credentials not found in /etc/secrets/ or local path.")
+        cred = credentials.Certificate(cred_path)
+
+    # Initialize Firebase
+    from unified_app.firebase_setup.instrumented_firestore import InstrumentedFirestoreClient
+
+    initialize_app(cred)
+    db = InstrumentedFirestoreClient(firestore.client())
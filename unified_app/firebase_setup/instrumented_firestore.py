@@ -0,0 +1,114 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List
+from sim_services.metrics import FIRESTORE_OPERATION_SECONDS, FIRESTORE_OPERATIONS
+from sim_services.request_timing import stage
+
+"""
+Thin proxy over the google-cloud-firestore client that times every call that
+goes over the wire and feeds the same metrics as the in-memory stand-in:
+
+    sim_firestore_operations_total{collection, kind}
+    sim_firestore_operation_seconds{operation}
+
+Each call is also the "firestore" stage of the current request's Server-Timing
+header, so call sites need no timing code of their own.
+
+Only the calls the app makes are wrapped: document get/set/update/delete,
+collection add, and query get/stream. Query builders (where, order_by, limit,
+...) return wrapped queries, and snapshots hand back wrapped references, so
+`snapshot.reference.update(...)` is counted too. Everything else is passed
+through to the real object untouched.
+"""
+
+@contextmanager
+def _operation(kind: str, collection: str, operation: str):
+    start = time.perf_counter()
+    try:
+        with stage("firestore"):
+            yield
+    finally:
+        FIRESTORE_OPERATIONS.labels(collection, kind).inc()
+        FIRESTORE_OPERATION_SECONDS.labels(operation).observe(time.perf_counter() - start)
+
+class _Proxy:
+    def __init__(self, wrapped, collection: str):
+        self._wrapped = wrapped
+        self._collection = collection
+
+    def __getattr__(self, name: str):
+        return getattr(self._wrapped, name)
+
+class InstrumentedDocumentSnapshot(_Proxy):
+    @property
+    def reference(self) -> "InstrumentedDocumentReference":
+        return InstrumentedDocumentReference(self._wrapped.reference, self._collection)
+
+class InstrumentedDocumentReference(_Proxy):
+    def get(self, *args, **kwargs) -> InstrumentedDocumentSnapshot:
+        with _operation("read", self._collection, "get"):
+            snapshot = self._wrapped.get(*args, **kwargs)
+        return InstrumentedDocumentSnapshot(snapshot, self._collection)
+
+    def set(self, *args, **kwargs):
+        with _operation("write", self._collection, "set"):
+            return self._wrapped.set(*args, **kwargs)
+
+    def update(self, *args, **kwargs):
+        with _operation("write", self._collection, "update"):
+            return self._wrapped.update(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with _operation("write", self._collection, "delete"):
+            return self._wrapped.delete(*args, **kwargs)
+
+    def collection(self, name: str) -> "InstrumentedCollectionReference":
+        return InstrumentedCollectionReference(self._wrapped.collection(name), name)
+
+class InstrumentedQuery(_Proxy):
+    def _chain(self, method: str, *args, **kwargs) -> "InstrumentedQuery":
+        return InstrumentedQuery(getattr(self._wrapped, method)(*args, **kwargs), self._collection)
+
+    def where(self, *args, **kwargs) -> "InstrumentedQuery":
+        return self._chain("where", *args, **kwargs)
+
+    def order_by(self, *args, **kwargs) -> "InstrumentedQuery":
+        return self._chain("order_by", *args, **kwargs)
+
+    def limit(self, *args, **kwargs) -> "InstrumentedQuery":
+        return self._chain("limit", *args, **kwargs)
+
+    def offset(self, *args, **kwargs) -> "InstrumentedQuery":
+        return self._chain("offset", *args, **kwargs)
+
+    def start_after(self, *args, **kwargs) -> "InstrumentedQuery":
+        return self._chain("start_after", *args, **kwargs)
+
+    def get(self, *args, **kwargs) -> List[InstrumentedDocumentSnapshot]:
+        return list(self.stream(*args, **kwargs))
+
+    def stream(self, *args, **kwargs):
+        # The real stream pulls results lazily; read them all inside the timer,
+        # as the in-memory client does, so the call is timed once and in full
+        with _operation("read", self._collection, "query"):
+            snapshots = list(self._wrapped.stream(*args, **kwargs))
+        for snapshot in snapshots:
+            yield InstrumentedDocumentSnapshot(snapshot, self._collection)
+
+class InstrumentedCollectionReference(InstrumentedQuery):
+    def document(self, *args, **kwargs) -> InstrumentedDocumentReference:
+        return InstrumentedDocumentReference(self._wrapped.document(*args, **kwargs), self._collection)
+
+    def add(self, document_data: Dict[str, Any], *args, **kwargs):
+        with _operation("write", self._collection, "set"):
+            update_time, reference = self._wrapped.add(document_data, *args, **kwargs)
+        return update_time, InstrumentedDocumentReference(reference, self._collection)
+
+class InstrumentedFirestoreClient(_Proxy):
+    """Wraps a google.cloud.firestore.Client; `db.collection(...)` chains are timed."""
+
+    def __init__(self, client):
+        super().__init__(client, "")
+
+    def collection(self, name: str) -> InstrumentedCollectionReference:
+        return InstrumentedCollectionReference(self._wrapped.collection(name), name)
@@ -0,0 +1,293 @@
+import copy
+import random
+import string
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+from sim_services.metrics import FIRESTORE_OPERATION_SECONDS, FIRESTORE_OPERATIONS
+from sim_services.request_timing import stage
+
+"""
+In-memory stand-in for the Firestore client. It implements the part of the
+google-cloud-firestore API the routers and services use:
+
+    db.collection(name).document(id).get() / set() / update() / delete()
+    db.collection(name).add(data)
+    db.collection(name).where(...).order_by(...).limit(...).stream()
+
+so code written against `firebaseSet.db` runs unchanged without credentials
+(FIRESTORE_BACKEND=memory). An optional per-call latency makes load tests
+behave more like a remote database.
+"""
+
+DESCENDING = "DESCENDING"
+ASCENDING = "ASCENDING"
+
+_MISSING = object()
+
+def _auto_id() -> str:
+    alphabet = string.ascii_letters + string.digits
+    return "".join(random.choices(alphabet, k=20))
+
+def _get_field(data: Dict[str, Any], field_path: str):
+    value = data
+    for part in field_path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+def _set_field(data: Dict[str, Any], field_path: str, value) -> None:
+    parts = field_path.split(".")
+    for part in parts[:-1]:
+        data = data.setdefault(part, {})
+    data[parts[-1]] = value
+
+def _compare(op: str, field_value, value) -> bool:
+    try:
+        if op == "==":
+            return field_value == value
+        if op == "!=":
+            return field_value != value
+        if op == "<":
+            return field_value < value
+        if op == "<=":
+            return field_value <= value
+        if op == ">":
+            return field_value > value
+        if op == ">=":
+            return field_value >= value
+        if op == "in":
+            return field_value in value
+        if op == "not-in":
+            return field_value not in value
+        if op == "array_contains":
+            return isinstance(field_value, list) and value in field_value
+        if op == "array_contains_any":
+            return isinstance(field_value, list) and any(v in field_value for v in value)
+    except TypeError:
+        # Firestore never matches values of different types in range filters
+        return False
+    raise ValueError(f"Unsupported filter operator: {op}")
+
+_OPERATORS = {"==", "!=", "<", "<=", ">", ">=", "in", "not-in", "array_contains", "array_contains_any"}
+
+class MemoryDocumentSnapshot:
+    def __init__(self, reference: "MemoryDocumentReference", data: Optional[Dict[str, Any]]):
+        self.reference = reference
+        self._data = data
+
+    @property
+    def id(self) -> str:
+        return self.reference.id
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field_path: str):
+        if self._data is None:
+            return None
+        value = _get_field(self._data, field_path)
+        if value is _MISSING:
+            raise KeyError(field_path)
+        return copy.deepcopy(value)
+
+class MemoryDocumentReference:
+    def __init__(self, client: "MemoryFirestoreClient", collection: str, document_id: str):
+        self._client = client
+        self._collection = collection
+        self.id = document_id
+
+    @property
+    def path(self) -> str:
+        return f"{self._collection}/{self.id}"
+
+    def get(self, field_paths=None) -> MemoryDocumentSnapshot:
+        with self._client._operation("read", self._collection, "get"), self._client._lock:
+            data = self._client._documents(self._collection).get(self.id)
+            return MemoryDocumentSnapshot(self, copy.deepcopy(data))
+
+    def set(self, document_data: Dict[str, Any], merge: bool = False) -> None:
+        with self._client._operation("write", self._collection, "set"), self._client._lock:
+            documents = self._client._documents(self._collection)
+            if merge and self.id in documents:
+                documents[self.id].update(copy.deepcopy(document_data))
+            else:
+                documents[self.id] = copy.deepcopy(document_data)
+
+    def update(self, field_updates: Dict[str, Any]) -> None:
+        with self._client._operation("write", self._collection, "update"), self._client._lock:
+            documents = self._client._documents(self._collection)
+            if self.id not in documents:
+                raise KeyError(f"No document to update: {self.path}")
+            for field_path, value in field_updates.items():
+                _set_field(documents[self.id], field_path, copy.deepcopy(value))
+
+    def delete(self) -> None:
+        with self._client._operation("write", self._collection, "delete"), self._client._lock:
+            self._client._documents(self._collection).pop(self.id, None)
+
+class MemoryQuery:
+    def __init__(self, client: "MemoryFirestoreClient", collection: str,
+                 filters=(), orders=(), limit_count: Optional[int] = None, offset_count: int = 0):
+        self._client = client
+        self._collection = collection
+        self._filters = tuple(filters)
+        self._orders = tuple(orders)
+        self._limit = limit_count
+        self._offset = offset_count
+
+    def _copy(self, **changes) -> "MemoryQuery":
+        params = dict(filters=self._filters, orders=self._orders,
+                      limit_count=self._limit, offset_count=self._offset)
+        params.update(changes)
+        return MemoryQuery(self._client, self._collection, **params)
+
+    def where(self, field_path: Optional[str] = None, op_string: Optional[str] = None,
+              value=None, filter=None) -> "MemoryQuery":
+        if filter is not None:
+            field_path, op_string, value = filter.field_path, filter.op_string, filter.value
+        if op_string not in _OPERATORS:
+            raise ValueError(f"Unsupported filter operator: {op_string}")
+        return self._copy(filters=self._filters + ((field_path, op_string, value),))
+
+    def order_by(self, field_path: str, direction: str = ASCENDING) -> "MemoryQuery":
+        return self._copy(orders=self._orders + ((field_path, direction),))
+
+    def limit(self, count: int) -> "MemoryQuery":
+        return self._copy(limit_count=count)
+
+    def offset(self, num_to_skip: int) -> "MemoryQuery":
+        return self._copy(offset_count=num_to_skip)
+
+    def _matches(self, data: Dict[str, Any]) -> bool:
+        for field_path, op, value in self._filters:
+            field_value = _get_field(data, field_path)
+            if field_value is _MISSING or not _compare(op, field_value, value):
+                return False
+        return True
+
+    def stream(self, transaction=None) -> Iterator[MemoryDocumentSnapshot]:
+        with self._client._operation("read", self._collection, "query"):
+            with self._client._lock:
+                documents = self._client._documents(self._collection)
+                matched = [(doc_id, copy.deepcopy(data)) for doc_id, data in sorted(documents.items())
+                           if self._matches(data)]
+            # Like Firestore, ordering on a field drops documents that lack it
+            for field_path, _ in self._orders:
+                matched = [(doc_id, data) for doc_id, data in matched if _get_field(data, field_path) is not _MISSING]
+            for field_path, direction in reversed(self._orders):
+                matched.sort(key=lambda item: _get_field(item[1], field_path), reverse=direction == DESCENDING)
+            matched = matched[self._offset:]
+            if self._limit is not None:
+                matched = matched[:self._limit]
+        for doc_id, data in matched:
+            yield MemoryDocumentSnapshot(MemoryDocumentReference(self._client, self._collection, doc_id), data)
+
+    def get(self, transaction=None) -> List[MemoryDocumentSnapshot]:
+        return list(self.stream())
+
+class MemoryCollectionReference(MemoryQuery):
+    def __init__(self, client: "MemoryFirestoreClient", collection: str):
+        super().__init__(client, collection)
+        self.id = collection
+
+    def document(self, document_id: Optional[str] = None) -> MemoryDocumentReference:
+        return MemoryDocumentReference(self._client, self._collection, str(document_id or _auto_id()))
+
+    def add(self, document_data: Dict[str, Any], document_id: Optional[str] = None):
+        reference = self.document(document_id)
+        reference.set(document_data)
+        return datetime.now(timezone.utc), reference
+
+    def list_documents(self) -> List[MemoryDocumentReference]:
+        with self._client._lock:
+            ids = sorted(self._client._documents(self._collection))
+        return [MemoryDocumentReference(self._client, self._collection, doc_id) for doc_id in ids]
+
+class MemoryFirestoreClient:
+    """
+    Dict-backed Firestore client. `latency` (seconds) is slept before every read
+    and write call, with up to `jitter` seconds added at random. Calls are timed
+    per collection and operation so load tests can see where request time goes.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self._collections: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.RLock()
+        self._counts = {"read": 0, "write": 0}
+        self._timings: Dict[str, Dict[str, float]] = {}
+
+    def _documents(self, collection: str) -> Dict[str, Dict[str, Any]]:
+        return self._collections.setdefault(collection, {})
+
+    @contextmanager
+    def _operation(self, kind: str, collection: str, operation: str):
+        start = time.perf_counter()
+        try:
+            with stage("firestore"):
+                delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+                if delay > 0:
+                    time.sleep(delay)
+                yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._counts[kind] += 1
+                entry = self._timings.setdefault(
+                    f"{collection}.{operation}", {"calls": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+                entry["calls"] += 1
+                entry["total_seconds"] += elapsed
+                entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+            FIRESTORE_OPERATIONS.labels(collection, kind).inc()
+            FIRESTORE_OPERATION_SECONDS.labels(operation).observe(elapsed)
+
+    def collection(self, name: str) -> MemoryCollectionReference:
+        return MemoryCollectionReference(self, name)
+
+    def collections(self) -> List[MemoryCollectionReference]:
+        with self._lock:
+            names = sorted(self._collections)
+        return [MemoryCollectionReference(self, name) for name in names]
+
+    def load(self, data: Dict[str, Dict[str, Dict[str, Any]]]) -> None:
+        """Seed collections from {collection: {document_id: fields}} without latency."""
+        with self._lock:
+            for collection, documents in data.items():
+                for document_id, fields in documents.items():
+                    self._documents(collection)[str(document_id)] = copy.deepcopy(fields)
+
+    def dump(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        with self._lock:
+            return copy.deepcopy(self._collections)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._collections.clear()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._counts = {"read": 0, "write": 0}
+            self._timings = {}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "collections": {name: len(docs) for name, docs in self._collections.items()},
+                "reads": self._counts["read"],
+                "writes": self._counts["write"],
+                "latency_seconds": self.latency,
+                "operations": {
+                    name: dict(entry, mean_seconds=entry["total_seconds"] / entry["calls"])
+                    for name, entry in self._timings.items()
+                },
+            }
@@ -325,8 +325,7 @@ const TradingWindow = () => {
         console.log(`🔍 TradingWindow: Fetching chart data for ${selectedSymbol} at tick ${currentTick}`);
         console.log(`🔍 TradingWindow: Using interval: ${interval}, session: ${sessionIdFromUrl}`);
         
-        // Clear cache for this symbol when tick changes to ensure fresh data
-        chartDataService.clearCacheForSymbol(selectedSymbol, interval, 7, sessionIdFromUrl);
+        // With a session the service only fetches the bars since its last cached tick
         const data = await chartDataService.getChartData(selectedSymbol, interval, 7, sessionIdFromUrl);
         
         console.log(`🔍 TradingWindow: Chart data received for ${selectedSymbol}:`, data);
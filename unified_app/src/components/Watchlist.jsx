@@ -46,17 +46,17 @@ const Watchlist = ({ currentTick, selectedSymbol, setSelectedSymbol, onLoadingCh
     async function fetchAllQuotes() {
       setQuotesLoading(true);
       const newQuotes = {};
-      await Promise.all(symbols.map(async (symbol) => {
-        try {
-          // Fetch quote for this symbol (backend calculates current tick internally)
-          const res = await simulationSeshApi.getQuote({ session_id: sessionIdFromUrl, symbol });
-          if (res.data && res.data.last_price !== undefined && res.data.last_price !== null) {
-          newQuotes[symbol] = res.data;
+      try {
+        // One batch request for the whole watchlist (backend calculates current tick internally)
+        const res = await simulationSeshApi.getQuotes({ session_id: sessionIdFromUrl, symbols });
+        Object.entries(res.data?.quotes || {}).forEach(([symbol, quote]) => {
+          if (quote && quote.last_price !== undefined && quote.last_price !== null) {
+            newQuotes[symbol] = quote;
           }
-        } catch (err) {
-          // Ignore errors for missing data
-        }
-      }));
+        });
+      } catch (err) {
+        // Ignore errors for missing data
+      }
       setQuotes(newQuotes);
       setQuotesLoading(false);
     }
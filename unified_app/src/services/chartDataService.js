@@ -16,6 +16,11 @@ class ChartDataService {
     console.log(`🔍 ChartDataService: Getting chart data for ${symbol}`);
     console.log(`🔍 ChartDataService: Cache key: ${cacheKey}`);
     
+    // Session charts only grow, so fetch just the bars after the last one we hold
+    if (sessionId && this.cache.has(cacheKey) && this.cache.get(cacheKey).data.length > 0) {
+      return this.appendSinceLastTick(symbol, interval, sessionId, cacheKey);
+    }
+
     // Check cache first
     if (this.cache.has(cacheKey)) {
       const cached = this.cache.get(cacheKey);
@@ -58,6 +63,37 @@ class ChartDataService {
     }
   }
 
+  // Fetch the bars from the last cached tick to the session's current tick and merge them in
+  async appendSinceLastTick(symbol, interval, sessionId, cacheKey) {
+    const cached = this.cache.get(cacheKey);
+    const lastTick = cached.data[cached.data.length - 1].tick;
+
+    try {
+      const response = await axios.get(getChartApiUrl(`/${symbol}/since`), {
+        params: { session_id: sessionId, since_tick: lastTick, interval }
+      });
+
+      const newBars = response.data.data || [];
+      if (newBars.length === 0) {
+        return cached.data;
+      }
+
+      // The bar at since_tick comes back too (it may have been partial), so replace from there
+      const firstNewTick = newBars[0].tick;
+      const kept = cached.data.filter(bar => bar.tick < firstNewTick);
+      const data = kept.concat(newBars);
+
+      this.cache.set(cacheKey, {
+        data,
+        timestamp: Date.now()
+      });
+      return data;
+    } catch (error) {
+      console.error(`❌ ChartDataService: Error appending chart data for ${symbol}:`, error);
+      return cached.data;
+    }
+  }
+
   // Get chart data by tick range
   async getChartDataByRange(symbol, startTick, endTick, interval = '30s') {
     try {
@@ -92,6 +92,16 @@ export const simulationSeshApi = {
     return axios.get(getSimApiUrl(`/quote/${session_id}/${symbol}`));
   },
 
+  // Get quotes for several symbols in one request (single session lookup on the server)
+  getQuotes: async ({ session_id, symbols }) => {
+    if (!session_id) {
+      throw new Error('session_id is required for quote requests');
+    }
+    return axios.get(getSimApiUrl(`/quotes/${session_id}`), {
+      params: { symbols: symbols.join(',') },
+    });
+  },
+
   // Get all symbols for the watchlist
   getSymbols: async () => {
     return axios.get(getSimApiUrl('/symbols'));